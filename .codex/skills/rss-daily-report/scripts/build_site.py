@@ -3,18 +3,20 @@
 build_site
 ==========
 
-将本地 NewsReport/data 下的 JSON 汇总成 site/assets/data.js，供静态站点直接打开阅读。
-不依赖三方库（stdlib only）。
+将本地 NewsReport/data 下的 JSON 增量构建为 site/assets/data/（manifest + 按天分片），供静态站点直接打开阅读。
+只重新读取/输出有变化的日文件；`--legacy-data-js` 额外生成旧站使用的单文件 site/assets/data.js。
+只读取 NewsReport/data，不向其中写任何文件；全历史搜索索引 NewsReport/data/search/ 由日报生成步骤维护（见 search_index.py）。
+不依赖三方库（stdlib only）；若安装了 orjson/msgspec，会通过 jsonio 自动使用更快的序列化后端。
 """
 
 from __future__ import annotations
 
 import argparse
-import datetime as dt
-import json
 import os
-import re
-from typing import Any, Dict, List, Tuple
+from typing import List
+
+import site_data
+from site_data import load_all_days  # noqa: F401  (kept importable for existing callers)
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -22,85 +24,53 @@ SKILL_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
 REPO_ROOT = os.path.abspath(os.path.join(SKILL_DIR, "..", "..", ".."))
 
 
-def read_json(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def write_text(path: str, text: str) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        f.write(text)
-        if not text.endswith("\n"):
-            f.write("\n")
-    os.replace(tmp, path)
-
-
-def load_all_days(data_dir: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-    index_path = os.path.join(data_dir, "index.json")
-    days: List[Dict[str, Any]] = []
-    if os.path.exists(index_path):
-        try:
-            days = list((read_json(index_path).get("days") or []))
-        except Exception:
-            days = []
-
-    # 兜底：没有 index.json 的情况下按文件名扫
-    if not days:
-        for fn in os.listdir(data_dir):
-            if re.match(r"^\d{4}-\d{2}-\d{2}\.json$", fn):
-                days.append({"date": fn[:-5]})
-        days.sort(key=lambda x: x["date"], reverse=True)
-
-    items: List[Dict[str, Any]] = []
-    market_by_date: Dict[str, Any] = {}
-    for d in days:
-        date_str = str(d.get("date") or "").strip()
-        if not date_str:
-            continue
-        p = os.path.join(data_dir, f"{date_str}.json")
-        if not os.path.exists(p):
-            continue
-        try:
-            obj = read_json(p)
-            meta = obj.get("meta") or {}
-            if isinstance(meta, dict) and meta.get("market"):
-                market_by_date[date_str] = meta.get("market")
-            day_items = obj.get("items") or []
-            if isinstance(day_items, list):
-                items.extend([x for x in day_items if isinstance(x, dict)])
-        except Exception:
-            continue
-
-    return days, items, market_by_date
-
-
 def main(argv: List[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(description="Build local reading site data.js from NewsReport/data JSON.")
+    parser = argparse.ArgumentParser(description="Incrementally build local reading site data from NewsReport/data JSON.")
     parser.add_argument("--data-dir", default=os.path.join(REPO_ROOT, "NewsReport", "data"))
     parser.add_argument("--site-dir", default=os.path.join(REPO_ROOT, "site"))
+    parser.add_argument("--full", action="store_true", help="Ignore build state and re-emit every day.")
+    parser.add_argument("--size-report", action="store_true", help="Print sizes of generated shards.")
+    parser.add_argument(
+        "--legacy-data-js",
+        action="store_true",
+        help="Also write the single-file site/assets/data.js (reads the whole history).",
+    )
     args = parser.parse_args(argv)
 
     data_dir = os.path.abspath(args.data_dir)
     site_dir = os.path.abspath(args.site_dir)
-    out_js = os.path.join(site_dir, "assets", "data.js")
 
     if not os.path.isdir(data_dir):
         raise SystemExit(f"data-dir not found: {data_dir}")
 
-    days, items, market_by_date = load_all_days(data_dir)
-    payload = {
-        "updated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
-        "days": days,
-        "items": items,
-        "market": market_by_date,
-    }
-
-    js = "// Generated from NewsReport/data (local).\n"
-    js += "window.__NEWS_DATA__ = " + json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + ";\n"
-    write_text(out_js, js)
-    print(f"Wrote: {out_js}")
+    report = site_data.build_site_data(
+        site_dir=site_dir,
+        data_dir=data_dir,
+        full=bool(args.full),
+        legacy_bundle=bool(args.legacy_data_js),
+    )
+    print(
+        f"Wrote: {report['manifest']} (days={report['days_total']}, "
+        f"changed={len(report['days_changed'])}, removed={len(report['days_removed'])})"
+    )
+    if report.get("legacy_bundle"):
+        print(f"Wrote: {report['legacy_bundle']}")
+    if args.size_report:
+        sizes = site_data.shard_size_report(site_dir)
+        kib = lambda n: f"{n / 1024:.1f} KiB"  # noqa: E731
+        print("Shard sizes:")
+        print(f"  manifest.js / .json : {kib(sizes['manifest_js'])} / {kib(sizes['manifest_json'])}")
+        print(
+            f"  day chunks ({sizes['chunks']})   : total {kib(sizes['chunk_js_total'])} js, "
+            f"{kib(sizes['chunk_json_total'])} json"
+        )
+        print(
+            f"  per-day js          : min {kib(sizes['chunk_js_min'])}, median {kib(sizes['chunk_js_median'])}, "
+            f"max {kib(sizes['chunk_js_max'])}"
+        )
+        print(f"  initial view        : {kib(sizes['initial_view'])} (manifest + {sizes['latest_day'] or '-'})")
+        if sizes["legacy_bundle"]:
+            print(f"  legacy data.js      : {kib(sizes['legacy_bundle'])}")
     return 0
 
 
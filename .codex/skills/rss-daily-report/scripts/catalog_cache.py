@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+catalog_cache
+=============
+
+源列表 / key 文件的编译缓存：run.py 启动时若输入文件未变就直接读缓存，跳过 Markdown 解析。
+
+- 缓存键：文件绝对路径 + mtime_ns + size + PARSER_VERSION（解析规则变化时递增，旧缓存自动失效）；
+- 每个输入文件一个缓存文件：.codex/skills/rss-daily-report/state/catalog/<kind>-<路径哈希>.json（易变数据，不入库）；
+- run.py 负责 “解析 -> 写缓存”；sync_sources.py 生成 my/sources.md 的同时写入编译结果，之后的首次运行也无需解析。
+- 缓存损坏/不可写都只会退回到正常解析。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Any, List, Optional
+
+import jsonio
+
+# Bump whenever parse_sources_file / read_keys_file (run.py) or the sync_sources.py compiled form changes output.
+PARSER_VERSION = 1
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(os.path.abspath(os.path.join(SCRIPT_DIR, "..")), "state", "catalog")
+
+
+def cache_path(cache_dir: str, kind: str, path: str) -> str:
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8", errors="ignore")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{kind}-{digest}.json")
+
+
+def _fingerprint(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [int(st.st_mtime_ns), int(st.st_size)]
+
+
+def load(path: str, kind: str, *, cache_dir: Optional[str] = None) -> Optional[Any]:
+    """
+    Compiled data for `path`, or None when missing/stale (file changed, other parser version, unreadable).
+    `cache_dir` defaults to DEFAULT_CACHE_DIR, looked up at call time (benchmarks redirect it).
+    """
+
+    fp = _fingerprint(path)
+    cp = cache_path(cache_dir or DEFAULT_CACHE_DIR, kind, path)
+    if fp is None or not os.path.exists(cp):
+        return None
+    try:
+        doc = jsonio.read_json(cp)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(doc, dict):
+        return None
+    if doc.get("version") != PARSER_VERSION or doc.get("path") != os.path.abspath(path) or doc.get("fingerprint") != fp:
+        return None
+    return doc.get("data")
+
+
+def store(path: str, kind: str, data: Any, *, cache_dir: Optional[str] = None) -> bool:
+    """
+    Save compiled data for the current version of `path`. Returns False (and keeps going) on I/O errors.
+    """
+
+    fp = _fingerprint(path)
+    if fp is None:
+        return False
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        jsonio.write_json(
+            cache_path(cache_dir, kind, path),
+            {"version": PARSER_VERSION, "path": os.path.abspath(path), "fingerprint": fp, "data": data},
+            compact=True,
+        )
+    except OSError:
+        return False
+    return True
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+editor_picks
+============
+
+rss-editor-picks 评审规则（见 ../../rss-editor-picks/SKILL.md）的确定性本地实现，由 run.py 在内存中直接调用：
+
+- 软删除：promo.PromoDetector 判定为活动营销/报名优惠的条目移出 items，记录到 meta.removed_items
+  （url/title/platform/source/reason）。run.py 已在去重后做过一次；这里复查 enrichment 后的标题/摘要。
+  未达删除阈值的信号只作为挑选时的 promo 惩罚。
+- 评分：quality_score + 技术/财经偏好 + 信息密度 + 时效 - promo 惩罚 - 合集/热榜惩罚。
+- 挑选：头条优先 tech/finance，拒收合集/热榜与带 promo 信号的条目；精选至少 2 条 tech（候选足够时），
+  其余按分数补齐，URL/标题去重且不与头条交叉。
+- Markdown：在 <!-- editorial-picks:start --> / <!-- editorial-picks:end --> 之间幂等写入“头条/精选”区块。
+
+输入是 run.py 的 EnrichedEntry 列表（只读取 entry/category/quality_score/summary/key_points/keywords/title_zh，
+回写 pin 与入选合集条目的 summary）。同样的输入总是得到同样的结果。
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import promo
+
+
+MD_START = "<!-- editorial-picks:start -->"
+MD_END = "<!-- editorial-picks:end -->"
+
+COLLECTION_RE = re.compile(
+    r"周刊|周报|月报|日报|早报|晚报|热榜|合集|榜单|速递|精选集|第\s*\d+\s*期|weekly|digest|roundup|newsletter|trending|issue\s*#?\d+",
+    re.I,
+)
+COLLECTION_URL_RE = re.compile(r"periodical|weekly|newsletter|digest|/issues?/", re.I)
+TECH_RE = re.compile(
+    r"\bai\b|aigc|llm|gpt|agent|智能体|大模型|模型|算力|芯片|gpu|开源|github|编程|代码|程序员|开发者|算法|数据库|"
+    r"云原生|kubernetes|linux|rust|python|javascript|安全漏洞|漏洞|框架|机器人|自动驾驶",
+    re.I,
+)
+TECH_CATEGORIES = {"技术"}
+FINANCE_CATEGORIES = {"财经"}
+CATEGORY_BONUS = {"技术": 1.0, "财经": 0.6, "商业/产品": 0.3}
+
+
+@dataclass
+class PicksResult:
+    items: List[Any]
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+    lead: List[Any] = field(default_factory=list)
+    top: List[Any] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+
+
+def item_title(it: Any) -> str:
+    return str(getattr(it, "title_zh", None) or it.entry.title or "").strip()
+
+
+def entry_promo_text(it: Any) -> Tuple[str, str]:
+    title = f"{it.entry.title} {getattr(it, 'title_zh', None) or ''}"
+    return title, f"{title} {getattr(it, 'summary', '') or ''}"
+
+
+def entry_promo_score(it: Any, detector: Optional[promo.PromoDetector] = None) -> Tuple[int, List[str]]:
+    return (detector or promo.DEFAULT_DETECTOR).score(*entry_promo_text(it))
+
+
+def is_collection(it: Any) -> bool:
+    return bool(COLLECTION_RE.search(f"{it.entry.title} {getattr(it, 'title_zh', None) or ''}")) or bool(
+        COLLECTION_URL_RE.search(it.entry.url or "")
+    )
+
+
+def is_tech(it: Any) -> bool:
+    if it.category in TECH_CATEGORIES:
+        return True
+    kws = " ".join(getattr(it, "keywords", None) or [])
+    return bool(TECH_RE.search(f"{it.entry.title} {getattr(it, 'title_zh', None) or ''} {kws}"))
+
+
+def is_finance(it: Any) -> bool:
+    return it.category in FINANCE_CATEGORIES
+
+
+def rubric_score(
+    it: Any,
+    *,
+    now: dt.datetime,
+    published_of: Optional[Callable[[Any], Optional[dt.datetime]]] = None,
+    detector: Optional[promo.PromoDetector] = None,
+) -> float:
+    score = float(it.quality_score or 0.0)
+    score += CATEGORY_BONUS.get(it.category, 0.0)
+    if it.category not in TECH_CATEGORIES and is_tech(it):
+        score += 0.5
+    summary = str(getattr(it, "summary", "") or "")
+    score += min(0.6, len(summary) / 300.0)
+    score += 0.1 * min(3, len(getattr(it, "key_points", None) or []))
+    pub = published_of(it) if published_of else None
+    if pub is not None:
+        age_h = (now - pub).total_seconds() / 3600.0
+        if age_h <= 24:
+            score += 0.3
+        elif age_h <= 72:
+            score += 0.1
+    p, _ = entry_promo_score(it, detector)
+    score -= 1.5 * p
+    if is_collection(it):
+        score -= 0.8
+    return round(score, 4)
+
+
+def collection_summary(it: Any) -> str:
+    """
+    合集/热榜类入选条目的“可读化”摘要：这期在讲什么 + 亮点 + 适合谁读（只用已有字段，不编造事实）。
+    """
+
+    points = [str(p).strip().rstrip("。") for p in (getattr(it, "key_points", None) or []) if str(p).strip()]
+    if not points:
+        return str(getattr(it, "summary", "") or "")
+    source = it.entry.platform or it.entry.source_name or "本期"
+    head = f"{source}这期聚合了{item_title(it)}相关的内容。"
+    return f"{head}亮点：{'；'.join(points[:3])}。适合想快速了解近期动态的读者。"
+
+
+def apply_editor_picks(
+    items: Sequence[Any],
+    *,
+    lead_n: int = 1,
+    top_n: int = 5,
+    soft_delete: bool = True,
+    min_tech_top: int = 2,
+    now: Optional[dt.datetime] = None,
+    published_of: Optional[Callable[[Any], Optional[dt.datetime]]] = None,
+    detector: Optional[promo.PromoDetector] = None,
+) -> PicksResult:
+    """
+    Soft-delete promo items, then pin lead/top in place (it.pin). Returns kept items (original order).
+
+    - `now` / `published_of` (UTC-naive datetimes) drive the freshness bonus; omit to ignore freshness.
+    """
+
+    now = now or dt.datetime.utcnow()
+    result = PicksResult(items=[])
+    for it in items:
+        it.pin = None
+        if soft_delete:
+            reason = (detector or promo.DEFAULT_DETECTOR).check(*entry_promo_text(it))
+            if reason:
+                result.removed.append(
+                    promo.removed_record(
+                        url=it.entry.url,
+                        title=it.entry.title,
+                        platform=it.entry.platform or it.entry.source_name,
+                        source=it.entry.source_name,
+                        reason=reason,
+                    )
+                )
+                continue
+        result.items.append(it)
+
+    scored = sorted(
+        result.items,
+        key=lambda x: (
+            -rubric_score(x, now=now, published_of=published_of, detector=detector),
+            x.entry.title.lower(),
+            x.entry.url,
+        ),
+    )
+    taken_urls: set[str] = set()
+    taken_titles: set[str] = set()
+
+    def take(it: Any, pin: str, bucket: List[Any]) -> None:
+        it.pin = pin
+        bucket.append(it)
+        taken_urls.add(it.entry.url)
+        taken_titles.add(item_title(it).lower())
+        if pin == "top" and is_collection(it):
+            it.summary = collection_summary(it)
+
+    def free(it: Any) -> bool:
+        return it.entry.url not in taken_urls and item_title(it).lower() not in taken_titles
+
+    lead_ok = [it for it in scored if not is_collection(it) and entry_promo_score(it, detector)[0] == 0]
+    lead_pref = [it for it in lead_ok if is_tech(it) or is_finance(it)]
+    for it in lead_pref + lead_ok:
+        if len(result.lead) >= max(0, int(lead_n)):
+            break
+        if free(it):
+            take(it, "lead", result.lead)
+    if len(result.lead) < max(0, int(lead_n)):
+        result.notes.append("头条未选满：没有非合集、无营销信号的候选")
+
+    want_top = max(0, int(top_n))
+    for it in [x for x in scored if is_tech(x)]:
+        if len(result.top) >= min(want_top, max(0, int(min_tech_top))):
+            break
+        if free(it):
+            take(it, "top", result.top)
+    for it in scored:
+        if len(result.top) >= want_top:
+            break
+        if free(it):
+            take(it, "top", result.top)
+    if len(result.top) < want_top:
+        result.notes.append(f"精选未选满：候选不足（{len(result.top)}/{want_top}）")
+    return result
+
+
+def picks_meta(result: PicksResult, *, lead_n: int, top_n: int) -> Dict[str, Any]:
+    """
+    meta.editor_picks (same shape as the AI-driven rss-editor-picks skill writes).
+    """
+
+    return {
+        "generated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "engine": "local-rubric",
+        "lead_n": int(lead_n),
+        "top_n": int(top_n),
+        "lead_urls": [it.entry.url for it in result.lead],
+        "top_urls": [it.entry.url for it in result.top],
+        **({"notes": list(result.notes)} if result.notes else {}),
+    }
+
+
+def render_picks_block(result: PicksResult) -> str:
+    def line(it: Any) -> str:
+        summary = " ".join(str(getattr(it, "summary", "") or "").split())
+        if len(summary) > 160:
+            summary = summary[:159] + "…"
+        return f"- [{item_title(it)}]({it.entry.url})" + (f" —— {summary}" if summary else "")
+
+    lines = [MD_START, "## 头条"]
+    lines.extend(line(it) for it in result.lead)
+    if not result.lead:
+        lines.append("- （今日未选出头条）")
+    lines.append("## 精选")
+    lines.extend(line(it) for it in result.top)
+    if not result.top:
+        lines.append("- （今日未选出精选）")
+    lines.append(MD_END)
+    return "\n".join(lines)
+
+
+def upsert_markdown_block(md: str, block: str) -> str:
+    """
+    Replace the editorial-picks block if present; otherwise insert it once after the first `---`
+    separator (or at the top of the file).
+    """
+
+    start = md.find(MD_START)
+    end = md.find(MD_END, start + 1) if start >= 0 else -1
+    if start >= 0 and end >= 0:
+        return md[:start] + block + md[end + len(MD_END) :]
+
+    m = re.search(r"^---[ \t]*\n", md, re.M)
+    if m is None:
+        return block + "\n\n" + md
+    return md[: m.end()] + "\n" + block + "\n\n" + md[m.end() :].lstrip("\n")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+fetch_telemetry
+===============
+
+Per-request fetch timing for run.py: where does each feed's time go, and how big are the responses.
+
+- 阶段拆分：dns / connect（TCP）/ tls / ttfb（发出请求到拿到响应头，含服务端处理）/ body（下载正文）/ parse。
+  dns/connect/tls 来自对 socket.getaddrinfo 与 urllib3 建连的线程内计时钩子（install_hooks，幂等、best-effort；
+  urllib3 内部结构变化时这些字段缺省，其余照常记录）。连接复用/代理隧道时对应阶段为 0 或并入 ttfb。
+- 每个源在 source_stats[url]["telemetry"] 保留最近 SAMPLES_PER_SOURCE 次请求；summarize() 按窗口汇总 p50/p95，
+  供日报“抓取明细”和 meta.fetch_telemetry 使用。这些原始样本由 CacheStore 存到 state/source_samples.json
+  （不进 git），提交的 cache/source_stats.json 里没有它们。
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import math
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+PHASES = ("dns_ms", "connect_ms", "tls_ms", "ttfb_ms", "body_ms", "parse_ms")
+SAMPLES_PER_SOURCE = 20
+
+_local = threading.local()
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+def _add(phase: str, seconds: float) -> None:
+    rec = getattr(_local, "phases", None)
+    if rec is not None:
+        rec[phase] = rec.get(phase, 0.0) + seconds
+
+
+def install_hooks() -> bool:
+    """
+    Wrap socket.getaddrinfo and urllib3's connection setup with thread-local timers.
+    The wrappers are pass-through unless a RequestTiming is active on the calling thread.
+    """
+
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return True
+        try:
+            import urllib3.connection as uc  # type: ignore
+        except Exception:
+            return False
+
+        orig_getaddrinfo = socket.getaddrinfo
+
+        def timed_getaddrinfo(*args: Any, **kwargs: Any) -> Any:
+            if getattr(_local, "phases", None) is None:
+                return orig_getaddrinfo(*args, **kwargs)
+            t = time.perf_counter()
+            try:
+                return orig_getaddrinfo(*args, **kwargs)
+            finally:
+                _add("dns", time.perf_counter() - t)
+
+        def wrap(cls: Any, name: str, phase: str) -> None:
+            orig = getattr(cls, name, None)
+            if orig is None:
+                return
+
+            def timed(self: Any, *args: Any, **kwargs: Any) -> Any:
+                if getattr(_local, "phases", None) is None:
+                    return orig(self, *args, **kwargs)
+                t = time.perf_counter()
+                try:
+                    return orig(self, *args, **kwargs)
+                finally:
+                    _add(phase, time.perf_counter() - t)
+
+            setattr(cls, name, timed)
+
+        socket.getaddrinfo = timed_getaddrinfo  # type: ignore[assignment]
+        # HTTPSConnection.connect = _new_conn (dns + tcp) + TLS handshake.
+        wrap(uc.HTTPConnection, "_new_conn", "new_conn")
+        wrap(uc.HTTPSConnection, "connect", "https_connect")
+        _hooks_installed = True
+        return True
+
+
+class RequestTiming:
+    """
+    One HTTP request: call headers() when the response headers are in and done(n_bytes) after the body.
+    Not reentrant per thread (hedged requests run on their own threads).
+    """
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.started = time.perf_counter()
+        self.headers_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.bytes = 0
+        self.status = 0
+        self.phases: Dict[str, float] = {}
+        _local.phases = self.phases
+
+    def headers(self, status: int = 0) -> None:
+        self.headers_at = time.perf_counter()
+        self.status = int(status or 0)
+        _local.phases = None
+
+    def done(self, n_bytes: int) -> None:
+        self.finished_at = time.perf_counter()
+        self.bytes = int(n_bytes)
+        _local.phases = None
+
+    def abandon(self) -> None:
+        _local.phases = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        def ms(seconds: float) -> int:
+            return int(round(max(0.0, seconds) * 1000.0))
+
+        out: Dict[str, Any] = {"url": self.url, "status": self.status, "bytes": self.bytes}
+        if _hooks_installed:
+            dns = self.phases.get("dns", 0.0)
+            new_conn = self.phases.get("new_conn", 0.0)
+            out["dns_ms"] = ms(dns)
+            out["connect_ms"] = ms(new_conn - dns)
+            out["tls_ms"] = ms(self.phases.get("https_connect", 0.0) - new_conn) if "https_connect" in self.phases else 0
+        if self.headers_at is not None:
+            out["ttfb_ms"] = ms(self.headers_at - self.started)
+            if self.finished_at is not None:
+                out["body_ms"] = ms(self.finished_at - self.headers_at)
+        if self.finished_at is not None:
+            out["total_ms"] = ms(self.finished_at - self.started)
+        return out
+
+
+def record_samples(stat: Dict[str, Any], records: Iterable[Dict[str, Any]], *, date_str: str) -> None:
+    """
+    Append this run's request records to source_stats[url]["telemetry"] (last SAMPLES_PER_SOURCE kept).
+    """
+
+    rows = [r for r in (stat.get("telemetry") or []) if isinstance(r, dict)]
+    for r in records:
+        rows.append({"date": date_str, **{k: v for k, v in r.items() if k != "url"}})
+    stat["telemetry"] = rows[-SAMPLES_PER_SOURCE:]
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """
+    Nearest-rank percentile (q in 0..100); None for no values.
+    """
+
+    if not values:
+        return None
+    s = sorted(values)
+    idx = min(len(s) - 1, max(0, int(math.ceil(q / 100.0 * len(s))) - 1))
+    return s[idx]
+
+
+def _p50_p95(values: List[float]) -> Dict[str, Any]:
+    return {"p50": percentile(values, 50), "p95": percentile(values, 95), "n": len(values)}
+
+
+def summarize(
+    source_stats: Dict[str, Any], urls: Iterable[str], *, today: dt.date, window_days: int = 14
+) -> Dict[str, Any]:
+    """
+    p50/p95 per phase over the last `window_days` (report date inclusive), overall and per source.
+    Only successful-looking samples (a total_ms) count towards timings; every sample counts for size.
+    """
+
+    fields = PHASES + ("total_ms", "bytes", "items")
+    overall: Dict[str, List[float]] = {k: [] for k in fields}
+    per_source: Dict[str, Any] = {}
+    requests_n = 0
+    for url in urls:
+        st = source_stats.get(url)
+        if not isinstance(st, dict):
+            continue
+        local: Dict[str, List[float]] = {k: [] for k in fields}
+        for r in st.get("telemetry") or []:
+            if not isinstance(r, dict):
+                continue
+            try:
+                age = (today - dt.date.fromisoformat(str(r.get("date") or ""))).days
+            except ValueError:
+                continue
+            if not (0 <= age < max(1, int(window_days))):
+                continue
+            requests_n += 1
+            for k in fields:
+                v = r.get(k)
+                if isinstance(v, (int, float)) and (k in ("bytes", "items") or "total_ms" in r):
+                    local[k].append(float(v))
+                    overall[k].append(float(v))
+        if local["total_ms"] or local["bytes"]:
+            per_source[url] = {k: _p50_p95(v) for k, v in local.items() if v}
+    return {
+        "window_days": int(window_days),
+        "requests": requests_n,
+        "overall": {k: _p50_p95(v) for k, v in overall.items() if v},
+        "sources": per_source,
+    }
+
+
+def fmt_ms(v: Optional[float]) -> str:
+    if v is None:
+        return "-"
+    return f"{v / 1000.0:.1f}s" if v >= 1000 else f"{int(v)}ms"
+
+
+def fmt_bytes(v: Optional[float]) -> str:
+    if v is None:
+        return "-"
+    return f"{v / 1024.0:.0f}KiB" if v >= 1024 else f"{int(v)}B"
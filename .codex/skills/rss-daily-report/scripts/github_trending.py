@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+github_trending
+===============
+
+GitHub Trending（https://github.com/trending）页面解析：基于 stdlib html.parser 的单遍扫描。
+
+- 按块喂给解析器，拿到前 limit 个仓库就停（页面有几百 KB，前 10 个仓库通常在前三分之一）；
+- 每个 <article class="Box-row"> 取：slug（h2 里的仓库链接）、描述、语言、star、fork、
+  本期新增 star（today / this week / this month）、贡献者（“Built by” 头像）；
+- 标记变化时缺失的字段留空，不抛异常（best-effort，与 RSS 源失败同等对待）。
+- 多语言 / 多窗口：一个 trending 源可展开为若干页面（page_urls），由 run.py 并发抓取后 merge_ranked 合并：
+  按 slug 去重、按“日均新增 star”排序，取前 N 作为同一个 GitHub 平台的条目。
+"""
+
+from __future__ import annotations
+
+import re
+import urllib.parse
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+FEED_CHUNK_CHARS = 32 * 1024
+SLUG_RE = re.compile(r"^/([A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+)/?$")
+GAINED_RE = re.compile(r"([0-9][0-9,]*)\s+stars?\s+(today|this\s+week|this\s+month)", re.I)
+PERIOD_LABELS = {"today": "今日", "this week": "本周", "this month": "本月"}
+# First path segments that look like owner/repo but are site pages.
+NON_REPO_OWNERS = {"sponsors", "login", "signup", "trending", "topics", "collections", "orgs", "apps", "features"}
+
+
+def _ws(text: str) -> str:
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class TrendingParser(HTMLParser):
+    """
+    Collects repos into `self.repos`; sets `self.done` once `limit` articles are complete.
+    """
+
+    def __init__(self, *, limit: int = 10) -> None:
+        super().__init__(convert_charrefs=True)
+        self.limit = max(1, int(limit))
+        self.repos: List[Dict[str, Any]] = []
+        self.done = False
+        self._cur: Optional[Dict[str, Any]] = None
+        self._article_depth = 0
+        self._in_h2 = False
+        # (field, tag, nesting) while collecting the text of one element.
+        self._capture: Optional[Tuple[str, str, int]] = None
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self.done:
+            return
+        if self._cur is None:
+            if tag == "article" and "Box-row" in (dict(attrs).get("class") or "").split():
+                self._cur = {
+                    "slug": "",
+                    "description": "",
+                    "language": "",
+                    "stars": "",
+                    "forks": "",
+                    "stars_gained": "",
+                    "period": "",
+                    "contributors": [],
+                }
+                self._article_depth = 1
+            return
+        if tag == "article":
+            self._article_depth += 1
+        if self._capture is not None:
+            field, ctag, n = self._capture
+            if tag == ctag:
+                self._capture = (field, ctag, n + 1)
+            return
+
+        a = dict(attrs)
+        if tag == "h2":
+            self._in_h2 = True
+        elif tag == "a":
+            href = (a.get("href") or "").strip()
+            m = SLUG_RE.match(href)
+            if m and self._in_h2 and not self._cur["slug"]:
+                self._cur["slug"] = m.group(1)
+            elif href.endswith("/stargazers"):
+                self._start_capture("stars", tag)
+            elif href.endswith("/forks") or href.endswith("/network/members"):
+                self._start_capture("forks", tag)
+        elif tag == "p" and not self._cur["description"]:
+            self._start_capture("description", tag)
+        elif a.get("itemprop") == "programmingLanguage":
+            self._start_capture("language", tag)
+        elif tag == "img":
+            alt = (a.get("alt") or "").strip()
+            if alt.startswith("@") and alt[1:] not in self._cur["contributors"]:
+                self._cur["contributors"].append(alt[1:])
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        # <x ... /> never gets an end tag: close a capture it just opened.
+        self.handle_starttag(tag, attrs)
+        if self._capture is not None and self._capture[1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self.done or self._cur is None:
+            return
+        if tag == "article":
+            self._article_depth -= 1
+            if self._article_depth <= 0:
+                self._finish_article()
+            return
+        if self._capture is not None:
+            field, ctag, n = self._capture
+            if tag == ctag:
+                if n > 1:
+                    self._capture = (field, ctag, n - 1)
+                else:
+                    self._cur[field] = _ws("".join(self._text))
+                    self._capture = None
+                    self._text = []
+            return
+        if tag == "h2":
+            self._in_h2 = False
+
+    def handle_data(self, data: str) -> None:
+        if self._cur is None or self.done:
+            return
+        if self._capture is not None:
+            self._text.append(data)
+            return
+        if not self._cur["stars_gained"]:
+            m = GAINED_RE.search(data)
+            if m:
+                self._cur["stars_gained"] = m.group(1)
+                self._cur["period"] = _ws(m.group(2)).lower()
+
+    def _start_capture(self, field: str, tag: str) -> None:
+        self._capture = (field, tag, 1)
+        self._text = []
+
+    def _finish_article(self) -> None:
+        cur, self._cur = self._cur, None
+        self._in_h2 = False
+        self._capture = None
+        self._text = []
+        if not cur or not cur["slug"] or cur["slug"].split("/", 1)[0].lower() in NON_REPO_OWNERS:
+            return
+        cur["url"] = f"https://github.com/{cur['slug']}"
+        self.repos.append(cur)
+        if len(self.repos) >= self.limit:
+            self.done = True
+
+
+def describe(repo: Dict[str, Any]) -> str:
+    """
+    One-line description used as the feed entry body: "⭐ 12,345 • 🍴 1,234 • 今日 +321 • Python • text".
+    """
+
+    parts: List[str] = []
+    if repo.get("stars"):
+        parts.append(f"⭐ {repo['stars']}")
+    if repo.get("forks"):
+        parts.append(f"🍴 {repo['forks']}")
+    if repo.get("stars_gained"):
+        parts.append(f"{PERIOD_LABELS.get(repo.get('period') or 'today', '今日')} +{repo['stars_gained']}")
+    if repo.get("language"):
+        parts.append(repo["language"])
+    if repo.get("description"):
+        parts.append(repo["description"])
+    return " • ".join(parts) if parts else str(repo.get("slug") or "")
+
+
+def parse_trending(html: str, *, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Top `limit` repos of a trending page, in page order. Each dict has slug, url, description (the page's
+    description text), language, stars, forks, stars_gained, period and contributors (logins).
+    """
+
+    if not html:
+        return []
+    # Everything before the first repo (head, inline styles/scripts, nav) is skipped with one C-level find.
+    start = html.find("<article")
+    if start < 0:
+        return []
+    parser = TrendingParser(limit=limit)
+    for i in range(start, len(html), FEED_CHUNK_CHARS):
+        parser.feed(html[i : i + FEED_CHUNK_CHARS])
+        if parser.done:
+            break
+    else:
+        parser.close()
+    return parser.repos
+
+
+# -----------------------------
+# Fan-out over languages / windows
+# -----------------------------
+
+TRENDING_BASE = "https://github.com/trending"
+WINDOWS = ("daily", "weekly", "monthly")
+WINDOW_DAYS = {"daily": 1, "weekly": 7, "monthly": 30, "today": 1, "this week": 7, "this month": 30}
+
+
+def split_list(value: str) -> List[str]:
+    return [x.strip() for x in re.split(r"[,\s]+", value or "") if x.strip()]
+
+
+def source_url(*, windows: List[str], languages: List[str]) -> str:
+    """
+    Canonical URL of one trending source. A single window over all languages keeps the plain page URL
+    (same source identity/cache stats as before); fan-outs carry the combos in the query string.
+    """
+
+    windows = [w for w in windows if w in WINDOWS] or ["daily"]
+    if len(windows) == 1 and not languages:
+        return f"{TRENDING_BASE}?since={windows[0]}"
+    q = f"since={','.join(windows)}"
+    if languages:
+        q += f"&languages={','.join(languages)}"
+    return f"{TRENDING_BASE}?{q}"
+
+
+def page_urls(url: str) -> List[Tuple[str, str, str]]:
+    """
+    Expand a trending source URL into (language, window, page_url) combos:
+      https://github.com/trending?since=daily                        -> one page (all languages)
+      https://github.com/trending/rust?since=daily,weekly            -> rust × 2 windows
+      https://github.com/trending?since=daily&languages=python,rust  -> 2 languages × daily
+    `languages` may include "all" (or an empty item) for the all-languages page.
+    """
+
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.parse_qs(parts.query)
+    windows = [w for w in split_list(",".join(query.get("since") or [])) if w in WINDOWS] or ["daily"]
+    path_lang = parts.path[len("/trending") :].strip("/") if parts.path.startswith("/trending") else ""
+    languages = split_list(",".join(query.get("languages") or []))
+    if path_lang:
+        languages = [path_lang] + [x for x in languages if x != path_lang]
+    languages = [("" if x.lower() == "all" else x) for x in languages] or [""]
+    out: List[Tuple[str, str, str]] = []
+    for lang in dict.fromkeys(languages):
+        base = f"{TRENDING_BASE}/{urllib.parse.quote(lang)}" if lang else TRENDING_BASE
+        for w in windows:
+            out.append((lang, w, f"{base}?since={w}"))
+    return out
+
+
+def gain_per_day(repo: Dict[str, Any]) -> float:
+    try:
+        gained = int(str(repo.get("stars_gained") or "0").replace(",", ""))
+    except ValueError:
+        return 0.0
+    return gained / float(WINDOW_DAYS.get(str(repo.get("period") or "today"), 1))
+
+
+def merge_ranked(pages: List[Tuple[str, str, List[Dict[str, Any]]]], *, limit: int) -> List[Dict[str, Any]]:
+    """
+    Merge per-page results, dedup by slug, rank by stars gained per day (weekly/monthly gains are
+    divided by 7/30 so windows compare). A repo on several pages keeps its best-ranked record and
+    lists every language/window it trended in.
+    """
+
+    best: Dict[str, Dict[str, Any]] = {}
+    seen_in: Dict[str, Dict[str, List[str]]] = {}
+    order: Dict[str, Tuple[int, int]] = {}
+    for page_idx, (lang, window, repos) in enumerate(pages):
+        for pos, repo in enumerate(repos):
+            slug = str(repo.get("slug") or "").lower()
+            if not slug:
+                continue
+            tags = seen_in.setdefault(slug, {"languages": [], "windows": []})
+            if lang and lang not in tags["languages"]:
+                tags["languages"].append(lang)
+            if window not in tags["windows"]:
+                tags["windows"].append(window)
+            cur = best.get(slug)
+            if cur is None or gain_per_day(repo) > gain_per_day(cur):
+                best[slug] = repo
+            order.setdefault(slug, (pos, page_idx))
+    ranked = sorted(best, key=lambda s: (-gain_per_day(best[s]), order[s]))
+    return [{**best[s], **seen_in[s], "gain_per_day": round(gain_per_day(best[s]), 1)} for s in ranked[: max(1, int(limit))]]
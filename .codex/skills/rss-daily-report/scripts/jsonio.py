@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+jsonio
+======
+
+JSON load/dump helpers shared by run.py / build_site.py, with an optional fast backend.
+
+- Uses orjson or msgspec when installed, otherwise falls back to stdlib json.
+- Output is always UTF-8 without ASCII escaping (same as json.dumps(ensure_ascii=False)).
+- `compact=True` is meant for machine-only files (site bundles, search shards); files reviewed in git
+  (NewsReport/data, cache sections) keep 2-space indentation, cache sections also `sort_keys=True`
+  so reruns produce stable, line-level diffs.
+- Force a backend with env RSS_JSON_BACKEND=stdlib|orjson|msgspec (handy for benchmarks).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def _stdlib_backend() -> Tuple[Callable[[Any], Any], Callable[[Any, bool, bool], bytes]]:
+    def loads(data: Any) -> Any:
+        return json.loads(data)
+
+    def dumps(obj: Any, compact: bool, sort_keys: bool) -> bytes:
+        if compact:
+            text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+        else:
+            text = json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+        return text.encode("utf-8")
+
+    return loads, dumps
+
+
+def _orjson_backend() -> Tuple[Callable[[Any], Any], Callable[[Any, bool, bool], bytes]]:
+    import orjson  # type: ignore
+
+    base_opts = orjson.OPT_NON_STR_KEYS
+
+    def loads(data: Any) -> Any:
+        return orjson.loads(data)
+
+    def dumps(obj: Any, compact: bool, sort_keys: bool) -> bytes:
+        opts = base_opts if compact else (base_opts | orjson.OPT_INDENT_2)
+        return orjson.dumps(obj, option=(opts | orjson.OPT_SORT_KEYS) if sort_keys else opts)
+
+    return loads, dumps
+
+
+def _msgspec_backend() -> Tuple[Callable[[Any], Any], Callable[[Any, bool, bool], bytes]]:
+    import msgspec  # type: ignore
+
+    encoder = msgspec.json.Encoder()
+    sorted_encoder = msgspec.json.Encoder(order="sorted")
+    decoder = msgspec.json.Decoder()
+
+    def loads(data: Any) -> Any:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return decoder.decode(data)
+
+    def dumps(obj: Any, compact: bool, sort_keys: bool) -> bytes:
+        buf = (sorted_encoder if sort_keys else encoder).encode(obj)
+        return buf if compact else msgspec.json.format(buf, indent=2)
+
+    return loads, dumps
+
+
+BACKENDS: Dict[str, Callable[[], Tuple[Callable[[Any], Any], Callable[[Any, bool, bool], bytes]]]] = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "stdlib": _stdlib_backend,
+}
+
+
+def available_backends() -> List[str]:
+    out: List[str] = []
+    for name, factory in BACKENDS.items():
+        try:
+            factory()
+        except Exception:
+            continue
+        out.append(name)
+    return out
+
+
+def select_backend(name: str = "") -> str:
+    """
+    Activate a backend by name ("" = auto: first importable of orjson, msgspec, stdlib).
+    Returns the active backend name.
+    """
+
+    global BACKEND, _loads, _dumps
+    order = [name] if name else list(BACKENDS.keys())
+    for cand in order:
+        factory = BACKENDS.get(cand)
+        if factory is None:
+            continue
+        try:
+            _loads, _dumps = factory()
+        except Exception:
+            continue
+        BACKEND = cand
+        return BACKEND
+    _loads, _dumps = _stdlib_backend()
+    BACKEND = "stdlib"
+    return BACKEND
+
+
+BACKEND = "stdlib"
+_loads, _dumps = _stdlib_backend()
+select_backend(os.getenv("RSS_JSON_BACKEND", "").strip().lower())
+
+
+def loads(data: Any) -> Any:
+    return _loads(data)
+
+
+def dumps_bytes(obj: Any, *, compact: bool = False, sort_keys: bool = False) -> bytes:
+    return _dumps(obj, compact, sort_keys)
+
+
+def dumps(obj: Any, *, compact: bool = False, sort_keys: bool = False) -> str:
+    return _dumps(obj, compact, sort_keys).decode("utf-8")
+
+
+def read_json(path: str) -> Any:
+    with open(path, "rb") as f:
+        return _loads(f.read())
+
+
+def write_json(path: str, data: Any, *, compact: bool = False, sort_keys: bool = False) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_dumps(data, compact, sort_keys))
+        f.write(b"\n")
+    os.replace(tmp, path)
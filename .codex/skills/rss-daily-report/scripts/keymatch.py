@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+keymatch
+========
+
+select-keys 模式下“源 -> 平台 key”的匹配索引（my/RSS.md 的 key × RSS源.md 的全部源）。
+
+- 所有 key 一次性编进 Aho-Corasick 自动机，每个源只扫一遍 "name url"，得到全部命中的 key；
+- 语义与逐对匹配一致：含 ASCII 字母的 key 不区分大小写、在 "name url" 上匹配；
+  其它 key（中文/数字等）区分大小写，分别在 name 与 url 上匹配（不会跨两者拼接处命中）；
+- 多个 key 命中时取最长（更具体）的，等长按 key 列表顺序。
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+ASCII_LETTER_RE = re.compile(r"[A-Za-z]")
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring automaton; find() returns the ids (positions in `patterns`) found in a text.
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Tuple[int, ...]] = [()]
+        for pid, p in enumerate(patterns):
+            if not p:
+                continue
+            s = 0
+            for ch in p:
+                nxt = goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[s][ch] = nxt
+                    goto.append({})
+                    out.append(())
+                s = nxt
+            out[s] = out[s] + (pid,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, t in goto[s].items():
+                queue.append(t)
+                f = fail[s]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[t] = goto[f].get(ch, 0) if s else 0
+                # Suffix matches: everything that ends at the fail state also ends here.
+                out[t] = out[t] + out[fail[t]]
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def find(self, text: str) -> Set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        s = 0
+        for ch in text:
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            if out[s]:
+                found.update(out[s])
+        return found
+
+
+class SourceKeyIndex:
+    """
+    Built once per run from the selected keys; match/best/any take a source's name and url.
+    """
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        self.keys: List[str] = [k for k in keys]
+        ascii_ids = [i for i, k in enumerate(self.keys) if k and ASCII_LETTER_RE.search(k)]
+        other_ids = [i for i, k in enumerate(self.keys) if k and not ASCII_LETTER_RE.search(k)]
+        self._ascii_ids = ascii_ids
+        self._other_ids = other_ids
+        self._ascii = AhoCorasick([self.keys[i].lower() for i in ascii_ids])
+        self._other = AhoCorasick([self.keys[i] for i in other_ids])
+
+    def match(self, name: str, url: str) -> Set[int]:
+        """
+        Indices (into keys) of every key matching this source.
+        """
+
+        hit = {self._ascii_ids[p] for p in self._ascii.find(f"{name} {url}".lower())} if self._ascii_ids else set()
+        if self._other_ids:
+            hit.update(self._other_ids[p] for p in self._other.find(name or ""))
+            hit.update(self._other_ids[p] for p in self._other.find(url or ""))
+        return hit
+
+    def best(self, name: str, url: str) -> Optional[str]:
+        """
+        Longest matching key (more specific); ties go to the earlier key.
+        """
+
+        hit = self.match(name, url)
+        if not hit:
+            return None
+        return self.keys[max(hit, key=lambda i: (len(self.keys[i]), -i))]
+
+    def any(self, name: str, url: str) -> bool:
+        return bool(self.match(name, url))
@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+market_data
+===========
+
+行情指标：报价源注册表 + 按指标列式存储的历史时间序列（供 run.py 与 site_data.py 共用）。
+
+- 注册表：PROVIDERS（报价端点）× FORMATS（响应格式解析器）× INDICATORS（指标 = 若干 (provider, symbol, format)，
+  主源在前）。新增指标只需声明一行，或在 my/config.json 的 defaults 里追加（同 key 覆盖默认，enabled=false 关闭）：
+    "market_indicators": [
+      {"key": "hkHSI", "label": "HSI", "currency": "HKD", "sources": [["tencent", "s_hkHSI", "tencent_simple"]]},
+      {"key": "usIXIC", "label": "NASDAQ", "currency": "USD", "sources": [["tencent", "s_usIXIC", "tencent_simple"]]}
+    ]
+- race_quotes：所有 (指标, 源) 并发请求，每个指标取最先解析出有效数值的一方。
+- SeriesStore：NewsReport/data/market/<key>.json，每个指标一个文件、每列一行（date/value/change/...），
+  只在末尾追加（同日重跑覆盖最后一行；比最后一行更早的日期不插入，只告警——删掉 market/ 目录，下次出报会从日文件重建）。
+  文件本身每次整体原子重写。首次出报（record_snapshot）时从各日 JSON 的 meta.market 回填。
+- site_series / load_series：给站点图表用的紧凑序列（起始日期 + 天偏移 + 数值列）；站点构建只读，
+  store 尚未建立时在内存里从日文件拼出同样的序列，不向 NewsReport/data 写文件。
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import jsonio
+
+
+SINA_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36",
+    "Referer": "https://finance.sina.com.cn",
+}
+TROY_OUNCE_GRAMS = 31.1035
+SERIES_VERSION = 1
+SERIES_COLUMNS = ("date", "value", "change", "change_pct", "prev_close", "provider", "as_of")
+DAY_FILE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.json$")
+
+
+def normalize_ws(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "")).strip()
+
+
+def parse_js_quoted_payload(text: str) -> str:
+    """
+    Parse responses like:
+      var hq_str_xxx="...";  or  v_xxx="...";
+    Returns the quoted payload, or empty string if not found.
+    """
+
+    if not text:
+        return ""
+    m = re.search(r'="([^"]*)"\s*;?\s*$', text.strip())
+    if not m:
+        return ""
+    return m.group(1)
+
+
+def try_float(x: str) -> Optional[float]:
+    s = normalize_ws(x)
+    if not s:
+        return None
+    try:
+        return float(s)
+    except Exception:
+        return None
+
+
+# -----------------------------
+# Response formats
+# -----------------------------
+
+
+def _quote_as_of(date_part: str, time_str: str) -> Optional[str]:
+    if re.match(r"^\d{4}-\d{2}-\d{2}$", date_part) and re.match(r"^\d{2}:\d{2}:\d{2}$", time_str):
+        return f"{date_part} {time_str}"
+    return None
+
+
+def _quote_fields(text: str, sep: str, min_fields: int, fmt: str) -> List[str]:
+    payload = parse_js_quoted_payload(text)
+    parts = [normalize_ws(x) for x in payload.split(sep)] if payload else []
+    if len(parts) < min_fields:
+        raise ValueError(f"unexpected {fmt} format")
+    return parts
+
+
+def _change_vs_prev(value: Optional[float], prev_close: Optional[float]) -> Tuple[Optional[float], Optional[float]]:
+    if value is None or prev_close is None or prev_close == 0:
+        return None, None
+    chg = value - prev_close
+    return chg, (chg / prev_close) * 100.0
+
+
+def parse_tencent_fx(text: str) -> Dict[str, Any]:
+    # 腾讯：v_fxUSDCNY="310~美元人民币~USDCNY~6.9488~0~20260130145022~...";
+    parts = _quote_fields(text, "~", 6, "tencent")
+    ts = parts[5]
+    as_of = None
+    if re.match(r"^\d{14}$", ts):
+        as_of = f"{ts[0:4]}-{ts[4:6]}-{ts[6:8]} {ts[8:10]}:{ts[10:12]}:{ts[12:14]}"
+    return {"name": parts[1], "value": try_float(parts[3]), "as_of": as_of}
+
+
+def parse_tencent_simple(text: str) -> Dict[str, Any]:
+    # 腾讯简版行情（s_ 前缀）：v_s_sh000001="1~上证指数~000001~4145.68~9.52~0.23~418407314~69901721~~...";
+    parts = _quote_fields(text, "~", 8, "tencent")
+    return {
+        "name": parts[1],
+        "value": try_float(parts[3]),
+        "change": try_float(parts[4]),
+        "change_pct": try_float(parts[5]),
+        "volume": try_float(parts[6]),
+        "amount": try_float(parts[7]),
+        "as_of": None,
+    }
+
+
+def parse_sina_simple(text: str) -> Dict[str, Any]:
+    # 新浪：var hq_str_s_sh000001="上证指数,4145.0342,8.8700,0.21,4166504,69594068";
+    parts = _quote_fields(text, ",", 4, "sina")
+    return {
+        "name": parts[0],
+        "value": try_float(parts[1]),
+        "change": try_float(parts[2]),
+        "change_pct": try_float(parts[3]),
+        "volume": try_float(parts[4]) if len(parts) > 4 else None,
+        "amount": try_float(parts[5]) if len(parts) > 5 else None,
+        "as_of": None,
+    }
+
+
+def parse_sina_gds(text: str) -> Dict[str, Any]:
+    # 新浪：var hq_str_gds_AU9999="1139.69,0,1139.10,1139.50,1143.00,1105.00,10:37:22,1110.30,1107.00,1154800,2.00,565.00,2026-01-26,沪金99";
+    parts = _quote_fields(text, ",", 14, "sina")
+    value = try_float(parts[0])
+    prev_close = try_float(parts[7])
+    chg, pct = _change_vs_prev(value, prev_close)
+    return {
+        "name": parts[13],
+        "value": value,
+        "change": chg,
+        "change_pct": pct,
+        "prev_close": prev_close,
+        "as_of": _quote_as_of(parts[12], parts[6]),
+    }
+
+
+def parse_tencent_hf(text: str) -> Dict[str, Any]:
+    # 腾讯：v_hf_XAU="5076.86,1.82,5076.86,5077.21,5085.52,5003.53,10:21:00,4986.02,5006.31,0,0,0,2026-01-26,伦敦金（现货黄金）";
+    parts = _quote_fields(text, ",", 14, "tencent")
+    value = try_float(parts[0])
+    prev_close = try_float(parts[7])
+    return {
+        "name": parts[13],
+        "value": value,
+        "change": (value - prev_close) if value is not None and prev_close is not None else None,
+        "change_pct": try_float(parts[1]),  # usually percent change
+        "prev_close": prev_close,
+        "unit": "raw",
+        "currency": None,
+        "as_of": _quote_as_of(parts[12], parts[6]),
+    }
+
+
+def parse_sina_hf(text: str) -> Dict[str, Any]:
+    # 新浪格式略有差异，但最后通常包含日期与名称
+    parts = _quote_fields(text, ",", 14, "sina")
+    value = try_float(parts[0])
+    prev_close = try_float(parts[1]) or try_float(parts[7])
+    chg, pct = _change_vs_prev(value, prev_close)
+    return {
+        "name": parts[13],
+        "value": value,
+        "change": chg,
+        "change_pct": pct,
+        "prev_close": prev_close,
+        "currency": None,
+        "as_of": _quote_as_of(parts[12], parts[6]),
+    }
+
+
+FORMATS: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    "tencent_fx": parse_tencent_fx,
+    "tencent_simple": parse_tencent_simple,
+    "tencent_hf": parse_tencent_hf,
+    "sina_simple": parse_sina_simple,
+    "sina_gds": parse_sina_gds,
+    "sina_hf": parse_sina_hf,
+}
+
+
+# -----------------------------
+# Registry
+# -----------------------------
+
+
+@dataclass(frozen=True)
+class QuoteProvider:
+    name: str
+    url_template: str
+    headers: Optional[Mapping[str, str]] = None
+
+    def url(self, symbol: str) -> str:
+        return self.url_template.format(symbol=symbol)
+
+
+PROVIDERS: Dict[str, QuoteProvider] = {
+    "tencent": QuoteProvider("tencent", "https://qt.gtimg.cn/q={symbol}"),
+    "sina": QuoteProvider("sina", "https://hq.sinajs.cn/list={symbol}", SINA_HEADERS),
+}
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """
+    One market indicator. `sources` = (provider, symbol, format), primary first; all are raced.
+    name/unit/currency fill in (or override) what the quote itself carries.
+    `publish=False` indicators are fetched only as inputs (USDCNY for the derived CNY/g gold price).
+    """
+
+    key: str
+    label: str
+    sources: Tuple[Tuple[str, str, str], ...]
+    name: str = ""
+    name_format: str = "{name}"
+    unit: Optional[str] = None
+    currency: Optional[str] = None
+    publish: bool = True
+
+
+INDICATORS: Tuple[Indicator, ...] = (
+    Indicator("USDCNY", "USDCNY", (("tencent", "fxUSDCNY", "tencent_fx"),), name="美元人民币", publish=False),
+    Indicator(
+        "sh000001",
+        "SSE",
+        (("tencent", "s_sh000001", "tencent_simple"), ("sina", "s_sh000001", "sina_simple")),
+        name="上证指数",
+        currency="CNY",
+    ),
+    # 国内更常用“元/克”口径：沪金（Au99.99 类）作为展示口径；拿不到时用伦敦金 * USDCNY 折算（derive_missing）。
+    Indicator(
+        "gds_AU9999",
+        "Gold(CNY/g)",
+        (("sina", "gds_AU9999", "sina_gds"),),
+        name="沪金99",
+        name_format="{name}（元/克）",
+        unit="CNY/g",
+        currency="CNY",
+    ),
+    Indicator(
+        "hf_XAU",
+        "XAU",
+        (("tencent", "hf_XAU", "tencent_hf"), ("sina", "hf_XAU", "sina_hf")),
+        name="伦敦金（现货黄金）",
+    ),
+)
+
+
+def indicator_from_config(obj: Mapping[str, Any]) -> Indicator:
+    """
+    Build an Indicator from a my/config.json entry; unknown providers/formats raise ValueError.
+    """
+
+    key = normalize_ws(str(obj.get("key") or ""))
+    if not re.match(r"^[A-Za-z0-9_.-]+$", key):
+        raise ValueError(f"invalid market indicator key: {key!r}")
+    sources: List[Tuple[str, str, str]] = []
+    for src in obj.get("sources") or []:
+        if not isinstance(src, (list, tuple)) or len(src) != 3:
+            raise ValueError(f"{key}: source must be [provider, symbol, format]")
+        provider, symbol, fmt = (str(x).strip() for x in src)
+        if provider not in PROVIDERS:
+            raise ValueError(f"{key}: unknown provider {provider!r}")
+        if fmt not in FORMATS:
+            raise ValueError(f"{key}: unknown format {fmt!r}")
+        sources.append((provider, symbol, fmt))
+    if not sources:
+        raise ValueError(f"{key}: no sources")
+    return Indicator(
+        key=key,
+        label=str(obj.get("label") or key),
+        sources=tuple(sources),
+        name=str(obj.get("name") or ""),
+        name_format=str(obj.get("name_format") or "{name}"),
+        unit=obj.get("unit") or None,
+        currency=obj.get("currency") or None,
+        publish=bool(obj.get("publish", True)),
+    )
+
+
+def build_registry(extra: Optional[Iterable[Any]] = None) -> Tuple[List[Indicator], List[str]]:
+    """
+    INDICATORS plus config entries (same key replaces the default; "enabled": false drops it).
+    Returns (indicators, warnings); a bad entry is skipped with a warning instead of failing the run.
+    """
+
+    by_key: Dict[str, Optional[Indicator]] = {ind.key: ind for ind in INDICATORS}
+    warnings: List[str] = []
+    for obj in extra or []:
+        if not isinstance(obj, dict):
+            warnings.append(f"market_indicators: expected an object, got {type(obj).__name__}")
+            continue
+        if obj.get("enabled") is False:
+            by_key[str(obj.get("key") or "")] = None
+            continue
+        try:
+            ind = indicator_from_config(obj)
+        except ValueError as e:
+            warnings.append(f"market_indicators: {e}")
+            continue
+        by_key[ind.key] = ind
+    return [ind for ind in by_key.values() if ind is not None], warnings
+
+
+# -----------------------------
+# Fetch (raced providers)
+# -----------------------------
+
+
+def race_quotes(
+    indicators: Sequence[Indicator],
+    *,
+    get_text: Callable[[QuoteProvider, str], str],
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Request every (indicator, source) pair concurrently; per indicator the first parse with a value wins.
+    Returns as soon as every indicator is resolved or out of sources; losing requests are left to their
+    (short) timeouts in the background.
+    """
+
+    quotes: Dict[str, Dict[str, Any]] = {}
+    errors: List[str] = []
+    pending_by_key = {ind.key: len(ind.sources) for ind in indicators}
+    jobs = [(ind, PROVIDERS[p], symbol, FORMATS[fmt]) for ind in indicators for p, symbol, fmt in ind.sources]
+    if not jobs:
+        return quotes, errors
+
+    def run(ind: Indicator, provider: QuoteProvider, symbol: str, parse: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        url = provider.url(symbol)
+        q = parse(get_text(provider, url))
+        if q.get("value") is None:
+            raise ValueError("missing value")
+        name = q.get("name") or ind.name or ind.label
+        out: Dict[str, Any] = {"id": ind.key, **q, "name": ind.name_format.format(name=name)}
+        if ind.unit is not None:
+            out["unit"] = ind.unit
+        if ind.currency is not None:
+            out["currency"] = ind.currency
+        return {**out, "provider": provider.name, "source_url": url}
+
+    pool = ThreadPoolExecutor(max_workers=len(jobs))
+    try:
+        futs = {pool.submit(run, *job): (job[0], job[1].name) for job in jobs}
+        for fut in as_completed(futs):
+            ind, provider_name = futs[fut]
+            pending_by_key[ind.key] -= 1
+            try:
+                q = fut.result()
+            except Exception as e:
+                if ind.key not in quotes:
+                    errors.append(f"{ind.label}({provider_name}) failed: {normalize_ws(str(e))}")
+            else:
+                quotes.setdefault(ind.key, q)
+            if all(k in quotes or n <= 0 for k, n in pending_by_key.items()):
+                break
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return quotes, errors
+
+
+def derive_gold_cny(xau: Dict[str, Any], fx: Dict[str, Any]) -> Dict[str, Any]:
+    fx_rate = float(fx["value"])
+    cny_value = float(xau["value"]) * fx_rate / TROY_OUNCE_GRAMS
+    prev_close_cny = (xau["prev_close"] * fx_rate / TROY_OUNCE_GRAMS) if xau.get("prev_close") is not None else None
+    chg = (cny_value - prev_close_cny) if prev_close_cny is not None else None
+    pct = (chg / prev_close_cny * 100.0) if (prev_close_cny is not None and prev_close_cny != 0) else None
+    return {
+        "id": "gds_AU9999",
+        "name": "沪金99（元/克）",
+        "value": cny_value,
+        "change": chg,
+        "change_pct": pct,
+        "prev_close": prev_close_cny,
+        "unit": "CNY/g",
+        "currency": "CNY",
+        "provider": "derived",
+        "source_url": f"{xau.get('source_url')}; {fx.get('source_url')}",
+        "as_of": xau.get("as_of") or fx.get("as_of"),
+    }
+
+
+def derive_missing(quotes: Dict[str, Dict[str, Any]], errors: List[str]) -> None:
+    # 若沪金（元/克）不可得，则用伦敦金 * USDCNY 折算为元/克
+    if "gds_AU9999" not in quotes and "hf_XAU" in quotes and "USDCNY" in quotes:
+        try:
+            quotes["gds_AU9999"] = derive_gold_cny(quotes["hf_XAU"], quotes["USDCNY"])
+        except Exception as e:
+            errors.append(f"Gold(CNY/g, derived) failed: {normalize_ws(str(e))}")
+
+
+# -----------------------------
+# Quote cache (short TTL)
+# -----------------------------
+
+
+def load_quote_cache(path: str, *, ttl_seconds: float, now: float) -> Dict[str, Dict[str, Any]]:
+    """
+    Quotes fetched less than `ttl_seconds` ago ({key: quote}); missing/corrupt file = empty.
+    """
+
+    if ttl_seconds <= 0 or not os.path.exists(path):
+        return {}
+    try:
+        doc = jsonio.read_json(path)
+    except (OSError, ValueError):
+        return {}
+    out: Dict[str, Dict[str, Any]] = {}
+    for key, rec in ((doc or {}).get("quotes") or {}).items():
+        if not isinstance(rec, dict) or not isinstance(rec.get("quote"), dict):
+            continue
+        age = now - float(rec.get("fetched_ts") or 0)
+        if 0 <= age < ttl_seconds:
+            out[str(key)] = rec["quote"]
+    return out
+
+
+def save_quote_cache(path: str, quotes: Dict[str, Dict[str, Any]], *, now: float) -> None:
+    """
+    Merge freshly fetched quotes into the cache file (other keys keep their own timestamps).
+    """
+
+    doc: Dict[str, Any] = {}
+    if os.path.exists(path):
+        try:
+            doc = jsonio.read_json(path) or {}
+        except (OSError, ValueError):
+            doc = {}
+    stored = doc.get("quotes") if isinstance(doc.get("quotes"), dict) else {}
+    for key, q in quotes.items():
+        stored[key] = {"fetched_ts": now, "quote": q}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    jsonio.write_json(path, {"quotes": stored})
+
+
+# -----------------------------
+# Time-series store (columnar, one file per indicator)
+# -----------------------------
+
+
+class SeriesStore:
+    """
+    NewsReport/data/market/<key>.json: {"version", "key", "name", "unit", "currency", "columns": {col: [...]}}.
+    Rows are sorted by date, one per date; new rows only go at the end.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.root)
+
+    def keys(self) -> List[str]:
+        if not self.exists():
+            return []
+        return sorted(fn[:-5] for fn in os.listdir(self.root) if fn.endswith(".json"))
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+    def read(self, key: str) -> Dict[str, Any]:
+        empty = {"version": SERIES_VERSION, "key": key, "columns": {c: [] for c in SERIES_COLUMNS}}
+        p = self.path(key)
+        if not os.path.exists(p):
+            return empty
+        try:
+            doc = jsonio.read_json(p)
+        except (OSError, ValueError):
+            return empty
+        cols = doc.get("columns") if isinstance(doc, dict) else None
+        if not isinstance(cols, dict) or not isinstance(cols.get("date"), list):
+            return empty
+        n = len(cols["date"])
+        doc["columns"] = {c: (list(cols.get(c) or []) + [None] * n)[:n] for c in SERIES_COLUMNS}
+        return doc
+
+    def write(self, doc: Dict[str, Any]) -> None:
+        # One line per column: appends show up as small, readable diffs in git.
+        head = {k: v for k, v in doc.items() if k != "columns"}
+        lines = [f"  {jsonio.dumps(k)}: {jsonio.dumps(v, compact=True)}," for k, v in head.items()]
+        cols = [f"    {jsonio.dumps(c)}: {jsonio.dumps(doc['columns'][c], compact=True)}" for c in SERIES_COLUMNS]
+        text = "{\n" + "\n".join(lines) + '\n  "columns": {\n' + ",\n".join(cols) + "\n  }\n}\n"
+        os.makedirs(self.root, exist_ok=True)
+        p = self.path(str(doc["key"]))
+        tmp = p + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, p)
+
+    def append(self, date_str: str, indicators: Iterable[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+        """
+        Append one row per indicator for `date_str` (a same-day rerun replaces the last row).
+        Returns (keys whose file changed, keys skipped because `date_str` is older than their last row).
+        """
+
+        changed: List[str] = []
+        skipped: List[str] = []
+        for ind in indicators:
+            key = str(ind.get("id") or "")
+            if not key or not isinstance(ind.get("value"), (int, float)):
+                continue
+            doc = self.read(key)
+            for meta_key in ("name", "unit", "currency"):
+                if ind.get(meta_key) is not None:
+                    doc[meta_key] = ind.get(meta_key)
+            cols = doc["columns"]
+            row = {c: (date_str if c == "date" else ind.get(c)) for c in SERIES_COLUMNS}
+            dates: List[str] = cols["date"]
+            if dates and date_str < dates[-1]:
+                skipped.append(key)
+                continue
+            if dates and dates[-1] == date_str:
+                if all(cols[c][-1] == row[c] for c in SERIES_COLUMNS):
+                    continue
+                for c in SERIES_COLUMNS:
+                    cols[c][-1] = row[c]
+            else:
+                for c in SERIES_COLUMNS:
+                    cols[c].append(row[c])
+            self.write(doc)
+            changed.append(key)
+        return changed, skipped
+
+
+def series_from_days(data_dir: str) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """
+    The store's documents rebuilt in memory from meta.market of every NewsReport/data/YYYY-MM-DD.json.
+    Returns (docs by key, number of days that carried a market snapshot).
+    """
+
+    by_key: Dict[str, Dict[str, Any]] = {}
+    n_days = 0
+    names = sorted(fn for fn in os.listdir(data_dir) if DAY_FILE_RE.match(fn)) if os.path.isdir(data_dir) else []
+    for fn in names:
+        try:
+            meta = (jsonio.read_json(os.path.join(data_dir, fn)) or {}).get("meta") or {}
+        except (OSError, ValueError, AttributeError):
+            continue
+        market = meta.get("market") if isinstance(meta, dict) else None
+        if not isinstance(market, dict) or not market.get("indicators"):
+            continue
+        n_days += 1
+        date_str = fn[:10]
+        for ind in market.get("indicators") or []:
+            if not isinstance(ind, dict) or not ind.get("id") or not isinstance(ind.get("value"), (int, float)):
+                continue
+            doc = by_key.setdefault(
+                str(ind["id"]),
+                {"version": SERIES_VERSION, "key": str(ind["id"]), "columns": {c: [] for c in SERIES_COLUMNS}},
+            )
+            for meta_key in ("name", "unit", "currency"):
+                if ind.get(meta_key) is not None:
+                    doc[meta_key] = ind.get(meta_key)
+            for c in SERIES_COLUMNS:
+                doc["columns"][c].append(date_str if c == "date" else ind.get(c))
+    return by_key, n_days
+
+
+def backfill_from_days(store: SeriesStore, data_dir: str) -> int:
+    """
+    Build the store from the day files (one-time migration). Returns the number of days with a snapshot.
+    """
+
+    by_key, n_days = series_from_days(data_dir)
+    os.makedirs(store.root, exist_ok=True)
+    for doc in by_key.values():
+        store.write(doc)
+    return n_days
+
+
+def open_store(data_dir: str) -> SeriesStore:
+    """
+    SeriesStore under data_dir/market, backfilled from the day files the first time it is opened.
+    Writer side only (the report run); readers use load_series.
+    """
+
+    store = SeriesStore(os.path.join(data_dir, "market"))
+    if not store.exists():
+        backfill_from_days(store, data_dir)
+    return store
+
+
+def load_series(data_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read-only: the store's documents, or (store not created yet) the same series rebuilt in memory.
+    """
+
+    store = SeriesStore(os.path.join(data_dir, "market"))
+    if not store.exists():
+        return series_from_days(data_dir)[0]
+    return {key: store.read(key) for key in store.keys()}
+
+
+def record_snapshot(data_dir: str, date_str: str, snapshot: Dict[str, Any]) -> List[str]:
+    """
+    Append today's published indicators (call after the day JSON is written, so a first-time
+    backfill already includes today). Returns the keys whose file changed.
+    """
+
+    store = open_store(data_dir)
+    changed, skipped = store.append(date_str, [x for x in snapshot.get("indicators") or [] if isinstance(x, dict)])
+    if skipped:
+        print(
+            f"[warn] market series: {date_str} is older than the last row of {', '.join(skipped)}; not inserted "
+            f"(delete {store.root} to rebuild it from the day files)",
+            file=sys.stderr,
+        )
+    return changed
+
+
+def _round(v: Any, digits: int = 4) -> Any:
+    return round(float(v), digits) if isinstance(v, (int, float)) else None
+
+
+def site_series(docs: Mapping[str, Dict[str, Any]], *, max_points: int = 0) -> Dict[str, Any]:
+    """
+    Compact chart data (from load_series): per indicator the first date, day offsets from it, and
+    value / change_pct columns. `max_points` > 0 keeps only the most recent rows.
+    """
+
+    series: Dict[str, Any] = {}
+    for key in sorted(docs):
+        doc = docs[key]
+        cols = doc["columns"]
+        dates: List[str] = cols["date"]
+        if not dates:
+            continue
+        start = len(dates) - max_points if max_points > 0 and len(dates) > max_points else 0
+        dates = dates[start:]
+        t0 = dt.date.fromisoformat(dates[0])
+        series[key] = {
+            "name": doc.get("name") or key,
+            "unit": doc.get("unit"),
+            "currency": doc.get("currency"),
+            "t0": dates[0],
+            "d": [(dt.date.fromisoformat(d) - t0).days for d in dates],
+            "v": [_round(x) for x in cols["value"][start:]],
+            "p": [_round(x, 2) for x in cols["change_pct"][start:]],
+        }
+    return series
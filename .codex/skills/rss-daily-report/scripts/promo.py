@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+promo
+=====
+
+活动营销 / 报名优惠类条目的预编译检测器（rss-editor-picks 的“软删除”规则）。
+
+- run.py 在 dedupe_entries 之后立即过滤，命中的条目不再占用平台配额、也不会进入 AI enrichment；
+- editor_picks 复用同一检测器：未达删除阈值的信号只作为挑选时的 promo 惩罚。
+
+信号是 (正则, 权重, 范围) 三元组：范围 "title" 只看标题，"text" 看标题 + 摘要/正文开头。
+权重累加达到 delete_score 即删除；命中 allow 白名单（如技术会议的演讲视频/复盘）的条目永不删除。
+"text" 范围的价格/商品词（元起、报价、航线 ...）只有在标题带活动/报名类信号（gate：活动预告/报名/席位/团期）时
+才计入删除分：否则“新机预售 + 官方报价”“春运抢票 + 航线”这类普通新闻也会凑够阈值。它们仍计入挑选时的 promo 惩罚。
+
+可在 my/config.json 的 defaults 里配置：
+  "promo_filter": true,                          # 去重后过滤（命令行 --no-promo-filter 关闭）
+  "promo_delete_score": 3,                       # 删除阈值
+  "promo_signals": [["早鸟票", 2, "title"]],     # 追加信号；与默认信号同正则时覆盖其权重（0 = 禁用）
+  "promo_allow": ["演讲实录"],                   # 追加白名单
+  "promo_gate": ["招募"]                         # 追加标题 gate 信号
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+PROMO_REASON = "活动预告/报名优惠，价格信息为主，信息密度低"
+DEFAULT_DELETE_SCORE = 3
+DEFAULT_SIGNALS: Tuple[Tuple[str, int, str], ...] = (
+    (r"活动预告", 3, "title"),
+    (r"报名", 2, "title"),
+    (r"购票|抢票", 2, "title"),
+    (r"点击.{0,8}报名|报名(?:入口|通道|链接)", 2, "text"),
+    (r"元\s*[/／]\s*人|\d+\s*元起", 2, "text"),
+    (r"席位|申领|登记|限量|早鸟|预售|团购", 1, "title"),
+    (r"航线|行程|团期|名额", 1, "text"),
+    (r"优惠|限时|折扣|报价|套餐", 1, "text"),
+)
+DEFAULT_ALLOW: Tuple[str, ...] = (r"演讲视频|回放|复盘|论文|slides",)
+# Title signals that mark an event/registration post; without one, text-scope signals cannot push an item to deletion.
+DEFAULT_GATE: Tuple[str, ...] = (r"活动预告|报名|席位|团期",)
+# Only the head of long descriptions is checked: promo posts put the call-to-action up front,
+# while long articles mention 行程/价格 in passing.
+TEXT_HEAD_CHARS = 400
+
+
+class PromoDetector:
+    """
+    Compiled once per run. A single alternation per scope rejects clean items with one scan each;
+    only items that hit something pay for the per-signal weighting.
+    """
+
+    def __init__(
+        self,
+        signals: Sequence[Tuple[str, int, str]] = DEFAULT_SIGNALS,
+        *,
+        delete_score: int = DEFAULT_DELETE_SCORE,
+        allow: Sequence[str] = DEFAULT_ALLOW,
+        gate: Sequence[str] = DEFAULT_GATE,
+    ) -> None:
+        active = [(p, int(w), "title" if s == "title" else "text") for p, w, s in signals if int(w) > 0]
+        self.delete_score = max(1, int(delete_score))
+        self.signals = tuple((re.compile(p, re.I), w, s) for p, w, s in active)
+        self._title_any = self._any([p for p, _, s in active if s == "title"])
+        self._text_any = self._any([p for p, _, s in active if s == "text"])
+        self._allow = self._any(list(allow))
+        self._gate = self._any(list(gate))
+
+    @staticmethod
+    def _any(patterns: List[str]) -> Optional["re.Pattern[str]"]:
+        if not patterns:
+            return None
+        return re.compile("|".join(f"(?:{p})" for p in patterns), re.I)
+
+    def _scores(self, title: str, text: str) -> Tuple[int, int, List[str]]:
+        text = text[:TEXT_HEAD_CHARS] if text else title
+        if not (self._title_any and self._title_any.search(title)) and not (
+            self._text_any and self._text_any.search(text)
+        ):
+            return 0, 0, []
+        title_score = text_score = 0
+        hits: List[str] = []
+        for rx, weight, scope in self.signals:
+            m = rx.search(title if scope == "title" else text)
+            if m:
+                if scope == "title":
+                    title_score += weight
+                else:
+                    text_score += weight
+                hits.append(m.group(0))
+        return title_score, text_score, hits
+
+    def score(self, title: str, text: str = "") -> Tuple[int, List[str]]:
+        """
+        Weighted promo score (every signal; editor picks uses it as a penalty) plus the matched snippets.
+        `text` should already include the title.
+        """
+
+        title_score, text_score, hits = self._scores(title, text)
+        return title_score + text_score, hits
+
+    def delete_score_of(self, title: str, text: str = "") -> Tuple[int, List[str]]:
+        """
+        Score that decides deletion: text-scope signals only count when the title passes the gate.
+        """
+
+        title_score, text_score, hits = self._scores(title, text)
+        if text_score and not (self._gate and self._gate.search(title)):
+            return title_score, hits
+        return title_score + text_score, hits
+
+    def check(self, title: str, text: str = "") -> Optional[str]:
+        """
+        Removal reason when the item should be soft-deleted, else None.
+        """
+
+        text = text or title
+        if self._allow and self._allow.search(text[:TEXT_HEAD_CHARS]):
+            return None
+        score, hits = self.delete_score_of(title, text)
+        if score < self.delete_score:
+            return None
+        return f"{PROMO_REASON}（{'/'.join(hits[:4])}）"
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "PromoDetector":
+        """
+        Build from my/config.json defaults (promo_signals / promo_delete_score / promo_allow / promo_gate).
+        Malformed entries are ignored.
+        """
+
+        merged: Dict[str, Tuple[int, str]] = {p: (w, s) for p, w, s in DEFAULT_SIGNALS}
+        for row in cfg.get("promo_signals") or []:
+            if not isinstance(row, (list, tuple)) or not row or not str(row[0]).strip():
+                continue
+            pattern = str(row[0]).strip()
+            try:
+                re.compile(pattern)
+                weight = int(row[1]) if len(row) > 1 else 1
+            except (re.error, TypeError, ValueError):
+                continue
+            scope = str(row[2]) if len(row) > 2 else "text"
+            merged[pattern] = (weight, scope)
+        allow = list(DEFAULT_ALLOW)
+        for pattern in cfg.get("promo_allow") or []:
+            try:
+                re.compile(str(pattern))
+            except re.error:
+                continue
+            allow.append(str(pattern))
+        gate = list(DEFAULT_GATE)
+        for pattern in cfg.get("promo_gate") or []:
+            try:
+                re.compile(str(pattern))
+            except re.error:
+                continue
+            gate.append(str(pattern))
+        try:
+            delete_score = int(cfg.get("promo_delete_score") or DEFAULT_DELETE_SCORE)
+        except (TypeError, ValueError):
+            delete_score = DEFAULT_DELETE_SCORE
+        return cls([(p, w, s) for p, (w, s) in merged.items()], delete_score=delete_score, allow=allow, gate=gate)
+
+
+DEFAULT_DETECTOR = PromoDetector()
+
+
+def removed_record(*, url: str, title: str, platform: str, source: str, reason: str) -> Dict[str, Any]:
+    """
+    One meta.removed_items[] entry (fields required by rss-editor-picks).
+    """
+
+    return {"url": url, "title": title, "platform": platform, "source": source, "reason": reason}
+
+
+def merge_removed(*groups: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Concatenate removed_items lists keeping the first record per URL.
+    """
+
+    out: List[Dict[str, Any]] = []
+    seen: set[str] = set()
+    for group in groups:
+        for r in group:
+            u = str(r.get("url") or "")
+            if u in seen:
+                continue
+            seen.add(u)
+            out.append(r)
+    return out
@@ -0,0 +1,62 @@
+"""
+rss_pipeline
+============
+
+rss-daily-report 的流水线包（run.py 只是它的命令行入口）：
+
+- cli.py：参数 / 配置 / 源列表，main()；
+- stages.py：阶段 API（fetch → parse → dedup → freshness → score → enrich → select → render → export）与批次类型；
+- 其余模块是各阶段的实现：net / feeds（抓取与解析）、catalog（sources.md）、scoring / classify / ai、
+  render、store（缓存与 JSON 导出）、schedule / cadence（抓取调度）、daemon（常驻模式）、market / trending。
+
+同目录的兄弟模块（promo、editor_picks、jsonio ...）仍按顶层模块导入，所以 scripts/ 需在 sys.path 上
+（直接运行 run.py 时即是如此）。
+"""
+
+from .cli import main
+from .models import EnrichedEntry, FeedEntry, FeedSource
+from .stages import (
+    DedupBatch,
+    FetchBatch,
+    ForeignSection,
+    FreshnessBatch,
+    Report,
+    RunContext,
+    ScoredEntry,
+    Selection,
+    dedup,
+    enrich,
+    export_json,
+    fetch,
+    freshness,
+    pick,
+    render,
+    run_report,
+    score,
+    select,
+)
+
+__all__ = [
+    "DedupBatch",
+    "EnrichedEntry",
+    "FeedEntry",
+    "FeedSource",
+    "FetchBatch",
+    "ForeignSection",
+    "FreshnessBatch",
+    "Report",
+    "RunContext",
+    "ScoredEntry",
+    "Selection",
+    "dedup",
+    "enrich",
+    "export_json",
+    "fetch",
+    "freshness",
+    "main",
+    "pick",
+    "render",
+    "run_report",
+    "score",
+    "select",
+]
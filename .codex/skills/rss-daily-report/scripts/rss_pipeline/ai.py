@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from .helpers import clean_fallback_point, is_mostly_english, normalize_ws, split_sentences, title_bigrams
+from .models import FeedEntry
+
+
+# -----------------------------
+# Optional AI enrichment (OpenAI)
+# -----------------------------
+
+
+def openai_chat_json(api_key: str, model: str, messages: List[Dict[str, str]], timeout_s: float = 30.0) -> Dict[str, Any]:
+    import urllib.request
+
+    payload = {"model": model, "messages": messages, "temperature": 0.2}
+    body = json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(
+        "https://api.openai.com/v1/chat/completions",
+        data=body,
+        headers={"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=timeout_s) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def maybe_ai_enrich(
+    entry: FeedEntry,
+    *,
+    category: str,
+    carrier: str,
+    enable_ai: bool,
+    model: str,
+) -> Optional[Tuple[str, List[str], List[str], float, Optional[str]]]:
+    if not enable_ai:
+        return None
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+
+    need_title_zh = is_mostly_english(entry.title)
+    system = (
+        "你是一个日报编辑。根据输入信息输出严格 JSON（不要 Markdown，不要多余字段）。"
+        "要求：摘要 2-4 句中文；要点最多 3 条；关键词 3-6 个；质量评分 1-5（可小数）。"
+        "要点必须是对内容的具体提炼（包含具体名词/事实/结论），不要输出模板化建议"
+        "（例如：'建议先扫一遍'、'收藏+打标签' 之类）。"
+        + ("原标题主要为英文时，额外输出 title_zh（中文标题翻译，尽量简洁）。" if need_title_zh else "")
+    )
+    user_obj = {
+        "source": entry.source_name,
+        "title": entry.title,
+        "description": entry.description,
+        "url": entry.url,
+        "category_hint": category,
+        "carrier_hint": carrier,
+        "published": entry.published,
+    }
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": json.dumps(user_obj, ensure_ascii=False)},
+        {
+            "role": "user",
+            "content": (
+                "{\"summary\":\"...\",\"key_points\":[\"...\"],\"keywords\":[\"...\"],\"quality_score\":4.2"
+                + (",\"title_zh\":\"...\"" if need_title_zh else "")
+                + "}"
+            ),
+        },
+    ]
+
+    try:
+        resp = openai_chat_json(api_key=api_key, model=model, messages=messages, timeout_s=35.0)
+        content = resp["choices"][0]["message"]["content"]
+        data = json.loads(content)
+        summary = normalize_ws(str(data.get("summary") or ""))
+        key_points = [normalize_ws(str(x)) for x in (data.get("key_points") or [])][:3]
+        key_points = [x for x in key_points if x]
+        keywords = [normalize_ws(str(x)) for x in (data.get("keywords") or [])][:6]
+        keywords = [x for x in keywords if x]
+        q = float(data.get("quality_score") or 3.0)
+        q = max(1.0, min(5.0, q))
+        title_zh = normalize_ws(str(data.get("title_zh") or "")) if need_title_zh else ""
+        if title_zh and title_zh.lower() == entry.title.lower():
+            title_zh = ""
+        if not summary:
+            return None
+        return summary, key_points, keywords, q, (title_zh or None)
+    except Exception:
+        return None
+
+
+def fallback_summary(entry: FeedEntry) -> Tuple[str, List[str]]:
+    summary = normalize_ws(entry.description or entry.title)
+    if len(summary) > 260:
+        summary = summary[:260].rstrip() + "…"
+    sents = split_sentences(entry.description or "")
+    bigrams = title_bigrams(entry.title)
+    scored: List[Tuple[int, int, str]] = []
+    for raw in sents:
+        s = clean_fallback_point(raw).strip().strip("。！？.!?").strip()
+        if not s:
+            continue
+        if len(s) < 12:
+            continue
+        score = 0
+        if bigrams:
+            for bg in bigrams:
+                if bg and bg in s:
+                    score += 1
+        scored.append((score, len(s), s))
+
+    # Prefer sentences that overlap with title; fall back to longer (more informative) ones.
+    scored.sort(key=lambda x: (-x[0], -x[1]))
+    points: List[str] = []
+    for score, _, s in scored:
+        if score == 0 and points:
+            # Once we already have some relevant points, avoid filling the rest with unrelated noise.
+            continue
+        if len(s) > 80:
+            s = s[:80].rstrip() + "…"
+        if s not in points:
+            points.append(s)
+        if len(points) >= 3:
+            break
+
+    if not points:
+        points = [clean_fallback_point(entry.title)[:80] or normalize_ws(entry.title)[:80]]
+
+    return summary, points[:3]
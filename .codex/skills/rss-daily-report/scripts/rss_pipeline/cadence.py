@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import datetime as dt
+import math
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .helpers import entry_content_keys, parse_published_dt
+from .models import FeedEntry
+
+
+# -----------------------------
+# Source cadence (publish inter-arrival stats + "not due" skip)
+# -----------------------------
+
+CADENCE_MAX_ARRIVALS = 24
+CADENCE_LOOKBACK_DAYS = 90
+
+
+def entry_arrival_ts(entry: FeedEntry, content_seen_entries: Dict[str, Any]) -> Optional[float]:
+    """
+    When the entry appeared: its published timestamp, else the day content_seen first recorded it.
+    Undated entries never seen before are ignored (the fetch time would re-count them every run).
+    """
+
+    pub = parse_published_dt(entry)
+    if pub is not None:
+        return pub.replace(tzinfo=dt.timezone.utc).timestamp()
+    for k in entry_content_keys(entry):
+        meta = content_seen_entries.get(k)
+        if isinstance(meta, dict) and meta.get("date_added"):
+            try:
+                return dt.datetime.fromisoformat(str(meta["date_added"]) + "T12:00:00+00:00").timestamp()
+            except ValueError:
+                continue
+    return None
+
+
+def update_source_cadence(stat: Dict[str, Any], arrivals: Iterable[float], *, fetched_at: float) -> None:
+    """
+    Merge this fetch's arrival timestamps into source_stats[url]["cadence"]:
+    arrivals (last CADENCE_MAX_ARRIVALS, epoch seconds), last_fetch_ts and mean_gap_h.
+
+    mean_gap_h is (last_fetch - first arrival) / n: the quiet time after the newest entry counts too,
+    so a feed that stopped publishing drifts towards "rarely due".
+    """
+
+    lo = fetched_at - CADENCE_LOOKBACK_DAYS * 86400.0
+    hi = fetched_at + 3600.0
+    cad = stat.setdefault("cadence", {})
+    merged = {int(x) for x in (cad.get("arrivals") or []) if isinstance(x, (int, float))}
+    merged.update(int(x) for x in arrivals if lo <= x <= hi)
+    kept = sorted(x for x in merged if x >= lo)[-CADENCE_MAX_ARRIVALS:]
+    cad["arrivals"] = kept
+    cad["last_fetch_ts"] = int(fetched_at)
+    cad["mean_gap_h"] = round(max(0.0, fetched_at - kept[0]) / 3600.0 / len(kept), 2) if kept else None
+
+
+def cadence_due(
+    stat: Optional[Dict[str, Any]],
+    *,
+    now: float,
+    threshold: float,
+    max_skip_hours: float,
+    min_samples: int = 4,
+) -> Tuple[bool, float]:
+    """
+    (due, p): p = 1 - exp(-elapsed / mean_gap) is the chance that at least one new entry appeared since
+    the last successful fetch, treating arrivals as a Poisson process. Not due when p < threshold.
+
+    Always due without enough samples, or once max_skip_hours have passed since the last fetch.
+    """
+
+    cad = (stat or {}).get("cadence") or {}
+    arrivals = cad.get("arrivals") or []
+    last = cad.get("last_fetch_ts")
+    gap_h = cad.get("mean_gap_h")
+    if len(arrivals) < max(1, int(min_samples)) or not last or not gap_h:
+        return True, 1.0
+    elapsed_h = max(0.0, (now - float(last)) / 3600.0)
+    if elapsed_h >= float(max_skip_hours):
+        return True, 1.0
+    p = 1.0 - math.exp(-elapsed_h / float(gap_h))
+    return p >= float(threshold), round(p, 3)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import os
+import re
+import urllib.parse
+from dataclasses import fields
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import catalog_cache
+import keymatch
+
+from .helpers import normalize_ws
+from .models import FeedSource
+
+
+# -----------------------------
+# sources.md parsing
+# -----------------------------
+
+
+def parse_sources_file(path: str) -> List[FeedSource]:
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+
+    with open(path, "r", encoding="utf-8") as f:
+        raw_lines = f.readlines()
+
+    def extract_urls(text: str) -> List[str]:
+        # Stop at whitespace / closing bracket / closing paren to handle Markdown links:
+        # [text](https://example.com/feed) or [https://example.com/feed](https://example.com/feed)
+        return re.findall(r"https?://[^\s\]\)]+", text or "")
+
+    # If this file looks like a Markdown table catalog (e.g. RSS源.md),
+    # only parse rows under the "名称|RSS源|..." table to avoid grabbing
+    # unrelated guide links above the table.
+    looks_like_table_catalog = any(("| 名称" in ln and "RSS" in ln) for ln in raw_lines)
+    if looks_like_table_catalog:
+        sources: List[FeedSource] = []
+        seen: set[str] = set()
+        in_table = False
+        for raw in raw_lines:
+            line = raw.strip()
+            if not line:
+                continue
+            if not in_table:
+                if line.startswith("|") and ("名称" in line) and ("RSS" in line):
+                    in_table = True
+                continue
+            # skip separator row like: | --- | --- | --- |
+            if re.match(r"^\|\s*-{3,}\s*\|", line):
+                continue
+            if not line.startswith("|"):
+                # end of table
+                break
+
+            cells = [normalize_ws(c) for c in line.strip().strip("|").split("|")]
+            if len(cells) < 2:
+                continue
+            name_cell = cells[0]
+            rss_cell = cells[1]
+            urls = extract_urls(rss_cell)
+            if not urls:
+                continue
+            # Prefer the link target in Markdown, which often appears last.
+            url = urls[-1].strip()
+            if url in seen:
+                continue
+            seen.add(url)
+            name = name_cell or (urllib.parse.urlsplit(url).netloc or url)
+            sources.append(FeedSource(name=name, url=url))
+        return sources
+
+    # Default: one URL per line (optionally with "Name<TAB>URL")
+    def parse_name_meta(raw_name: str) -> Tuple[str, Optional[str], float, Optional[int], Tuple[str, ...]]:
+        """
+        Parse optional metadata from the name cell.
+
+        Supported:
+          - Name|80                   -> weight=80
+          - Name|limit=15             -> per_feed_limit=15
+          - Name|80|limit=15          -> both
+          - Name|fallback=https://... -> fallback_urls
+          - Name|platform=Foo         -> platform group label
+        """
+
+        raw_name = normalize_ws(raw_name or "")
+        if not raw_name:
+            return "", None, 0.0, None, ()
+
+        parts = [normalize_ws(x) for x in raw_name.split("|") if normalize_ws(x)]
+        if not parts:
+            return "", None, 0.0, None, ()
+
+        name = parts[0]
+        platform: Optional[str] = None
+        weight = 0.0
+        per_feed_limit: Optional[int] = None
+        fallback_urls: List[str] = []
+
+        for seg in parts[1:]:
+            m_plat = re.match(r"^(?:platform|group)\s*=\s*(.+)$", seg, flags=re.I)
+            if m_plat:
+                platform = normalize_ws(m_plat.group(1))
+                continue
+
+            if re.fullmatch(r"[0-9]+(?:\.[0-9]+)?", seg):
+                try:
+                    weight = float(seg)
+                except Exception:
+                    weight = 0.0
+                continue
+
+            m_lim = re.match(r"^(?:limit|per_feed_limit)\s*=\s*([0-9]+)$", seg, flags=re.I)
+            if m_lim:
+                try:
+                    per_feed_limit = max(1, int(m_lim.group(1)))
+                except Exception:
+                    per_feed_limit = None
+                continue
+
+            m_fb = re.match(r"^(?:fallback|alt|mirror)\s*=\s*(https?://.+)$", seg, flags=re.I)
+            if m_fb:
+                u = normalize_ws(m_fb.group(1))
+                if u.startswith("http"):
+                    fallback_urls.append(u)
+                continue
+
+        # de-dup while keeping order
+        dedup_fb: List[str] = []
+        seen_fb: set[str] = set()
+        for u in fallback_urls:
+            if u in seen_fb:
+                continue
+            seen_fb.add(u)
+            dedup_fb.append(u)
+
+        return name, platform, weight, per_feed_limit, tuple(dedup_fb)
+
+    sources2: List[FeedSource] = []
+    seen2: set[str] = set()
+    for raw in raw_lines:
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        urls = extract_urls(line)
+        if not urls:
+            continue
+        url = urls[-1].strip()
+        # If the line contains multiple URLs, try to avoid obvious "viewer" links.
+        if len(urls) > 1:
+            for cand in reversed(urls):
+                try:
+                    dom = (urllib.parse.urlsplit(cand).netloc or "").lower()
+                except Exception:
+                    continue
+                if dom and ("webfollow.cc" not in dom) and ("chromewebstore.google.com" not in dom):
+                    url = cand.strip()
+                    break
+        idx = line.find(url)
+        raw_name = normalize_ws(line[:idx].strip()) if idx >= 0 else ""
+        name, platform, weight, per_feed_limit, fallback_urls = parse_name_meta(raw_name)
+        if not name:
+            name = urllib.parse.urlsplit(url).netloc or url
+        if url in seen2:
+            continue
+        seen2.add(url)
+        sources2.append(
+            FeedSource(
+                name=name,
+                url=url,
+                platform=platform,
+                weight=weight,
+                per_feed_limit=per_feed_limit,
+                fallback_urls=fallback_urls,
+            )
+        )
+    return sources2
+
+
+def read_keys_file(path: str) -> List[str]:
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    keys: List[str] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            # Keep spaces inside a key; only split by punctuation commonly used as separators.
+            parts = re.split(r"[，,、;；]+", line)
+            for p in parts:
+                k = normalize_ws(p)
+                if k:
+                    keys.append(k)
+    # de-dup while keeping order
+    out: List[str] = []
+    seen: set[str] = set()
+    for k in keys:
+        if k in seen:
+            continue
+        seen.add(k)
+        out.append(k)
+    return out
+
+
+def load_sources_file(path: str) -> List[FeedSource]:
+    """
+    parse_sources_file() behind the compiled catalog cache (catalog_cache.py): unchanged files skip parsing.
+    """
+
+    data = catalog_cache.load(path, "sources")
+    if isinstance(data, list):
+        try:
+            return [FeedSource(**{**d, "fallback_urls": tuple(d.get("fallback_urls") or ())}) for d in data]
+        except TypeError:
+            pass  # written by an incompatible FeedSource; fall through and rebuild
+    sources = parse_sources_file(path)
+    catalog_cache.store(path, "sources", [{f.name: getattr(s, f.name) for f in fields(FeedSource)} for s in sources])
+    return sources
+
+
+def load_keys_file(path: str) -> List[str]:
+    """
+    read_keys_file() behind the compiled catalog cache.
+    """
+
+    data = catalog_cache.load(path, "keys")
+    if isinstance(data, list) and all(isinstance(k, str) for k in data):
+        return list(data)
+    keys = read_keys_file(path)
+    catalog_cache.store(path, "keys", keys)
+    return keys
+
+
+def assign_platform_keys(sources: Iterable[FeedSource], keys: List[str]) -> Dict[str, str]:
+    """
+    source url -> platform key, for every source matching at least one key (select-keys mode).
+    When multiple keys match a source, prefer the longest (more specific) key;
+    tie-break by the order in keys. One automaton pass per source (see keymatch.py).
+    """
+
+    index = keymatch.SourceKeyIndex(keys)
+    out: Dict[str, str] = {}
+    for src in sources:
+        k = index.best(src.name, src.url)
+        if k:
+            out[src.url] = k
+    return out
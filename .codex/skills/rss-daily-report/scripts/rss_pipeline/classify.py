@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import datetime as dt
+import urllib.parse
+from typing import Any, Dict, Iterable, List, Optional
+
+from .models import FeedEntry, FeedSource
+
+
+# -----------------------------
+# Classification (topic + carrier)
+# -----------------------------
+
+
+CATEGORY_ORDER = ["技术", "商业/产品", "生活", "时事", "财经", "娱乐", "其他"]
+GROUP_BY_CHOICES = ["platform", "topic", "none"]
+
+
+def infer_platform_base_weight(*, source_name: str, source_url: str) -> float:
+    """
+    RSS/Atom 本身通常没有“阅读量/点赞/热搜指数”等真实热度指标。
+    这里用一个可解释的“平台基线权重”做兜底：按平台类型给一个默认排序倾向。
+    用户可在 sources.md 里用 Name|80 覆盖/微调。
+    """
+
+    name = (source_name or "").lower()
+    domain = (urllib.parse.urlsplit(source_url).netloc or "").lower()
+
+    # Hotlists / mainstream platforms
+    if "weibo" in domain or "微博" in name:
+        return 100.0
+    if "zhihu" in domain or "知乎" in name:
+        return 90.0
+
+    # Tech/product/media
+    if "36kr" in domain or "36氪" in name:
+        return 80.0
+    if "github.com" in domain or "github" in name:
+        return 60.0
+    if "sspai" in domain or "少数派" in name:
+        return 70.0
+    if "xueqiu" in domain or "雪球" in name:
+        return 65.0
+    if "ruanyifeng" in domain or "阮一峰" in name:
+        return 55.0
+    if "v2ex" in domain or "v2ex" in name:
+        return 55.0
+
+    # News / others
+    if "zaobao" in domain or "早报" in name:
+        return 50.0
+    if "telegram" in name:
+        return 35.0
+
+    return 0.0
+
+
+def compute_platform_heat(
+    *,
+    cache: Dict[str, Any],
+    sources: List[FeedSource],
+    today: dt.date,
+    window_days: int,
+    group_for_source: Optional[Any] = None,
+) -> Dict[str, float]:
+    """
+    平台热度 = 基线权重 + 最近 window_days 天被收录次数（从 cache.article_history 统计）。
+    说明：这是“可计算”的近似热度，并不等价于真实阅读量/热搜指数。
+    """
+
+    window_days = max(1, int(window_days))
+
+    # Base weights (infer + per-source override), aggregated by group.
+    base: Dict[str, float] = {}
+    for s in sources:
+        group = group_for_source(s) if callable(group_for_source) else s.name
+        w = max(0.0, float(s.weight or 0.0))
+        w = max(w, infer_platform_base_weight(source_name=s.name, source_url=s.url))
+        base[str(group)] = max(base.get(str(group), 0.0), w)
+
+    # Recent history counts.
+    counts: Dict[str, int] = {}
+    hist = cache.get("article_history", {})
+    if isinstance(hist, dict):
+        for d_str, day_items in hist.items():
+            if not isinstance(d_str, str) or d_str.startswith("_"):
+                continue
+            try:
+                d = dt.date.fromisoformat(d_str)
+            except Exception:
+                continue
+            delta = (today - d).days
+            if delta < 0 or delta >= window_days:
+                continue
+            if not isinstance(day_items, list):
+                continue
+            for it in day_items:
+                if not isinstance(it, dict):
+                    continue
+                g = it.get("platform") or it.get("source")
+                if not g:
+                    continue
+                counts[str(g)] = counts.get(str(g), 0) + 1
+
+    out: Dict[str, float] = {}
+    for k, w in base.items():
+        out[k] = float(w) + float(counts.get(k, 0))
+    # Also keep counts for any historical sources no longer in sources list.
+    for k, c in counts.items():
+        out.setdefault(k, float(c))
+    return out
+
+
+def carrier_from_entry(entry: FeedEntry) -> str:
+    url = entry.url.lower()
+    domain = urllib.parse.urlsplit(entry.url).netloc.lower()
+
+    if entry.enclosure_type:
+        t = entry.enclosure_type.lower()
+        if t.startswith("audio/"):
+            return "播客"
+        if t.startswith("video/"):
+            return "视频"
+
+    if "github.com" in domain:
+        return "项目"
+    if "youtube.com" in domain or "bilibili.com" in domain:
+        return "视频"
+    if "news.ycombinator.com/item" in url or "v2ex.com/t" in url:
+        return "帖子"
+    return "文章"
+
+
+def contains_any(text: str, words: Iterable[str]) -> bool:
+    t = text.lower()
+    for w in words:
+        if w and w.lower() in t:
+            return True
+    return False
+
+
+def classify_topic(entry: FeedEntry) -> str:
+    """
+    Rule-based, explainable classification.
+    You can fork/extend this for your own taste.
+    """
+
+    text = f"{entry.source_name} {entry.title} {entry.description}"
+    domain = urllib.parse.urlsplit(entry.url).netloc.lower()
+    source = entry.source_name
+
+    # Strong source hints (only when the source is almost single-topic).
+    if any(k in source for k in ("阮一峰",)) or domain in {"www.ruanyifeng.com"}:
+        return "技术"
+    if any(k in source for k in ("V2EX",)) or domain in {"v2ex.com"}:
+        return "技术"
+    if any(k in source for k in ("36氪", "36kr", "Product")) or domain in {"www.36kr.com", "36kr.com"}:
+        return "商业/产品"
+
+    # Keyword rules (weaker than source rules).
+    tech_kw = [
+        "ai",
+        "llm",
+        "agent",
+        "开源",
+        "编程",
+        "python",
+        "rust",
+        "go",
+        "kubernetes",
+        "数据库",
+        "安全",
+        "漏洞",
+        "前端",
+        "后端",
+        "算法",
+        "架构",
+        "云",
+        "macos",
+        "windows",
+        "docker",
+        "git",
+    ]
+    biz_kw = ["融资", "ipo", "估值", "收购", "并购", "市场", "商业", "产品", "运营", "用户", "增长", "创业", "电商"]
+    finance_kw = ["股票", "基金", "美股", "a股", "港股", "投资", "经济", "利率", "通胀", "财报", "央行", "比特币", "黄金"]
+    news_kw = ["国际", "外交", "政府", "法院", "选举", "总统", "部长", "警方", "通报", "突发", "战争", "冲突"]
+    life_kw = ["健康", "运动", "睡眠", "习惯", "心理", "育儿", "饮食", "旅行", "自驾", "租车", "穿衣", "穿搭", "指南", "复盘", "避坑"]
+    ent_kw = ["电影", "电视剧", "综艺", "游戏", "音乐", "动画", "4k", "蓝光"]
+
+    if contains_any(text, finance_kw):
+        return "财经"
+    if contains_any(text, biz_kw):
+        return "商业/产品"
+    if contains_any(text, news_kw):
+        return "时事"
+    if contains_any(text, ent_kw):
+        return "娱乐"
+    if contains_any(text, life_kw):
+        return "生活"
+    if contains_any(text, tech_kw):
+        return "技术"
+
+    return "其他"
@@ -0,0 +1,750 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import github_trending
+import stage_profiler
+
+from .catalog import assign_platform_keys, load_keys_file, load_sources_file
+from .classify import GROUP_BY_CHOICES
+from .daemon import run_daemon
+from .helpers import normalize_ws
+from .models import FeedSource
+from .net import force_requests_ipv4, is_proxy_reachable
+from .paths import (
+    DEFAULT_OUT_DIR,
+    DEFAULT_REPO_CATALOG_PATH,
+    DEFAULT_REPO_CONFIG_PATH,
+    DEFAULT_REPO_KEYS_PATH,
+    DEFAULT_REPO_SITE_DIR,
+    DEFAULT_STAGING_PATH,
+    SKILL_DIR,
+)
+from .stages import RunContext, run_report
+
+
+# -----------------------------
+# Main
+# -----------------------------
+
+
+def parse_date_arg(date_str: Optional[str]) -> str:
+    if not date_str:
+        return dt.date.today().isoformat()
+    dt.date.fromisoformat(date_str)
+    return date_str
+
+
+def load_config(argv: List[str]) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    Optional JSON config (repo-friendly): (config path, its "defaults" dict). CLI flags always override config.
+    """
+
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument("--config", default=None, help="Optional JSON config file.")
+    pre.add_argument("--no-config", action="store_true", help="Disable auto loading my/config.json.")
+    pre_args, _ = pre.parse_known_args(argv)
+
+    cfg_path: Optional[str] = None
+    if not bool(pre_args.no_config):
+        cfg_path = (
+            str(pre_args.config)
+            if pre_args.config
+            else (DEFAULT_REPO_CONFIG_PATH if os.path.exists(DEFAULT_REPO_CONFIG_PATH) else None)
+        )
+
+    cfg_defaults: Dict[str, Any] = {}
+    if cfg_path:
+        try:
+            with open(cfg_path, "r", encoding="utf-8") as f:
+                obj = json.load(f)
+            if isinstance(obj, dict) and isinstance(obj.get("defaults"), dict):
+                cfg_defaults = dict(obj.get("defaults") or {})
+        except Exception:
+            cfg_defaults = {}
+    return cfg_path, cfg_defaults
+
+
+def build_parser(cfg_defaults: Dict[str, Any], cfg_path: Optional[str] = None) -> argparse.ArgumentParser:
+    def cfg_get(key: str, fallback: Any) -> Any:
+        v = cfg_defaults.get(key, fallback)
+        return fallback if v is None else v
+
+    parser = argparse.ArgumentParser(description="Generate a daily report from RSS/Atom feeds.")
+    parser.add_argument("date", nargs="?", help="Optional date: YYYY-MM-DD (default: today)")
+    parser.add_argument("--config", default=cfg_path, help="Optional JSON config file (default: my/config.json if exists).")
+    parser.add_argument("--no-config", action="store_true", help="Disable auto loading my/config.json.")
+    parser.add_argument(
+        "--sources",
+        action="append",
+        help="sources list file (repeatable). Supports simple list or a Markdown table catalog.",
+    )
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="Output directory (default: NewsReport/)")
+    parser.add_argument(
+        "--max-items",
+        type=int,
+        default=cfg_defaults.get("max_items", None),
+        help="Max published items overall (default: 50; set 0 for unlimited).",
+    )
+    parser.add_argument(
+        "--per-feed-limit",
+        type=int,
+        default=int(cfg_get("per_feed_limit", 10)),
+        help="Max items per feed to consider (default: 10)",
+    )
+    parser.add_argument(
+        "--min-score",
+        type=float,
+        default=float(cfg_get("min_score", 2.6)),
+        help="Minimum score to include (default: 2.6)",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=int,
+        default=int(cfg_get("time_budget", 120)),
+        help="Max wall time budget in seconds (default: 120)",
+    )
+    parser.add_argument(
+        "--per-source-timeout",
+        type=float,
+        default=float(cfg_get("per_source_timeout", 0)),
+        help="Max wall time per source in seconds (0 = disable).",
+    )
+    parser.add_argument(
+        "--auto-time-budget",
+        dest="auto_time_budget",
+        action="store_true",
+        default=None,
+        help="Auto compute time budget from source count and per-source timeout.",
+    )
+    parser.add_argument(
+        "--no-auto-time-budget",
+        dest="auto_time_budget",
+        action="store_false",
+        default=None,
+        help="Disable auto time budget.",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=int(cfg_get("retries", 0)),
+        help="Retry count for network errors per endpoint (default: 0).",
+    )
+    parser.add_argument(
+        "--retry-sleep-ms",
+        type=int,
+        default=int(cfg_get("retry_sleep_ms", 0)),
+        help="Sleep between retries in milliseconds (default: 0).",
+    )
+    parser.add_argument(
+        "--market",
+        dest="market",
+        action="store_true",
+        default=None,
+        help="Fetch market indicators (SSE index + spot gold) and write into daily JSON meta.",
+    )
+    parser.add_argument(
+        "--no-market",
+        dest="market",
+        action="store_false",
+        default=None,
+        help="Disable market indicators fetching.",
+    )
+    parser.add_argument(
+        "--market-timeout",
+        type=float,
+        default=float(cfg_get("market_timeout", 6)),
+        help="Market fetch read timeout seconds (connect timeout fixed at 3s; default: 6).",
+    )
+    parser.add_argument(
+        "--market-cache-ttl",
+        type=float,
+        default=float(cfg_get("market_cache_ttl", 300)),
+        help="Reuse market quotes fetched within this many seconds (state/market_quotes.json; 0 = always refetch; default: 300).",
+    )
+    parser.add_argument(
+        "--proxy",
+        default=str(cfg_get("proxy", "") or ""),
+        help="Optional HTTP proxy URL applied to both http/https (e.g. http://127.0.0.1:7890).",
+    )
+    parser.add_argument(
+        "--prefer-ipv4",
+        dest="prefer_ipv4",
+        action="store_true",
+        default=None,
+        help="Prefer IPv4 for requests (helps in IPv6-unreachable environments). Default: enabled in repo auto-mode.",
+    )
+    parser.add_argument(
+        "--no-prefer-ipv4",
+        dest="prefer_ipv4",
+        action="store_false",
+        default=None,
+        help="Do not force IPv4 preference.",
+    )
+    parser.add_argument(
+        "--group-by",
+        choices=GROUP_BY_CHOICES,
+        default=str(cfg_get("group_by", "platform")),
+        help="Report grouping mode: platform (default), topic, none",
+    )
+    parser.add_argument(
+        "--platform-heat-window-days",
+        type=int,
+        default=int(cfg_get("platform_heat_window_days", 30)),
+        help="Platform heat lookback window days (default: 30, only for --group-by platform)",
+    )
+    parser.add_argument(
+        "--per-platform-limit",
+        type=int,
+        default=int(cfg_get("per_platform_limit", 0)),
+        help="When --group-by platform: keep top N items per platform (default: 0 = disabled).",
+    )
+    parser.add_argument(
+        "--per-platform-limit-overrides",
+        default=None,
+        help='Optional JSON dict for per-platform overrides, e.g. {"HelloGitHub 月刊":1}. Prefer config file.',
+    )
+    parser.add_argument(
+        "--platform-top-by",
+        choices=["recent", "quality"],
+        default=str(cfg_get("platform_top_by", "recent")),
+        help="When using --per-platform-limit: select top items by recent (default) or quality.",
+    )
+    parser.add_argument(
+        "--fresh-window-days",
+        type=int,
+        default=int(cfg_get("fresh_window_days", 3)),
+        help="Treat items published within N days as fresh (default: 3).",
+    )
+    parser.add_argument(
+        "--fallback-fresh-top-k",
+        type=int,
+        default=int(cfg_get("fallback_fresh_top_k", 3)),
+        help="If published is missing, treat top-K items per feed as fresh (default: 3).",
+    )
+    parser.add_argument(
+        "--backfill-daily-cap",
+        type=int,
+        default=int(cfg_get("backfill_daily_cap", 3)),
+        help="How many backfill (old inventory) items to show in the report (default: 3; 0=disable).",
+    )
+    parser.add_argument(
+        "--backfill-per-platform-limit",
+        type=int,
+        default=int(cfg_get("backfill_per_platform_limit", 1)),
+        help="Per-platform cap for backfill selection (default: 1).",
+    )
+    parser.add_argument(
+        "--min-items-floor",
+        type=int,
+        default=int(cfg_get("min_items_floor", 0)),
+        help="Ensure at least N items are shown in the main list by supplementing from backfill (default: 0 = disabled).",
+    )
+    parser.add_argument(
+        "--floor-per-platform-cap",
+        type=int,
+        default=int(cfg_get("floor_per_platform_cap", 3)),
+        help="When supplementing from backfill to reach --min-items-floor, cap items per platform in the main list (default: 3).",
+    )
+    parser.add_argument(
+        "--circuit-breaker-fail-streak",
+        type=int,
+        default=int(cfg_get("circuit_breaker_fail_streak", 3)),
+        help="Mute a source after N consecutive failures (default: 3).",
+    )
+    parser.add_argument(
+        "--circuit-breaker-mute-days",
+        type=int,
+        default=int(cfg_get("circuit_breaker_mute_days", 2)),
+        help="Mute duration days after tripping circuit breaker (default: 2).",
+    )
+    parser.add_argument(
+        "--telemetry-window-days",
+        type=int,
+        default=int(cfg_get("telemetry_window_days", 14)),
+        help="Window for fetch timing p50/p95 in the report and meta.fetch_telemetry (default: 14).",
+    )
+    parser.add_argument(
+        "--hedge-fallbacks",
+        dest="hedge_fallbacks",
+        action="store_true",
+        default=None,
+        help="For sources with fallback URLs: if an endpoint sends no headers within --hedge-percentile of its "
+        "historical latency, fire the next fallback in parallel and keep the first valid feed.",
+    )
+    parser.add_argument(
+        "--no-hedge-fallbacks",
+        dest="hedge_fallbacks",
+        action="store_false",
+        default=None,
+        help="Try fallback URLs strictly one after another (default unless enabled via config).",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=float(cfg_get("hedge_percentile", 90)),
+        help="Latency percentile (source_stats) after which a hedged request is fired (default: 90).",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=int(cfg_get("parse_workers", 0)),
+        help="Parse feeds in N workers instead of the fetch threads (0 = off, default; "
+        "pays off for large catalogs on multi-core hosts).",
+    )
+    parser.add_argument(
+        "--parse-backend",
+        # Same values as parse_pool.PARSE_BACKENDS (not imported here: it pulls in multiprocessing).
+        choices=["auto", "threads", "interpreters", "processes"],
+        default=str(cfg_get("parse_backend", "auto")),
+        help="Workers for --parse-workers: auto (default: threads on a free-threaded build, else "
+        "sub-interpreters on Python 3.14+, else processes), threads, interpreters, processes.",
+    )
+    parser.add_argument(
+        "--cadence-skip",
+        dest="cadence_skip",
+        action="store_true",
+        default=None,
+        help="Skip sources unlikely to have new entries given their publish cadence (source_stats); shown as '跳过：未到期'.",
+    )
+    parser.add_argument(
+        "--no-cadence-skip",
+        dest="cadence_skip",
+        action="store_false",
+        default=None,
+        help="Fetch every source regardless of cadence (default unless enabled via config).",
+    )
+    parser.add_argument(
+        "--cadence-skip-threshold",
+        type=float,
+        default=float(cfg_get("cadence_skip_threshold", 0.2)),
+        help="Skip when the chance of a new entry since the last fetch is below this (default: 0.2).",
+    )
+    parser.add_argument(
+        "--cadence-max-skip-hours",
+        type=float,
+        default=float(cfg_get("cadence_max_skip_hours", 48)),
+        help="Always fetch a source again after this many hours, whatever its cadence (default: 48).",
+    )
+    parser.add_argument(
+        "--dynamic-platform-quota",
+        dest="dynamic_platform_quota",
+        action="store_true",
+        default=None,
+        help="Dynamically adjust per-platform quota by recent activity (default: enabled via config).",
+    )
+    parser.add_argument(
+        "--no-dynamic-platform-quota",
+        dest="dynamic_platform_quota",
+        action="store_false",
+        default=None,
+        help="Disable dynamic per-platform quota adjustment.",
+    )
+    parser.add_argument(
+        "--platform-quota-window-days",
+        type=int,
+        default=int(cfg_get("platform_quota_window_days", 14)),
+        help="Lookback window days for dynamic platform quota (default: 14).",
+    )
+    parser.add_argument(
+        "--cold-start-quota-cap",
+        type=int,
+        default=int(cfg_get("cold_start_quota_cap", 5)),
+        help="For platforms without recent history, cap today's quota by this number (default: 5).",
+    )
+    parser.add_argument(
+        "--select-keys-file",
+        default=cfg_defaults.get("select_keys_file", None),
+        help="Optional file of platform keywords (one per line) to filter sources by name/url.",
+    )
+    parser.add_argument(
+        "--select-key",
+        action="append",
+        default=None,
+        help="Optional platform keyword (repeatable) to filter sources by name/url.",
+    )
+    parser.add_argument(
+        "--github-top10",
+        dest="github_top10",
+        action="store_true",
+        default=None,
+        help="Include GitHub Trending top 10 (default: enabled in repo auto-mode).",
+    )
+    parser.add_argument(
+        "--no-github-top10",
+        dest="github_top10",
+        action="store_false",
+        default=None,
+        help="Disable GitHub Trending top 10.",
+    )
+    parser.add_argument(
+        "--github-trending-since",
+        default=str(cfg_get("github_trending_since", "daily")),
+        help="GitHub Trending window(s): daily/weekly/monthly, comma-separated to fan out (default: daily).",
+    )
+    parser.add_argument(
+        "--github-trending-languages",
+        default=str(cfg_get("github_trending_languages", "") or ""),
+        help="Comma-separated Trending languages to fan out over, 'all' = all-languages page (default: all only).",
+    )
+    parser.add_argument(
+        "--github-trending-top",
+        type=int,
+        default=int(cfg_get("github_trending_top", 10)),
+        help="Repos kept after merging/ranking the Trending pages (default: 10).",
+    )
+    parser.add_argument(
+        "--export-json",
+        dest="export_json",
+        action="store_true",
+        default=None,
+        help="Write structured JSON data under NewsReport/data (default: enabled).",
+    )
+    parser.add_argument(
+        "--no-export-json",
+        dest="export_json",
+        action="store_false",
+        default=None,
+        help="Disable writing structured JSON data.",
+    )
+    parser.add_argument(
+        "--editor-picks",
+        dest="editor_picks",
+        action="store_true",
+        default=None,
+        help="Select editorial lead/top picks in-process (pin + Markdown block) before writing the report (default: enabled).",
+    )
+    parser.add_argument(
+        "--no-editor-picks",
+        dest="editor_picks",
+        action="store_false",
+        default=None,
+        help="Disable editorial picks.",
+    )
+    parser.add_argument(
+        "--editor-soft-delete",
+        dest="editor_soft_delete",
+        action="store_true",
+        default=bool(cfg_get("editor_soft_delete", True)),
+        help="Editor picks: drop promo/registration/price-heavy items into meta.removed_items (default: enabled).",
+    )
+    parser.add_argument(
+        "--no-editor-soft-delete",
+        dest="editor_soft_delete",
+        action="store_false",
+        help="Editor picks: keep promo items (only penalize them when picking).",
+    )
+    parser.add_argument(
+        "--promo-filter",
+        dest="promo_filter",
+        action="store_true",
+        default=None,
+        help="Drop promo/registration/price-heavy entries right after de-dup, before quota and enrichment (default: enabled).",
+    )
+    parser.add_argument(
+        "--no-promo-filter",
+        dest="promo_filter",
+        action="store_false",
+        default=None,
+        help="Disable the post-dedupe promo filter.",
+    )
+    parser.add_argument(
+        "--editor-lead-n",
+        dest="editor_lead_n",
+        type=int,
+        default=int(cfg_get("editor_lead_n", 1)),
+        help="How many lead items to pin (default: 1).",
+    )
+    parser.add_argument(
+        "--editor-top-n",
+        dest="editor_top_n",
+        type=int,
+        default=int(cfg_get("editor_top_n", 5)),
+        help="How many top items to pin (default: 5).",
+    )
+    parser.add_argument(
+        "--build-site",
+        dest="build_site",
+        action="store_true",
+        default=None,
+        help="Update local reading site under ./site (default: enabled in repo auto-mode).",
+    )
+    parser.add_argument(
+        "--no-build-site",
+        dest="build_site",
+        action="store_false",
+        default=None,
+        help="Disable updating local reading site.",
+    )
+    parser.add_argument(
+        "--site-dir",
+        default=DEFAULT_REPO_SITE_DIR,
+        help="Site output directory (default: ./site).",
+    )
+    parser.add_argument(
+        "--site-legacy-data-js",
+        dest="site_legacy_data_js",
+        action="store_true",
+        default=bool(cfg_get("site_legacy_data_js", False)),
+        help="Also write the single-file site/assets/data.js for the legacy site (reads the whole history).",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Do not write report/cache files")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=bool(cfg_get("profile", False)),
+        help="Time each pipeline stage: Chrome trace JSON under --profile-dir plus meta.stage_timings_ms.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=str(cfg_get("profile_dir", os.path.join(SKILL_DIR, "state", "profiles"))),
+        help="Where --profile writes <date>-<time>.trace.json (default: skill state/profiles/).",
+    )
+    parser.add_argument("--no-ai", action="store_true", help="Disable AI even if OPENAI_API_KEY is set")
+    parser.add_argument("--openai-model", default=os.getenv("OPENAI_MODEL", "gpt-4o-mini"), help="OpenAI model")
+    parser.add_argument(
+        "--foreign-news-section",
+        action="store_true",
+        help="Add a separate section by randomly sampling foreign-news feeds (source name/url keyword match).",
+    )
+    parser.add_argument(
+        "--foreign-source-key",
+        action="append",
+        default=None,
+        help="Keyword for identifying foreign-news sources (repeatable).",
+    )
+    parser.add_argument(
+        "--foreign-sample-feeds",
+        type=int,
+        default=3,
+        help="How many foreign-news feed URLs to randomly sample (default: 3).",
+    )
+    parser.add_argument(
+        "--foreign-section-limit",
+        type=int,
+        default=10,
+        help="How many items to keep in the foreign-news section (default: 10).",
+    )
+    parser.add_argument(
+        "--foreign-seed",
+        default=None,
+        help="Optional random seed for foreign-news sampling (default: deterministic by date).",
+    )
+    parser.add_argument(
+        "--daemon",
+        dest="daemon",
+        action="store_true",
+        default=False,
+        help="Watch mode: poll each feed on its own adaptive interval into a staging store, build the report daily at --report-at.",
+    )
+    parser.add_argument("--no-daemon", dest="daemon", action="store_false", help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--report-at",
+        default=str(cfg_get("daemon_report_at", "07:30")),
+        help="Daemon: local time (HH:MM) to assemble the daily report from staging (default: 07:30).",
+    )
+    parser.add_argument(
+        "--poll-min-seconds",
+        type=float,
+        default=float(cfg_get("daemon_poll_min_seconds", 900)),
+        help="Daemon: shortest per-feed poll interval (default: 900).",
+    )
+    parser.add_argument(
+        "--poll-max-seconds",
+        type=float,
+        default=float(cfg_get("daemon_poll_max_seconds", 21600)),
+        help="Daemon: longest per-feed poll interval (default: 21600).",
+    )
+    parser.add_argument(
+        "--staging-path",
+        default=str(cfg_get("staging_path", DEFAULT_STAGING_PATH)),
+        help="Daemon staging store (default: <skill>/state/staging.json).",
+    )
+    parser.add_argument(
+        "--staging-keep-days",
+        type=int,
+        default=int(cfg_get("staging_keep_days", 7)),
+        help="Daemon: drop staged entries first seen more than N days ago (default: 7).",
+    )
+    parser.add_argument(
+        "--from-staging",
+        action="store_true",
+        help="Build the report from the daemon staging store; only never-polled sources are fetched live.",
+    )
+    parser.add_argument(
+        "--daemon-exit-after-report",
+        action="store_true",
+        help="Daemon: exit after the first report (for testing / supervised one-shot use).",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    main_started = time.perf_counter()
+    argv = argv if argv is not None else sys.argv[1:]
+
+    cfg_path, cfg_defaults = load_config(argv)
+    args = build_parser(cfg_defaults, cfg_path).parse_args(argv)
+
+    # Apply config-only defaults that are awkward to express in argparse defaults.
+    # (e.g. --sources is "append", and some flags use tri-state None/True/False.)
+    if not args.sources:
+        cfg_sources = cfg_defaults.get("sources")
+        if isinstance(cfg_sources, list) and cfg_sources:
+            args.sources = [str(x).strip() for x in cfg_sources if str(x).strip()]
+
+    for tri_flag in [
+        "prefer_ipv4",
+        "github_top10",
+        "export_json",
+        "build_site",
+        "market",
+        "dynamic_platform_quota",
+        "auto_time_budget",
+        "promo_filter",
+        "cadence_skip",
+        "hedge_fallbacks",
+    ]:
+        if getattr(args, tri_flag, None) is None and isinstance(cfg_defaults.get(tri_flag), bool):
+            setattr(args, tri_flag, bool(cfg_defaults.get(tri_flag)))
+
+    proxies: Optional[Dict[str, str]] = None
+    proxy = normalize_ws(str(getattr(args, "proxy", "") or ""))
+    if proxy:
+        if is_proxy_reachable(proxy):
+            proxies = {"http": proxy, "https": proxy}
+        else:
+            # Don't fail the whole run if the proxy is not reachable (common on WSL if Windows proxy binds 127.0.0.1 only).
+            print(f"[warn] proxy not reachable, disabled: {proxy}", file=sys.stderr)
+
+    date_str = parse_date_arg(args.date)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    # Repo-friendly defaults:
+    # - If this repo has RSS源.md + my/RSS.md and user didn't pass --sources,
+    #   auto use them so keys like “知乎 / V2EX / 雪球 …” actually get fetched.
+    # - Otherwise fall back to the skill's own sources.md (publishable behavior).
+    auto_mode = False
+    if not args.sources:
+        if os.path.exists(DEFAULT_REPO_CATALOG_PATH) and os.path.exists(DEFAULT_REPO_KEYS_PATH):
+            args.sources = [DEFAULT_REPO_CATALOG_PATH]
+            if not args.select_keys_file:
+                args.select_keys_file = DEFAULT_REPO_KEYS_PATH
+            auto_mode = True
+        else:
+            args.sources = [os.path.join(SKILL_DIR, "sources.md")]
+
+    # Auto-mode = 更偏“全量抓取再精选”的体验：不改用户显式传参，只在默认值时适度放宽。
+    if auto_mode:
+        if int(args.time_budget) == 120:
+            args.time_budget = 240
+        if int(args.per_feed_limit) == 10:
+            args.per_feed_limit = 30
+        if args.prefer_ipv4 is None:
+            args.prefer_ipv4 = True
+
+    if bool(args.prefer_ipv4):
+        force_requests_ipv4()
+
+    # Stage profiler: a no-op unless --profile; stages are marked in pipeline order below.
+    prof = stage_profiler.StageProfiler(enabled=bool(args.profile), origin=main_started)
+    prof.span("config load", main_started, time.perf_counter())
+    prof.mark("sources parse")
+
+    sources_files = args.sources
+    all_sources: List[FeedSource] = []
+    seen_urls: set[str] = set()
+    for p in sources_files:
+        for s in load_sources_file(p):
+            if s.url in seen_urls:
+                continue
+            seen_urls.add(s.url)
+            all_sources.append(s)
+
+    sources = list(all_sources)
+
+    selected_keys: List[str] = []
+    if args.select_keys_file:
+        selected_keys.extend(load_keys_file(args.select_keys_file))
+    if args.select_key:
+        selected_keys.extend([normalize_ws(x) for x in args.select_key if normalize_ws(x)])
+    # de-dup while keeping order
+    if selected_keys:
+        deduped: List[str] = []
+        seen_k: set[str] = set()
+        for k in selected_keys:
+            if k in seen_k:
+                continue
+            seen_k.add(k)
+            deduped.append(k)
+        selected_keys = deduped
+
+    if selected_keys:
+        # One key = one platform group. Include all matched sources as redundancy,
+        # then de-dup entries later (URL + title hash) to avoid missing items due to failures.
+        platform_for_source_url = assign_platform_keys(sources, selected_keys)
+        sources = [s for s in sources if s.url in platform_for_source_url]
+        if not sources:
+            raise SystemExit(f"No sources matched the selected keys: {selected_keys}")
+        matched = set(platform_for_source_url.values())
+        missing = [k for k in selected_keys if k not in matched]
+        if missing:
+            print(f"Warning: no sources matched keys: {missing}", file=sys.stderr)
+    else:
+        platform_for_source_url = {}
+
+    # If sources provide an explicit platform/group label, apply it when not already overridden by selected_keys.
+    for s in sources:
+        if s.platform:
+            platform_for_source_url.setdefault(s.url, str(s.platform))
+
+    enable_github_top10 = bool(args.github_top10) if args.github_top10 is not None else bool(auto_mode)
+    if enable_github_top10:
+        gh_windows = github_trending.split_list(str(args.github_trending_since))
+        bad_windows = [w for w in gh_windows if w not in github_trending.WINDOWS]
+        if bad_windows:
+            raise SystemExit(f"--github-trending-since: unknown window(s) {bad_windows}; use daily/weekly/monthly")
+        gh_url = github_trending.source_url(
+            windows=gh_windows,
+            languages=github_trending.split_list(str(getattr(args, "github_trending_languages", "") or "")),
+        )
+        if gh_url not in {s.url for s in sources}:
+            gh_top = max(1, int(getattr(args, "github_trending_top", 10) or 10))
+            gh_src = FeedSource(
+                name="GitHub Trending", url=gh_url, weight=60.0, per_feed_limit=gh_top if gh_top != 10 else None
+            )
+            sources.append(gh_src)
+            all_sources.append(gh_src)
+            platform_for_source_url.setdefault(gh_url, "GitHub")
+
+    if bool(getattr(args, "daemon", False)):
+        return run_daemon(
+            args=args,
+            argv=argv,
+            sources=sources,
+            platform_for_source_url=platform_for_source_url,
+            proxies=proxies,
+        )
+
+    # fetch → parse → dedup → freshness → score → enrich → select → render → export (see stages.py).
+    return run_report(
+        RunContext(
+            args=args,
+            argv=list(argv),
+            cfg=cfg_defaults,
+            date_str=date_str,
+            auto_mode=auto_mode,
+            proxies=proxies,
+            all_sources=all_sources,
+            sources=sources,
+            platform_for_source_url=platform_for_source_url,
+            selected_keys=selected_keys,
+            prof=prof,
+        )
+    )
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import fields
+from typing import Any, Dict, Iterable, List, Optional
+
+from .feeds import fetch_source_entries
+from .helpers import normalize_ws
+from .models import FeedEntry, FeedSource
+from .net import is_source_muted, maybe_trip_circuit_breaker, record_source_result
+from .paths import DEFAULT_CACHE_DIR, DEFAULT_CACHE_PATH, DEFAULT_SOURCE_SAMPLES_PATH
+from .store import CacheStore, load_cache, read_json, write_json
+
+
+# -----------------------------
+# Daemon / watch mode (per-feed polling + staging store)
+# -----------------------------
+
+FEED_ENTRY_FIELDS = tuple(f.name for f in fields(FeedEntry))
+
+
+class StagingStore:
+    """
+    Entries collected by daemon polls, keyed by feed URL. Report runs with `--from-staging` read from here
+    instead of fetching every feed inside the time budget.
+
+    Layout:
+      {"version": 1, "last_report_date": "YYYY-MM-DD", "sources": {url: {
+          "last_poll": ts, "last_ok": ts, "next_due": ts, "interval_s": s, "error": str|None,
+          "entries": [{...FeedEntry fields, "first_seen": ts}, ...]}}}
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.data: Dict[str, Any] = {"version": self.VERSION, "sources": {}}
+
+    def load(self) -> None:
+        try:
+            obj = read_json(self.path)
+        except Exception:
+            obj = None
+        if isinstance(obj, dict) and obj.get("version") == self.VERSION and isinstance(obj.get("sources"), dict):
+            self.data = obj
+
+    def flush(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        write_json(self.path, self.data, compact=True)
+
+    def source(self, url: str) -> Dict[str, Any]:
+        return self.data["sources"].setdefault(url, {"entries": []})
+
+    def entries_for(self, url: str) -> Optional[List[FeedEntry]]:
+        """
+        Staged entries (feed order, newest poll first), or None if the source was never polled.
+        Raises if every poll so far failed, so the report shows the failure instead of fetching live.
+        """
+
+        st = self.data["sources"].get(url)
+        if not isinstance(st, dict) or not st.get("last_poll"):
+            return None
+        if not st.get("last_ok"):
+            raise RuntimeError(f"staged poll failed: {st.get('error') or 'unknown error'}")
+        out: List[FeedEntry] = []
+        for d in st.get("entries") or []:
+            if isinstance(d, dict) and d.get("url"):
+                out.append(FeedEntry(**{k: d.get(k) for k in FEED_ENTRY_FIELDS if k in d}))
+        return out
+
+    def merge(self, url: str, items: List[FeedEntry], *, now: float, keep: int) -> int:
+        """
+        Put the latest poll first, keep older staged entries that rolled off the feed (up to `keep`).
+        Returns how many entries were not staged before.
+        """
+
+        st = self.source(url)
+        old = {str(d.get("url")): d for d in st.get("entries") or [] if isinstance(d, dict)}
+        merged: List[Dict[str, Any]] = []
+        seen: set[str] = set()
+        new_count = 0
+        for e in items:
+            if not e.url or e.url in seen:
+                continue
+            seen.add(e.url)
+            prev = old.get(e.url)
+            if prev is None:
+                new_count += 1
+            merged.append({**e.__dict__, "first_seen": float((prev or {}).get("first_seen") or now)})
+        for u, d in old.items():
+            if u not in seen:
+                merged.append(d)
+        st["entries"] = merged[: max(1, int(keep))]
+        st["last_poll"] = now
+        st["last_ok"] = now
+        st["error"] = None
+        return new_count
+
+    def record_error(self, url: str, error: str, *, now: float) -> None:
+        st = self.source(url)
+        st["last_poll"] = now
+        st["error"] = normalize_ws(error)[:300]
+
+    def prune(self, *, now: float, keep_days: int, source_urls: Iterable[str]) -> None:
+        """
+        Drop entries first seen more than `keep_days` ago and sources no longer in the catalog.
+        """
+
+        cutoff = now - max(1, int(keep_days)) * 86400
+        wanted = set(source_urls)
+        for url in list(self.data["sources"].keys()):
+            if url not in wanted:
+                del self.data["sources"][url]
+                continue
+            st = self.data["sources"][url]
+            st["entries"] = [d for d in st.get("entries") or [] if float(d.get("first_seen") or 0) >= cutoff]
+
+
+def initial_poll_interval(
+    cache: Dict[str, Any],
+    src: FeedSource,
+    *,
+    today: dt.date,
+    min_s: float,
+    max_s: float,
+    window_days: int = 14,
+) -> float:
+    """
+    First guess from article_history: sources that published more per day are polled more often
+    (about twice per expected new item), clamped to [min_s, max_s].
+    The measured cadence in source_stats wins when present.
+    """
+
+    gap_h = (((cache.get("source_stats") or {}).get(src.url) or {}).get("cadence") or {}).get("mean_gap_h")
+    if gap_h:
+        return max(min_s, min(max_s, float(gap_h) * 3600.0 / 2.0))
+
+    hist = cache.get("article_history") or {}
+    published = 0
+    for d, items in hist.items():
+        try:
+            age = (today - dt.date.fromisoformat(str(d))).days
+        except ValueError:
+            continue
+        if 0 <= age < window_days and isinstance(items, list):
+            published += sum(1 for it in items if isinstance(it, dict) and it.get("source") == src.name)
+    per_day = published / float(max(1, window_days))
+    if per_day <= 0:
+        return max_s
+    return max(min_s, min(max_s, 86400.0 / (2.0 * per_day)))
+
+
+def next_poll_interval(current: float, *, ok: bool, new_items: int, min_s: float, max_s: float) -> float:
+    """
+    Multiplicative adjustment: shrink when a poll found new entries, grow when it found none,
+    back off harder on errors.
+    """
+
+    factor = 2.0 if not ok else (0.6 if new_items > 0 else 1.5)
+    return max(min_s, min(max_s, float(current or max_s) * factor))
+
+
+def parse_hhmm(value: str) -> dt.time:
+    m = re.match(r"^\s*(\d{1,2}):(\d{2})\s*$", str(value or ""))
+    if not m or int(m.group(1)) > 23 or int(m.group(2)) > 59:
+        raise SystemExit(f"invalid --report-at (expected HH:MM): {value!r}")
+    return dt.time(int(m.group(1)), int(m.group(2)))
+
+
+def run_daemon(
+    *,
+    args: argparse.Namespace,
+    argv: List[str],
+    sources: List[FeedSource],
+    platform_for_source_url: Dict[str, str],
+    proxies: Optional[Dict[str, str]],
+) -> int:
+    """
+    Long-running watch mode:
+      - each feed is polled on its own adaptive interval; results accumulate in the staging store;
+      - at --report-at (local time) the daily report is assembled in-process via `main(... --from-staging)`,
+        so report time no longer depends on the slowest feeds.
+    Stops on SIGINT/SIGTERM (or after one report with --daemon-exit-after-report).
+    """
+
+    from .cli import main  # cli dispatches --daemon here; imported late to avoid the cycle
+
+    if args.date:
+        raise SystemExit("daemon mode builds today's report at --report-at; omit the date argument")
+    report_at = parse_hhmm(str(args.report_at))
+    min_s = max(30.0, float(args.poll_min_seconds))
+    max_s = max(min_s, float(args.poll_max_seconds))
+    tick = 15.0
+
+    staging = StagingStore(str(args.staging_path))
+    staging.load()
+    cache_store = CacheStore(DEFAULT_CACHE_DIR, legacy_path=DEFAULT_CACHE_PATH, samples_path=DEFAULT_SOURCE_SAMPLES_PATH)
+    cache = load_cache(cache_store)
+
+    started = time.time()
+    for src in sources:
+        st = staging.source(src.url)
+        if not st.get("interval_s"):
+            st["interval_s"] = initial_poll_interval(cache, src, today=dt.date.today(), min_s=min_s, max_s=max_s)
+        if not st.get("last_ok"):
+            st["next_due"] = started
+    staging.flush()
+
+    stop = threading.Event()
+
+    def on_signal(signum: int, _frame: Any) -> None:
+        print(f"[daemon] signal {signum}, stopping after in-flight polls", file=sys.stderr)
+        stop.set()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            signal.signal(sig, on_signal)
+        except (ValueError, OSError):
+            pass
+
+    def poll(src: FeedSource) -> List[FeedEntry]:
+        return fetch_source_entries(
+            src,
+            date_str=dt.date.today().isoformat(),
+            per_feed_limit=int(args.per_feed_limit),
+            retries=int(args.retries),
+            retry_sleep_ms=int(args.retry_sleep_ms),
+            proxies=proxies,
+            per_source_timeout=float(getattr(args, "per_source_timeout", 0) or 0),
+            platform=platform_for_source_url.get(src.url),
+        )
+
+    print(
+        f"[daemon] watching {len(sources)} source(s); report at {report_at.strftime('%H:%M')}; "
+        f"poll interval {min_s:.0f}s..{max_s:.0f}s; staging={staging.path}",
+        file=sys.stderr,
+    )
+    keep = max(10, 2 * int(args.per_feed_limit))
+    inflight: Dict[Future, FeedSource] = {}
+    with ThreadPoolExecutor(max_workers=min(12, max(4, len(sources)))) as ex:
+        while not stop.is_set():
+            now = time.time()
+            today = dt.date.today()
+            busy = {s.url for s in inflight.values()}
+            for src in sources:
+                st = staging.source(src.url)
+                if src.url in busy or float(st.get("next_due") or 0) > now:
+                    continue
+                if is_source_muted(cache, url=src.url, today=today):
+                    st["next_due"] = now + max_s
+                    continue
+                inflight[ex.submit(poll, src)] = src
+
+            if inflight:
+                done, _ = wait(list(inflight), timeout=tick, return_when=FIRST_COMPLETED)
+            else:
+                done = set()
+            for fut in done:
+                src = inflight.pop(fut)
+                st = staging.source(src.url)
+                finished = time.time()
+                try:
+                    new_items = staging.merge(src.url, fut.result(), now=finished, keep=keep)
+                    ok = True
+                    record_source_result(cache, url=src.url, today=today, ok=True)
+                except Exception as e:
+                    new_items, ok = 0, False
+                    staging.record_error(src.url, str(e), now=finished)
+                    record_source_result(cache, url=src.url, today=today, ok=False, error=str(e))
+                    maybe_trip_circuit_breaker(
+                        cache,
+                        url=src.url,
+                        today=today,
+                        fail_streak_threshold=int(getattr(args, "circuit_breaker_fail_streak", 3)),
+                        mute_days=int(getattr(args, "circuit_breaker_mute_days", 2)),
+                    )
+                st["interval_s"] = next_poll_interval(
+                    float(st.get("interval_s") or max_s), ok=ok, new_items=new_items, min_s=min_s, max_s=max_s
+                )
+                st["next_due"] = finished + float(st["interval_s"])
+                if new_items:
+                    print(f"[daemon] {src.name}: +{new_items} (next in {st['interval_s']:.0f}s)", file=sys.stderr)
+            if done:
+                staging.flush()
+                if not args.dry_run:
+                    cache_store.flush(cache, ["source_health"])
+
+            # Report once per day at report_at. On a cold start, give the first round of polls up to
+            # time_budget seconds so the report is not built from an empty store.
+            now_local = dt.datetime.now()
+            due_at = dt.datetime.combine(today, report_at)
+            all_polled = all(staging.source(s.url).get("last_poll") for s in sources)
+            if (
+                staging.data.get("last_report_date") != today.isoformat()
+                and now_local >= due_at
+                and (all_polled or time.time() - started > float(args.time_budget))
+            ):
+                staging.flush()
+                report_argv = [today.isoformat(), *argv, "--no-daemon", "--from-staging"]
+                print(f"[daemon] building report {today.isoformat()} from staging", file=sys.stderr)
+                try:
+                    rc = main(report_argv)
+                except SystemExit as e:
+                    rc = int(e.code or 0) if isinstance(e.code, int) else 1
+                except Exception as e:
+                    print(f"[daemon] report failed: {e}", file=sys.stderr)
+                    rc = 1
+                staging.data["last_report_date"] = today.isoformat()
+                staging.prune(now=time.time(), keep_days=int(args.staging_keep_days), source_urls=[s.url for s in sources])
+                staging.flush()
+                # The report run rewrote cache sections (content_seen/article_history/...): reload.
+                cache = load_cache(cache_store)
+                if bool(args.daemon_exit_after_report):
+                    stop.set()
+                    break
+                if rc != 0:
+                    print(f"[daemon] report exited with {rc}", file=sys.stderr)
+
+            if not inflight:
+                next_due = min((float(staging.source(s.url).get("next_due") or 0) for s in sources), default=now + tick)
+                stop.wait(max(0.5, min(tick, next_due - time.time())))
+        for fut in inflight:
+            fut.cancel()
+    staging.flush()
+    return 0
@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+import fetch_telemetry
+
+from .helpers import normalize_ws, safe_url, sanitize_xml_bytes, strip_html
+from .models import FeedEntry, FeedSource
+from .net import DEFAULT_REQUEST_TIMEOUT, FetchCancelled, abortable_session, http_get_bytes_with_meta
+from .trending import fetch_github_trending_source
+
+
+# -----------------------------
+# RSS/Atom parsing
+# -----------------------------
+
+# (title, link, description, published, enclosure_type, guid): plain tuples so they pickle cheaply (parse_pool.py).
+ParsedItem = Tuple[str, str, str, Optional[str], Optional[str], Optional[str]]
+
+XML_NS_RE = re.compile(r"\{(.+)\}")
+
+
+def parse_feed(xml_bytes: bytes) -> List[ParsedItem]:
+    """
+    Return list:
+      (title, link, description, published, enclosure_type, guid)
+
+    Pure function of its input (the parser and every element are local, helpers are side-effect-free), so it
+    may run on any thread, sub-interpreter or worker process at once.
+    """
+
+    import xml.etree.ElementTree as ET
+
+    try:
+        root = ET.fromstring(xml_bytes)
+    except Exception:
+        # Best-effort repair for malformed feeds (most commonly illegal control chars).
+        root = ET.fromstring(sanitize_xml_bytes(xml_bytes))
+    tag = root.tag.lower()
+
+    if tag.endswith("rss"):
+        chan = root.find("channel")
+        if chan is None:
+            return []
+        out = []
+        for item in chan.findall("item"):
+            title = normalize_ws(item.findtext("title") or "")
+            link = normalize_ws(item.findtext("link") or "")
+            desc = item.findtext("description") or ""
+            if not desc:
+                for child in item:
+                    if child.tag.lower().endswith("encoded") and (child.text or "").strip():
+                        desc = child.text
+                        break
+            pub = normalize_ws(item.findtext("pubDate") or "") or None
+            guid = normalize_ws(item.findtext("guid") or "") or None
+
+            enclosure = item.find("enclosure")
+            enclosure_type = enclosure.attrib.get("type") if enclosure is not None else None
+
+            if title and link:
+                out.append((title, link, strip_html(desc), pub, enclosure_type, guid))
+        return out
+
+    if tag.endswith("feed"):
+        ns = {"a": XML_NS_RE.match(root.tag).group(1)} if root.tag.startswith("{") else {}
+        entries = root.findall("a:entry", ns) if ns else root.findall("entry")
+        out = []
+        for e in entries:
+            title = normalize_ws(
+                e.findtext("a:title", default="", namespaces=ns) if ns else e.findtext("title", default="")
+            )
+            link = ""
+            link_el = e.find("a:link", ns) if ns else e.find("link")
+            if link_el is not None:
+                link = normalize_ws(link_el.attrib.get("href") or "")
+
+            summary = e.findtext("a:summary", default="", namespaces=ns) if ns else e.findtext("summary", default="")
+            content = e.findtext("a:content", default="", namespaces=ns) if ns else e.findtext("content", default="")
+            desc = strip_html(summary or content or "")
+
+            updated = normalize_ws(
+                e.findtext("a:updated", default="", namespaces=ns) if ns else e.findtext("updated", default="")
+            ) or None
+            guid = normalize_ws(
+                e.findtext("a:id", default="", namespaces=ns) if ns else e.findtext("id", default="")
+            ) or None
+
+            if title and link:
+                out.append((title, link, desc, updated, None, guid))
+        return out
+
+    return []
+
+
+def fetch_feed_hedged(
+    candidates: List[str],
+    attempt: Callable[..., List[Any]],
+    *,
+    hedge_after: float,
+) -> Tuple[List[Any], Optional[str], Optional[BaseException]]:
+    """
+    Hedged fetch across endpoints (primary first, then fallbacks in order).
+
+    - An endpoint that has not produced headers within `hedge_after` seconds gets the next candidate
+      fired alongside it; a failed/empty endpoint immediately releases the next one.
+    - The first non-empty parsed feed wins; the others are aborted (each attempt has its own session whose
+      sockets are shut down, so a loser still waiting for headers fails at once) and are not waited for.
+
+    Returns (items, url of the winner or last endpoint tried, last error).
+    """
+
+    cancel = threading.Event()
+    pending: Dict["Future[Any]", str] = {}
+    headers_seen: Dict[str, threading.Event] = {}
+    aborts: List[Callable[[], None]] = []
+    queue = list(candidates)
+    last_url: Optional[str] = None
+    last_err: Optional[BaseException] = None
+    pool = ThreadPoolExecutor(max_workers=len(candidates))
+
+    def launch() -> None:
+        u = queue.pop(0)
+        ev = headers_seen[u] = threading.Event()
+        session, abort = abortable_session()
+        aborts.append(abort)
+        pending[pool.submit(attempt, u, cancel, ev.set, session)] = u
+
+    try:
+        launch()
+        while pending:
+            stalled = [u for u in pending.values() if not headers_seen[u].is_set()]
+            wait_s = max(0.0, float(hedge_after)) if (queue and stalled) else None
+            done, _ = wait(list(pending), timeout=wait_s, return_when=FIRST_COMPLETED)
+            if not done:
+                # Nothing finished; hedge only if no in-flight endpoint has started answering.
+                if all(not headers_seen[u].is_set() for u in pending.values()):
+                    launch()
+                continue
+            for fut in done:
+                u = pending.pop(fut)
+                last_url = u
+                try:
+                    got = fut.result()
+                except FetchCancelled:
+                    raise
+                except Exception as e:
+                    last_err = e
+                    continue
+                if got:
+                    return got, u, None
+            # Every finished endpoint failed or came back empty: each one releases the next candidate
+            # now, even while a stalled one is still in flight.
+            for _ in range(min(len(done), len(queue))):
+                launch()
+        return [], last_url, last_err
+    finally:
+        cancel.set()
+        for abort in aborts:
+            abort()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_and_parse_source(
+    source: FeedSource,
+    *,
+    per_feed_limit: int,
+    retries: int = 0,
+    retry_sleep_ms: int = 0,
+    proxies: Optional[Dict[str, str]] = None,
+    per_source_timeout: float = 0.0,
+    deadline: Optional[float] = None,
+    hedge_after: Optional[float] = None,
+    timings: Optional[List[Dict[str, Any]]] = None,
+    parse: Optional[Callable[[bytes], List[ParsedItem]]] = None,
+) -> List[FeedEntry]:
+    """
+    Try source.url, then each fallback URL, until one parses as a non-empty feed.
+    `deadline` (epoch seconds) is the run-wide time budget: past it, the request in flight is abandoned
+    and FetchCancelled propagates instead of moving on to the next fallback.
+    `hedge_after` (seconds, opt-in): if an endpoint has not sent headers by then, the next fallback is
+    fired in parallel and the first valid feed wins (see fetch_feed_hedged).
+    `timings`: one fetch_telemetry record per endpoint attempt is appended (dns/connect/tls/ttfb/body/parse,
+    bytes, items; `error` for failed attempts).
+    `parse`: replaces parse_feed for the downloaded bytes (e.g. ParsePool.parse: parsing in a worker process).
+    """
+
+    timeout = DEFAULT_REQUEST_TIMEOUT
+    dom = (urllib.parse.urlsplit(source.url).netloc or "").lower()
+    if "v2ex.com" in dom:
+        timeout = (6.0, 12.0)
+    elif "rsshub.app" in dom:
+        timeout = (5.0, 10.0)
+    per_source_budget = float(per_source_timeout or 0.0)
+    source_started_at = time.time()
+
+    def split_timeout(total_seconds: float, base: Tuple[float, float]) -> Tuple[float, float]:
+        total = max(0.5, float(total_seconds))
+        # Allocate 40% for connect, 60% for read, both capped by base timeout.
+        connect = min(float(base[0]), max(0.5, total * 0.4))
+        read = min(float(base[1]), max(0.5, total * 0.6))
+        return (connect, read)
+
+    candidates: List[str] = [source.url]
+    for u in source.fallback_urls:
+        if u and u not in candidates:
+            candidates.append(u)
+
+    metas: Dict[str, Dict[str, Any]] = {}
+
+    def attempt(
+        u: str,
+        cancel: Optional[threading.Event] = None,
+        on_headers: Optional[Callable[[], None]] = None,
+        session: Optional["requests.Session"] = None,
+    ) -> List[ParsedItem]:
+        if per_source_budget > 0:
+            elapsed = time.time() - source_started_at
+            if elapsed >= per_source_budget:
+                raise TimeoutError(f"per-source timeout ({per_source_budget:.0f}s) exceeded: {source.url}")
+            remaining = per_source_budget - elapsed
+            timeout_for_request = split_timeout(remaining, timeout)
+        else:
+            timeout_for_request = timeout
+        timing = fetch_telemetry.RequestTiming(u) if timings is not None else None
+
+        def headers_in() -> None:
+            if timing is not None:
+                timing.headers()
+            if on_headers is not None:
+                on_headers()
+
+        try:
+            xml_bytes, meta = http_get_bytes_with_meta(
+                u,
+                timeout=timeout_for_request,
+                retries=retries,
+                retry_sleep_ms=retry_sleep_ms,
+                proxies=proxies,
+                deadline=deadline,
+                cancel=cancel,
+                on_headers=headers_in if (timing is not None or on_headers is not None) else None,
+                session=session,
+            )
+        except Exception as e:
+            if timing is not None and timings is not None:
+                timing.abandon()
+                timings.append({**timing.as_dict(), "error": type(e).__name__})
+            raise
+        meta = dict(meta or {})
+        metas[u] = meta
+        if timing is not None:
+            timing.done(len(xml_bytes or b""))
+            timing.status = int(meta.get("status_code") or 0)
+        parse_started = time.perf_counter()
+        try:
+            sample = (xml_bytes or b"")[:200].decode("utf-8", errors="ignore")
+            sample = normalize_ws(sample).strip()
+            if sample:
+                meta["sample"] = sample
+        except Exception:
+            pass
+        got: List[ParsedItem] = []
+        parse_err = ""
+        try:
+            got = (parse or parse_feed)(xml_bytes)
+        except Exception as e:
+            parse_err = type(e).__name__
+            raise
+        finally:
+            if timing is not None and timings is not None:
+                timings.append(
+                    {
+                        **timing.as_dict(),
+                        "parse_ms": int(round((time.perf_counter() - parse_started) * 1000.0)),
+                        "items": len(got),
+                        **({"error": parse_err} if parse_err else {}),
+                    }
+                )
+        # If the endpoint returns non-feed HTML (e.g., WAF block page), treat as failure and try fallback.
+        if not got and b"<html" in (xml_bytes or b"").lower():
+            raise ValueError("non-feed HTML response")
+        return got
+
+    last_err: Optional[BaseException] = None
+    last_url: Optional[str] = None
+    items: List[ParsedItem] = []
+    if hedge_after is not None and len(candidates) > 1:
+        items, last_url, last_err = fetch_feed_hedged(candidates, attempt, hedge_after=float(hedge_after))
+    else:
+        for u in candidates:
+            last_url = u
+            try:
+                items = attempt(u)
+                if items:
+                    break
+            except FetchCancelled:
+                raise
+            except Exception as e:
+                last_err = e
+                items = []
+                continue
+    last_meta: Dict[str, Any] = metas.get(last_url or "", {})
+    if not items:
+        if last_err:
+            status = str(last_meta.get("status_code") or "")
+            ctype = normalize_ws(str(last_meta.get("content_type") or ""))
+            final_url = normalize_ws(str(last_meta.get("final_url") or ""))
+            sample = normalize_ws(str(last_meta.get("sample") or ""))
+            extra = []
+            if status:
+                extra.append(f"status={status}")
+            if ctype:
+                extra.append(f"content-type={ctype}")
+            if final_url and final_url != (last_url or ""):
+                extra.append(f"final={final_url}")
+            if sample:
+                extra.append(f"sample={sample[:200]}")
+            extra_str = ("; " + ", ".join(extra)) if extra else ""
+            raise RuntimeError(f"failed after {len(candidates)} endpoint(s), last={last_url}{extra_str}: {last_err}")
+        raise RuntimeError(f"failed after {len(candidates)} endpoint(s)")
+
+    out: List[FeedEntry] = []
+    for idx, (title, link, desc, pub, enclosure_type, guid) in enumerate(items[:per_feed_limit]):
+        out.append(
+            FeedEntry(
+                source_name=source.name,
+                source_url=source.url,
+                platform=source.name,
+                source_pos=idx,
+                title=title,
+                url=safe_url(link),
+                description=normalize_ws(desc),
+                guid=guid,
+                published=pub,
+                enclosure_type=enclosure_type,
+            )
+        )
+    return out
+
+
+def fetch_source_entries(
+    src: FeedSource,
+    *,
+    date_str: str,
+    per_feed_limit: int,
+    retries: int,
+    retry_sleep_ms: int,
+    proxies: Optional[Dict[str, str]],
+    per_source_timeout: float,
+    platform: Optional[str] = None,
+    deadline: Optional[float] = None,
+    hedge_after: Optional[float] = None,
+    timings: Optional[List[Dict[str, Any]]] = None,
+    parse: Optional[Callable[[bytes], List[ParsedItem]]] = None,
+) -> List[FeedEntry]:
+    """
+    Network fetch for one source (RSS/Atom or GitHub Trending), shared by the one-shot run and daemon polls.
+    """
+
+    if src.url.startswith("https://github.com/trending"):
+        items = fetch_github_trending_source(
+            src,
+            date_str=date_str,
+            retries=retries,
+            retry_sleep_ms=retry_sleep_ms,
+            proxies=proxies,
+            deadline=deadline,
+        )
+    else:
+        items = fetch_and_parse_source(
+            src,
+            per_feed_limit=int(src.per_feed_limit) if src.per_feed_limit else int(per_feed_limit),
+            retries=retries,
+            retry_sleep_ms=retry_sleep_ms,
+            proxies=proxies,
+            per_source_timeout=per_source_timeout,
+            deadline=deadline,
+            hedge_after=hedge_after,
+            timings=timings,
+            parse=parse,
+        )
+    if platform:
+        for it in items:
+            it.platform = platform
+    return items
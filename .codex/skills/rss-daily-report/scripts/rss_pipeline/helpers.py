@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import re
+import urllib.parse
+from typing import List, Optional
+
+from .models import FeedEntry
+
+
+# -----------------------------
+# Small helpers
+# -----------------------------
+
+# The text helpers below (normalize_ws, strip_html, clean_fallback_point, fingerprints) are pure: no I/O,
+# no mutable module state, patterns compiled once at import. Compiled patterns and frozen constants are
+# read-only, so the functions can run concurrently on free-threaded builds, in sub-interpreters, or in
+# worker processes (see parse_pool.py) without locks and without going through re's shared pattern cache.
+
+WS_RE = re.compile(r"\s+")
+CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+CJK_RUN_RE = re.compile(r"[\u4e00-\u9fff]+")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[。！？.!?])\s+")
+TICKER_RE = re.compile(r"\$[^$]{1,40}\$")
+LEAD_LABEL_RE = re.compile(r"^(首发|作者|来源)\s*[:：]\s*", flags=re.I)
+LEAD_SIGNATURE_RE = re.compile(r"^[^，,]{1,18}[，,]\s*")
+SCRIPT_STYLE_RE = re.compile(r"<(script|style)[^>]*>.*?</\1>", flags=re.S | re.I)
+TAG_RE = re.compile(r"<[^>]+>")
+FINGERPRINT_DROP_RE = re.compile(r"[^a-z0-9\u4e00-\u9fff]+")
+
+CTA_FRAGMENTS = ("查看知乎原文", "查看原文", "查看全文", "阅读原文", "阅读全文", "点击查看", "点击阅读")
+BIGRAM_STOPWORDS = frozenset(
+    {
+        "什么",
+        "为什么",
+        "怎么",
+        "如何",
+        "是否",
+        "可以",
+        "有的",
+        "一个",
+        "哪些",
+        "不会",
+        "会不",
+        "到底",
+        "真的",
+        "我们",
+        "你们",
+        "他们",
+        "这个",
+        "那个",
+        "中国",
+    }
+)
+# Control characters that are illegal in XML 1.0 (tab / LF / CR are allowed).
+XML_ILLEGAL_BYTES = bytes(b for b in range(0x00, 0x20) if b not in (0x09, 0x0A, 0x0D))
+
+
+def normalize_ws(text: str) -> str:
+    return WS_RE.sub(" ", (text or "")).strip()
+
+
+def is_mostly_english(text: str) -> bool:
+    t = (text or "").strip()
+    if not t:
+        return False
+    # If it contains CJK, treat as not mostly English.
+    if CJK_RE.search(t):
+        return False
+    letters = sum(1 for ch in t if ("A" <= ch <= "Z") or ("a" <= ch <= "z"))
+    # Ignore short tokens like "AI", "GPU" etc.
+    if letters < 8:
+        return False
+    non_space = sum(1 for ch in t if not ch.isspace())
+    return (letters / max(1, non_space)) >= 0.45
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Best-effort sentence splitter for both Chinese and English.
+    """
+
+    t = normalize_ws(text)
+    if not t:
+        return []
+    parts = SENTENCE_SPLIT_RE.split(t)
+    out: List[str] = []
+    for p in parts:
+        s = normalize_ws(p).strip()
+        if s:
+            out.append(s)
+    return out
+
+
+def clean_fallback_point(text: str) -> str:
+    """
+    Remove common boilerplate/noise from feed descriptions.
+    This is a best-effort heuristic used only when AI is disabled/unavailable.
+    """
+
+    t = normalize_ws(text)
+    if not t:
+        return ""
+
+    # Common CTA / boilerplate fragments.
+    for frag in CTA_FRAGMENTS:
+        t = t.replace(frag, " ")
+    t = normalize_ws(t)
+
+    # Remove stock tickers and dense wrappers like $XYZ(SH000001)$.
+    t = TICKER_RE.sub(" ", t)
+    t = normalize_ws(t)
+
+    # Remove leading "首发：" / "作者：" labels.
+    t = LEAD_LABEL_RE.sub("", t)
+    t = normalize_ws(t)
+
+    # Remove leading author signature like "张三， xxx" (keep the remaining clause if any).
+    t = LEAD_SIGNATURE_RE.sub("", t)
+    t = normalize_ws(t)
+
+    return t
+
+
+def title_bigrams(title: str) -> List[str]:
+    """
+    Extract Chinese bigrams from a title for weak relevance scoring in fallback mode.
+    """
+
+    t = normalize_ws(title)
+    chunks = CJK_RUN_RE.findall(t)
+    if not chunks:
+        return []
+    out: List[str] = []
+    seen: set[str] = set()
+    for c in chunks:
+        if len(c) < 2:
+            continue
+        for i in range(len(c) - 1):
+            bg = c[i : i + 2]
+            if bg in BIGRAM_STOPWORDS:
+                continue
+            if bg in seen:
+                continue
+            seen.add(bg)
+            out.append(bg)
+    return out[:20]
+
+
+def strip_html(html: str) -> str:
+    html = SCRIPT_STYLE_RE.sub(" ", html)
+    text = TAG_RE.sub(" ", html)
+    text = text.replace("&nbsp;", " ").replace("\xa0", " ")
+    return normalize_ws(text)
+
+
+def sanitize_xml_bytes(xml_bytes: bytes) -> bytes:
+    """
+    Remove control characters that are illegal in XML 1.0.
+    Helps with a subset of feeds that embed stray bytes and break strict parsers.
+    """
+
+    if not xml_bytes:
+        return xml_bytes
+    return xml_bytes.translate(None, XML_ILLEGAL_BYTES)
+
+
+def safe_url(url: str) -> str:
+    url = (url or "").strip()
+    if not url:
+        return url
+    parsed = urllib.parse.urlsplit(url)
+    if not parsed.query:
+        return url
+    q = urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+    q = [(k, v) for (k, v) in q if not k.lower().startswith("utm_")]
+    new_query = urllib.parse.urlencode(q)
+    return urllib.parse.urlunsplit((parsed.scheme, parsed.netloc, parsed.path, new_query, parsed.fragment))
+
+
+def title_fingerprint(title: str) -> str:
+    t = (title or "").lower()
+    t = FINGERPRINT_DROP_RE.sub("", t)
+    t = t[:120]
+    return hashlib.sha1(t.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def title_exact_fingerprint(title: str) -> str:
+    t = normalize_ws(title or "").lower()
+    t = t[:200]
+    return hashlib.sha1(t.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def entry_content_keys(entry: "FeedEntry") -> List[str]:
+    keys: List[str] = []
+    guid = normalize_ws(str(entry.guid or ""))
+    if guid:
+        keys.append(f"guid:{guid}")
+    url = safe_url(entry.url)
+    if url:
+        keys.append(f"url:{url}")
+    # Title + published date (YYYY-MM-DD) for strict de-dup (avoid near-duplicate false positives).
+    pub = parse_published_dt(entry)
+    if pub is not None:
+        keys.append(f"title_date:{title_exact_fingerprint(entry.title)}|{pub.date().isoformat()}")
+    return keys
+
+
+# -----------------------------
+# Published time / freshness
+# -----------------------------
+
+def parse_published_dt(entry: FeedEntry) -> Optional[dt.datetime]:
+    """
+    Best-effort parsing for RSS pubDate / Atom updated.
+    Used for "recent" sorting in per-platform top-N mode.
+    """
+
+    s = normalize_ws(entry.published or "")
+    if not s:
+        return None
+    import email.utils
+
+    try:
+        # RSS: RFC 2822 / 822
+        d = email.utils.parsedate_to_datetime(s)
+        if d is None:
+            return None
+        # Normalize to UTC-naive for comparable ordering.
+        if d.tzinfo is not None:
+            d = d.astimezone(dt.timezone.utc).replace(tzinfo=None)
+        return d
+    except Exception:
+        pass
+    try:
+        # Atom: ISO-8601
+        d2 = dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
+        if d2.tzinfo is not None:
+            d2 = d2.astimezone(dt.timezone.utc).replace(tzinfo=None)
+        return d2
+    except Exception:
+        return None
+
+
+def is_fresh_entry(
+    entry: FeedEntry,
+    *,
+    report_day: dt.date,
+    fresh_window_days: int,
+    fallback_fresh_top_k: int,
+) -> bool:
+    """
+    Freshness = (novel item after cache de-dup) AND (recently published).
+    - If published is available: age <= fresh_window_days
+    - If published is missing: treat only the top-K items from that feed as fresh (order proxy)
+    """
+
+    fresh_window_days = max(1, int(fresh_window_days))
+    fallback_fresh_top_k = max(1, int(fallback_fresh_top_k))
+
+    pub = parse_published_dt(entry)
+    if pub is not None:
+        age_days = (report_day - pub.date()).days
+        # tolerate small clock skew / timezone issues
+        if age_days < 0:
+            age_days = 0
+        return age_days <= fresh_window_days
+
+    pos = entry.source_pos if entry.source_pos is not None else 999999
+    return int(pos) < fallback_fresh_top_k
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import datetime as dt
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import market_data
+
+from .helpers import normalize_ws
+from .net import http_get_text
+
+
+# -----------------------------
+# Market snapshot (indicator registry + raced providers, see market_data.py)
+# -----------------------------
+
+
+def fetch_market_snapshot(
+    *,
+    date_str: str,
+    proxies: Optional[Dict[str, str]],
+    retries: int,
+    retry_sleep_ms: int,
+    timeout: Tuple[float, float],
+    indicators: Optional[List[market_data.Indicator]] = None,
+    cache_path: Optional[str] = None,
+    cache_ttl_seconds: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    Best-effort fetch of market indicators (SSE index + gold by default; `indicators` from market_data.build_registry).
+    Data sources follow the same style as LeekHub/leek-fund (public quote endpoints).
+
+    - 所有指标、所有 provider 并发请求（market_data.race_quotes），总耗时≈最慢的那个指标的胜出方。
+    - cache_path + cache_ttl_seconds：TTL 内的报价直接复用（同一时段重跑不重复请求），只抓缺的/过期的。
+
+    IMPORTANT:
+    - This is NOT historical data for `date_str`; it fetches the latest quote at runtime.
+    - Failures are non-fatal and will be reported in the returned `errors`.
+    """
+
+    def get_text(provider: market_data.QuoteProvider, url: str) -> str:
+        return http_get_text(
+            url,
+            timeout=timeout,
+            retries=retries,
+            retry_sleep_ms=retry_sleep_ms,
+            proxies=proxies,
+            headers=dict(provider.headers) if provider.headers else None,
+        )
+
+    registry = list(indicators) if indicators is not None else list(market_data.INDICATORS)
+    fetched_at = dt.datetime.now(dt.timezone.utc).isoformat()
+    now = time.time()
+    cached = market_data.load_quote_cache(cache_path, ttl_seconds=cache_ttl_seconds, now=now) if cache_path else {}
+    quotes, errors = market_data.race_quotes([i for i in registry if i.key not in cached], get_text=get_text)
+    if cache_path and cache_ttl_seconds > 0 and quotes:
+        try:
+            market_data.save_quote_cache(cache_path, quotes, now=now)
+        except OSError as e:
+            errors.append(f"market quote cache write failed: {normalize_ws(str(e))}")
+    quotes = {**cached, **quotes}
+    market_data.derive_missing(quotes, errors)
+
+    cached_keys = [i.key for i in registry if i.key in cached]
+    return {
+        "requested_date": date_str,
+        "fetched_at": fetched_at,
+        "note": "market snapshot is fetched at runtime (latest quote), not historical replay of requested_date",
+        "indicators": [quotes[i.key] for i in registry if i.publish and i.key in quotes],
+        **({"cached": cached_keys} if cached_keys else {}),
+        "errors": errors[:10],
+    }
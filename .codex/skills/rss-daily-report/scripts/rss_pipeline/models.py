@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+# -----------------------------
+# Data models
+# -----------------------------
+
+
+@dataclass(frozen=True)
+class FeedSource:
+    name: str
+    url: str
+    # Optional platform/group label for --group-by platform mode.
+    # Can be set in sources.md via: Name|platform=Foo<TAB>URL
+    platform: Optional[str] = None
+    # Optional user-defined "platform heat" weight.
+    # Can be set in sources.md via: Name|80<TAB>URL
+    weight: float = 0.0
+    # Optional per-feed fetch cap override (takes precedence over --per-feed-limit).
+    # Can be set in sources.md via: Name|limit=15<TAB>URL (or: Name|80|limit=15<TAB>URL)
+    per_feed_limit: Optional[int] = None
+    # Optional fallback endpoints (tried in order after url).
+    # Can be set in sources.md via: Name|fallback=https://...|fallback=https://...<TAB>URL
+    fallback_urls: Tuple[str, ...] = ()
+
+
+@dataclass
+class FeedEntry:
+    source_name: str
+    source_url: str
+    # Group label for "platform" mode.
+    # By default equals source_name; when using --select-keys-file, it can become the matched key.
+    platform: str
+    title: str
+    url: str
+    description: str
+    # Optional stable id from feed (guid/id) if provided.
+    guid: Optional[str] = None
+    # 0-based position in the source feed result (best-effort).
+    # Used as a fallback "recency" signal when published time is missing.
+    source_pos: Optional[int] = None
+    published: Optional[str] = None
+    enclosure_type: Optional[str] = None
+
+
+@dataclass
+class EnrichedEntry:
+    entry: FeedEntry
+    category: str
+    carrier: str  # article / video / podcast / project / post / other
+    quality_score: float
+    keywords: List[str]
+    summary: str
+    key_points: List[str]
+    title_zh: Optional[str] = None
+    # Editorial pin set by editor_picks: "lead" (1x), "top" (N x), or None.
+    pin: Optional[str] = None
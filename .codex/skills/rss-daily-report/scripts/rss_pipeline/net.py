@@ -0,0 +1,435 @@
+from __future__ import annotations
+
+import datetime as dt
+import socket
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError, as_completed
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+from .helpers import normalize_ws
+
+
+# -----------------------------
+# Networking (short timeouts)
+# -----------------------------
+
+# connect timeout, read timeout
+DEFAULT_REQUEST_TIMEOUT: Tuple[float, float] = (3.0, 8.0)
+
+
+def is_proxy_reachable(proxy_url: str, *, timeout_seconds: float = 0.8) -> bool:
+    """
+    Best-effort check whether an HTTP proxy endpoint is reachable.
+    This prevents misconfigured proxies from breaking all feed fetches.
+    """
+
+    p = normalize_ws(str(proxy_url or ""))
+    if not p:
+        return False
+    try:
+        u = urllib.parse.urlsplit(p)
+        host = u.hostname
+        port = int(u.port or 0)
+    except Exception:
+        return False
+    if not host or port <= 0:
+        return False
+    try:
+        with socket.create_connection((host, port), timeout=float(timeout_seconds)):
+            return True
+    except Exception:
+        return False
+
+
+def is_source_muted(cache: Dict[str, Any], *, url: str, today: dt.date) -> bool:
+    """
+    Circuit breaker: skip a feed temporarily if it has been failing consistently.
+    """
+
+    if not url:
+        return False
+    sh = cache.get("source_health", {}).get("entries", {})
+    if not isinstance(sh, dict):
+        return False
+    obj = sh.get(url)
+    if not isinstance(obj, dict):
+        return False
+    muted_until = str(obj.get("muted_until") or "")
+    if not muted_until:
+        return False
+    try:
+        return dt.date.fromisoformat(muted_until) >= today
+    except Exception:
+        return False
+
+
+def record_source_result(
+    cache: Dict[str, Any],
+    *,
+    url: str,
+    today: dt.date,
+    ok: bool,
+    error: Optional[str] = None,
+) -> None:
+    sh = cache.setdefault("source_health", {"entries": {}}).setdefault("entries", {})
+    if not isinstance(sh, dict) or not url:
+        return
+    obj = sh.get(url)
+    if not isinstance(obj, dict):
+        obj = {}
+        sh[url] = obj
+    obj["last_seen"] = today.isoformat()
+
+    if ok:
+        obj["fail_streak"] = 0
+        obj.pop("muted_until", None)
+        obj.pop("last_error", None)
+        return
+
+    obj["last_error"] = normalize_ws(str(error or ""))[:500]
+    try:
+        obj["fail_streak"] = int(obj.get("fail_streak") or 0) + 1
+    except Exception:
+        obj["fail_streak"] = 1
+
+
+def maybe_trip_circuit_breaker(
+    cache: Dict[str, Any],
+    *,
+    url: str,
+    today: dt.date,
+    fail_streak_threshold: int,
+    mute_days: int,
+) -> Optional[str]:
+    """
+    If a source has reached the failure threshold, mark it muted for N days.
+    Returns a short message if muted, otherwise None.
+    """
+
+    fail_streak_threshold = max(1, int(fail_streak_threshold))
+    mute_days = max(1, int(mute_days))
+    sh = cache.get("source_health", {}).get("entries", {})
+    if not isinstance(sh, dict) or not url:
+        return None
+    obj = sh.get(url)
+    if not isinstance(obj, dict):
+        return None
+    try:
+        streak = int(obj.get("fail_streak") or 0)
+    except Exception:
+        streak = 0
+    if streak < fail_streak_threshold:
+        return None
+    muted_until = today + dt.timedelta(days=mute_days)
+    obj["muted_until"] = muted_until.isoformat()
+    return f"muted_until={obj['muted_until']} (fail_streak={streak})"
+
+
+def force_requests_ipv4() -> None:
+    """
+    Some environments have no IPv6 route, but DNS still returns AAAA first,
+    leading to "Network is unreachable" on a subset of sites.
+    Best-effort: tell urllib3 to prefer IPv4.
+    """
+
+    try:
+        import urllib3.util.connection as urllib3_cn  # type: ignore
+    except Exception:
+        try:
+            import requests.packages.urllib3.util.connection as urllib3_cn  # type: ignore
+        except Exception:
+            return
+    try:
+        urllib3_cn.allowed_gai_family = lambda: socket.AF_INET  # type: ignore[attr-defined]
+    except Exception:
+        return
+
+
+class FetchCancelled(TimeoutError):
+    """
+    The shared fetch deadline (run time budget) passed; the request was abandoned mid-flight.
+    """
+
+
+def deadline_timeout(timeout: Tuple[float, float], deadline: Optional[float]) -> Tuple[float, float]:
+    """
+    Clamp (connect, read) timeouts to what is left before `deadline` (epoch seconds; None = no deadline).
+    """
+
+    if deadline is None:
+        return timeout
+    remaining = float(deadline) - time.time()
+    if remaining <= 0:
+        raise FetchCancelled("time budget exhausted")
+    return (min(float(timeout[0]), max(0.1, remaining)), min(float(timeout[1]), max(0.1, remaining)))
+
+
+def sleep_before_retry(retry_sleep_ms: int, deadline: Optional[float]) -> None:
+    delay = max(0.0, float(retry_sleep_ms)) / 1000.0
+    if deadline is not None:
+        delay = min(delay, max(0.0, float(deadline) - time.time()))
+    if delay > 0:
+        time.sleep(delay)
+
+
+def iter_until_deadline(futures: Iterable["Future[Any]"], deadline: float) -> Iterable[Optional["Future[Any]"]]:
+    """
+    as_completed() bounded by `deadline`: yields futures as they finish, then a single None if the deadline
+    passes first (the caller treats whatever has not finished as skipped).
+    """
+
+    try:
+        for fut in as_completed(futures, timeout=max(0.0, float(deadline) - time.time())):
+            yield fut
+    except FuturesTimeoutError:
+        yield None
+
+
+def abortable_session() -> Tuple["requests.Session", Callable[[], None]]:
+    """
+    A throwaway Session plus abort(): shuts down the socket of every connection the session opened, so a
+    request blocked in another thread (waiting for headers or body) fails at once instead of at its read
+    timeout. Session.close() alone only drops idle pooled connections, not the one in use.
+    """
+
+    import requests
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    conns: List[Any] = []
+    lock = threading.Lock()
+
+    def tracked(base: Any) -> Any:
+        class TrackedPool(base):  # type: ignore[misc, valid-type]
+            def _new_conn(self) -> Any:
+                conn = super()._new_conn()
+                with lock:
+                    conns.append(conn)
+                return conn
+
+        return TrackedPool
+
+    pool_classes = {"http": tracked(HTTPConnectionPool), "https": tracked(HTTPSConnectionPool)}
+
+    class TrackedAdapter(requests.adapters.HTTPAdapter):
+        def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = pool_classes
+
+        def proxy_manager_for(self, proxy: Any, **kwargs: Any) -> Any:
+            manager = super().proxy_manager_for(proxy, **kwargs)
+            manager.pool_classes_by_scheme = pool_classes
+            return manager
+
+    session = requests.Session()
+    session.mount("http://", TrackedAdapter())
+    session.mount("https://", TrackedAdapter())
+
+    def abort() -> None:
+        with lock:
+            opened = list(conns)
+        for conn in opened:
+            sock = getattr(conn, "sock", None)
+            if sock is None:
+                continue
+            try:
+                # shutdown() (unlike close()) wakes a recv() blocked in another thread.
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        session.close()
+
+    return session, abort
+
+
+def read_body(
+    r: "requests.Response", deadline: Optional[float], cancel: Optional[threading.Event] = None
+) -> bytes:
+    """
+    Response body; with a deadline the body is streamed and abandoned as soon as the deadline passes,
+    so a slow-dripping server cannot hold a worker past the time budget. `cancel` (hedged requests)
+    abandons it the same way once another endpoint has won.
+    """
+
+    if deadline is None and cancel is None:
+        return r.content or b""
+    import requests
+    from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+    chunks: List[bytes] = []
+    # urllib3 >= 2 read1() returns as soon as any data arrives; read(amt) would block until `amt` bytes.
+    read1 = getattr(r.raw, "read1", None)
+    stream = iter(lambda: read1(64 * 1024, decode_content=True), b"") if read1 else r.iter_content(4 * 1024)
+    try:
+        for chunk in stream:
+            if deadline is not None and time.time() >= float(deadline):
+                raise FetchCancelled("time budget exhausted while reading body")
+            if cancel is not None and cancel.is_set():
+                raise FetchCancelled("hedged request lost the race")
+            chunks.append(chunk)
+    # Raw reads bypass requests' wrapping: map urllib3 errors the way iter_content() does, so the
+    # callers' retry handlers see body-phase stalls/resets exactly like they do without a deadline.
+    except ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e, request=r.request) from e
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e, request=r.request) from e
+    finally:
+        r.close()
+    return b"".join(chunks)
+
+
+def retryable_errors() -> Tuple[type, ...]:
+    """
+    Request failures worth another attempt: timeouts, connection errors and a body cut off mid-transfer.
+    """
+
+    import requests
+
+    return (
+        requests.exceptions.Timeout,
+        requests.exceptions.ConnectionError,
+        requests.exceptions.ChunkedEncodingError,
+    )
+
+
+def http_get_text(
+    url: str,
+    *,
+    timeout: Tuple[float, float] = DEFAULT_REQUEST_TIMEOUT,
+    retries: int = 0,
+    retry_sleep_ms: int = 0,
+    proxies: Optional[Dict[str, str]] = None,
+    deadline: Optional[float] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Fetch URL as text.
+    - short timeouts so one slow feed won't block the whole report
+    - do NOT always raise on non-2xx because some endpoints return bodies with 3xx/4xx
+      (we'll attempt to parse; if it fails, it's treated as a failed source).
+    """
+
+    import requests
+
+    last_err: Optional[BaseException] = None
+    for attempt in range(max(0, int(retries)) + 1):
+        try:
+            r = requests.get(
+                url,
+                headers=headers or {"User-Agent": "Mozilla/5.0"},
+                timeout=deadline_timeout(timeout, deadline),
+                allow_redirects=True,
+                proxies=proxies,
+                stream=deadline is not None,
+            )
+            if deadline is None:
+                return r.text or ""
+            body = read_body(r, deadline)
+            return body.decode(r.encoding or "utf-8", errors="replace")
+        except retryable_errors() as e:
+            last_err = e
+            if attempt >= max(0, int(retries)):
+                raise
+            if int(retry_sleep_ms) > 0:
+                sleep_before_retry(retry_sleep_ms, deadline)
+    if last_err:
+        raise last_err
+    return ""
+
+
+def http_get_bytes(
+    url: str,
+    *,
+    timeout: Tuple[float, float] = DEFAULT_REQUEST_TIMEOUT,
+    retries: int = 0,
+    retry_sleep_ms: int = 0,
+    proxies: Optional[Dict[str, str]] = None,
+    deadline: Optional[float] = None,
+) -> bytes:
+    """
+    Fetch URL as bytes.
+    Using bytes for XML allows ElementTree to respect the XML declaration encoding,
+    avoiding mojibake when servers omit/lie about HTTP charset headers.
+    """
+
+    import requests
+
+    last_err: Optional[BaseException] = None
+    for attempt in range(max(0, int(retries)) + 1):
+        try:
+            r = requests.get(
+                url,
+                headers={"User-Agent": "Mozilla/5.0"},
+                timeout=deadline_timeout(timeout, deadline),
+                allow_redirects=True,
+                proxies=proxies,
+                stream=deadline is not None,
+            )
+            return read_body(r, deadline)
+        except retryable_errors() as e:
+            last_err = e
+            if attempt >= max(0, int(retries)):
+                raise
+            if int(retry_sleep_ms) > 0:
+                sleep_before_retry(retry_sleep_ms, deadline)
+    if last_err:
+        raise last_err
+    return b""
+
+
+def http_get_bytes_with_meta(
+    url: str,
+    *,
+    timeout: Tuple[float, float] = DEFAULT_REQUEST_TIMEOUT,
+    retries: int = 0,
+    retry_sleep_ms: int = 0,
+    proxies: Optional[Dict[str, str]] = None,
+    deadline: Optional[float] = None,
+    cancel: Optional[threading.Event] = None,
+    on_headers: Optional[Callable[[], None]] = None,
+    session: Optional["requests.Session"] = None,
+) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Fetch URL as bytes and return basic response metadata for troubleshooting.
+    `on_headers` fires once the status line/headers are in (hedged requests use it as the "alive" signal).
+    `session` (hedged requests: see abortable_session) is used instead of a one-off requests.get; once
+    `cancel` is set, a failed attempt raises FetchCancelled instead of retrying.
+    """
+
+    import requests
+
+    get = session.get if session is not None else requests.get
+    last_err: Optional[BaseException] = None
+    for attempt in range(max(0, int(retries)) + 1):
+        try:
+            r = get(
+                url,
+                headers={"User-Agent": "Mozilla/5.0"},
+                timeout=deadline_timeout(timeout, deadline),
+                allow_redirects=True,
+                proxies=proxies,
+                stream=deadline is not None or cancel is not None or on_headers is not None,
+            )
+            if on_headers is not None:
+                on_headers()
+            meta = {
+                "status_code": int(getattr(r, "status_code", 0) or 0),
+                "content_type": str(r.headers.get("content-type") or ""),
+                "final_url": str(getattr(r, "url", "") or url),
+            }
+            return read_body(r, deadline, cancel), meta
+        except retryable_errors() as e:
+            if cancel is not None and cancel.is_set():
+                raise FetchCancelled("hedged request lost the race") from e
+            last_err = e
+            if attempt >= max(0, int(retries)):
+                raise
+            if int(retry_sleep_ms) > 0:
+                sleep_before_retry(retry_sleep_ms, deadline)
+    if last_err:
+        raise last_err
+    return b"", {"status_code": 0, "content_type": "", "final_url": url}
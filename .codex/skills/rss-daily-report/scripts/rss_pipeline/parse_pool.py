@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import concurrent.futures
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+from typing import List, Optional
+
+from .feeds import ParsedItem, parse_feed
+
+
+# -----------------------------
+# Parallel feed parsing (--parse-workers / --parse-backend)
+# -----------------------------
+
+# threads: parse in the fetch threads (the default; truly parallel on free-threaded builds).
+# interpreters: per-interpreter pool (Python 3.14+ InterpreterPoolExecutor), one GIL per worker.
+# processes: spawned worker processes.
+PARSE_BACKENDS = ("auto", "threads", "interpreters", "processes")
+
+# Smallest document parse_feed accepts; used to start the workers while the first requests are in flight.
+WARM_UP_FEED = b"<rss><channel/></rss>"
+
+
+def gil_disabled() -> bool:
+    """
+    True on a free-threaded build running without the GIL (python3.13t+, PYTHON_GIL=0).
+    """
+
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_enabled is not None and not is_enabled()
+
+
+def backend_unavailable(backend: str) -> Optional[str]:
+    """
+    Why `backend` cannot run on this interpreter, or None.
+    """
+
+    if backend == "interpreters" and not hasattr(concurrent.futures, "InterpreterPoolExecutor"):
+        return f"needs Python 3.14+ (InterpreterPoolExecutor), running {sys.version.split()[0]}"
+    if backend not in PARSE_BACKENDS:
+        return f"unknown backend {backend!r}"
+    return None
+
+
+def resolve_backend(backend: str) -> str:
+    """
+    auto: threads when the GIL is off (the fetch threads already parse in parallel, nothing to copy),
+    else sub-interpreters where available, else worker processes. An unavailable explicit choice
+    falls back to threads.
+    """
+
+    if backend == "auto":
+        if gil_disabled():
+            return "threads"
+        return "interpreters" if backend_unavailable("interpreters") is None else "processes"
+    return backend if backend_unavailable(backend) is None else "threads"
+
+
+def _new_executor(backend: str, workers: int) -> Executor:
+    if backend == "interpreters":
+        # Sub-interpreters start with the default sys.path; give them ours so `rss_pipeline` imports.
+        init = f"import sys\nsys.path[:0] = [p for p in {list(sys.path)!r} if p not in sys.path]\n"
+        return concurrent.futures.InterpreterPoolExecutor(  # type: ignore[attr-defined]
+            max_workers=workers, initializer=exec, initargs=(init, {})
+        )
+    # Spawned, not forked: forking a process that already runs fetch threads can copy held locks.
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+class ParsePool:
+    """
+    Moves parse_feed (ElementTree + strip_html/normalize_ws, CPU-bound) off the fetch threads: a fetch
+    thread hands the downloaded bytes over and blocks on the result, so the other threads keep the network
+    busy while parsing runs on other cores. Workers return parse_feed's plain tuples; FeedEntry objects
+    are still built in the fetch thread.
+
+    Falls back to parsing in the calling thread (the threads backend) when the pool cannot start or
+    breaks. A worker-side failure is re-parsed locally: a bad feed then raises its usual exception (same
+    type and message as without the pool), while a feed that parses fine locally means the backend itself
+    failed (e.g. an extension not importable in a sub-interpreter) and the pool is dropped for the run.
+    """
+
+    def __init__(self, workers: int, backend: str = "processes") -> None:
+        self.workers = max(1, int(workers))
+        self.backend = backend
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        try:
+            self._pool = _new_executor(backend, self.workers)
+        except Exception as e:
+            self._fall_back(None, e)
+
+    def _fall_back(self, pool: Optional[Executor], err: BaseException) -> None:
+        # Several fetch threads can hit a broken pool at once: drop it (and warn) only once.
+        with self._lock:
+            if self._pool is not pool:
+                return
+            print(
+                f"[warn] parse backend {self.backend} failed ({type(err).__name__}: {err}); parsing in threads",
+                file=sys.stderr,
+            )
+            self.backend = "threads"
+            self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def warm_up(self) -> None:
+        """
+        Start every worker now (spawn + imports take ~100 ms each) instead of on the first feeds' parse.
+        """
+
+        pool = self._pool
+        if pool is None:
+            return
+        # Workers start on demand: one per submitted task while none is idle.
+        try:
+            for _ in range(self.workers):
+                pool.submit(parse_feed, WARM_UP_FEED)
+        except (BrokenExecutor, RuntimeError) as e:
+            self._fall_back(pool, e)
+
+    def parse(self, xml_bytes: bytes) -> List[ParsedItem]:
+        pool = self._pool
+        if pool is None:
+            return parse_feed(xml_bytes)
+        try:
+            return pool.submit(parse_feed, xml_bytes).result()
+        except BrokenExecutor as e:
+            self._fall_back(pool, e)
+            return parse_feed(xml_bytes)
+        except Exception as e:
+            got = parse_feed(xml_bytes)
+            self._fall_back(pool, e)
+            return got
+
+    def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.shutdown()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+
+
+# -----------------------------
+# Paths (relative to this skill)
+# -----------------------------
+
+# This package lives in scripts/rss_pipeline/; paths are relative to scripts/ (where run.py is).
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SKILL_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+REPO_ROOT = os.path.abspath(os.path.join(SKILL_DIR, "..", "..", ".."))
+
+DEFAULT_OUT_DIR = os.path.join(REPO_ROOT, "NewsReport")
+# Legacy single-file cache: only read, to migrate sections missing from DEFAULT_CACHE_DIR.
+DEFAULT_CACHE_PATH = os.path.join(SKILL_DIR, "cache.json")
+# Each cache section lives in its own (committed) file under this directory (see CacheStore).
+DEFAULT_CACHE_DIR = os.path.join(SKILL_DIR, "cache")
+DEFAULT_REPO_CATALOG_PATH = os.path.join(REPO_ROOT, "RSS源.md")
+DEFAULT_REPO_KEYS_PATH = os.path.join(REPO_ROOT, "my", "RSS.md")
+DEFAULT_REPO_CONFIG_PATH = os.path.join(REPO_ROOT, "my", "config.json")
+DEFAULT_REPO_SITE_DIR = os.path.join(REPO_ROOT, "site")
+# Daemon mode: entries collected between reports (volatile, not meant for git).
+DEFAULT_STAGING_PATH = os.path.join(SKILL_DIR, "state", "staging.json")
+# Short-lived market quote cache (reruns within --market-cache-ttl reuse quotes instead of refetching).
+DEFAULT_MARKET_QUOTES_PATH = os.path.join(SKILL_DIR, "state", "market_quotes.json")
+# ETag / Last-Modified + parsed repos per GitHub Trending page (conditional requests).
+DEFAULT_TRENDING_VALIDATORS_PATH = os.path.join(SKILL_DIR, "state", "github_trending.json")
+# Raw per-request samples split out of the committed source_stats section (see CacheStore): telemetry rows,
+# latency samples and cadence arrivals change every run and are only read back by the pipeline itself.
+DEFAULT_SOURCE_SAMPLES_PATH = os.path.join(SKILL_DIR, "state", "source_samples.json")
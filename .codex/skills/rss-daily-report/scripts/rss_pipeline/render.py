@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import urllib.parse
+from typing import Any, Dict, List, Optional, Tuple
+
+import fetch_telemetry
+
+from .classify import CATEGORY_ORDER, GROUP_BY_CHOICES
+from .helpers import normalize_ws
+from .models import EnrichedEntry, FeedSource
+
+
+# -----------------------------
+# Rendering
+# -----------------------------
+
+
+def render_entry_md(idx: int, e: EnrichedEntry) -> str:
+    domain = urllib.parse.urlsplit(e.entry.url).netloc or e.entry.source_name
+    source_label = e.entry.source_name or domain
+    stars = "⭐" * int(round(e.quality_score))
+
+    lines: List[str] = []
+    if e.title_zh and e.title_zh != e.entry.title:
+        lines.append(f"### {idx}. {e.title_zh}\n")
+        lines.append(f"- **原标题**：{e.entry.title}")
+    else:
+        lines.append(f"### {idx}. {e.entry.title}\n")
+    lines.append(f"- **摘要**：{e.summary}")
+    lines.append(f"- **分类**：`{e.category}`  |  **载体**：`{e.carrier}`")
+    if e.key_points:
+        lines.append("- **要点**：")
+        for i, kp in enumerate(e.key_points[:3], 1):
+            lines.append(f"  {i}. {kp}")
+    lines.append(f"- **来源**：[{source_label}]({e.entry.url})")
+    if e.keywords:
+        lines.append("- **关键词**：" + " ".join(f"`{k}`" for k in e.keywords[:8]))
+    lines.append(f"- **评分**：{stars} ({int(round(e.quality_score))}/5)\n")
+    return "\n".join(lines)
+
+
+def build_report(
+    *,
+    date_str: str,
+    sources: List[FeedSource],
+    items: List[EnrichedEntry],
+    backfill_items: List[EnrichedEntry],
+    duration_seconds: int,
+    group_by: str,
+    platform_heat: Dict[str, float],
+    platform_heat_window_days: int,
+    selected_keys: List[str],
+    per_platform_limit: int,
+    fresh_window_days: int,
+    backfill_daily_cap: int,
+    min_items_floor: int,
+    floor_added: int,
+    platform_sources: Dict[str, List[FeedSource]],
+    success_source_urls: set[str],
+    failed_source_urls: set[str],
+    skipped_source_urls: set[str],
+    muted_source_urls: set[str],
+    not_due_source_urls: set[str],
+    telemetry_summary: Optional[Dict[str, Any]],
+    errors: List[str],
+    foreign_section_title: Optional[str],
+    foreign_section_sources: List[FeedSource],
+    foreign_section_success_urls: set[str],
+    foreign_section_failed_urls: set[str],
+    foreign_section_skipped_urls: set[str],
+    foreign_section_errors: List[str],
+    foreign_section_items: List[EnrichedEntry],
+    foreign_section_limit: int,
+) -> str:
+    if group_by not in GROUP_BY_CHOICES:
+        group_by = "platform"
+
+    used_sources = sorted({s.name for s in sources})
+
+    def group_header_line() -> str:
+        if group_by == "topic":
+            return "> 分组：按类目（topic）  "
+        if group_by == "none":
+            return "> 分组：不分组（flat，按平台热度排序）  "
+        return f"> 分组：按平台热度（窗口 {max(1, int(platform_heat_window_days))} 天）  "
+
+    lines: List[str] = []
+    lines.append(f"# RSS Daily Report（{date_str}）\n")
+    lines.append(f"> 信息源：{len(sources)} 个 | 收录：{len(items)} 条  ")
+    lines.append(group_header_line())
+    lines.append(
+        f"> 新内容窗口：{max(1, int(fresh_window_days))} 天 | 补读上限：{max(0, int(backfill_daily_cap))} 条  "
+    )
+    if max(0, int(min_items_floor)) > 0:
+        lines.append(f"> 展示保底：{max(0, int(min_items_floor))} 条（从补读补齐 {max(0, int(floor_added))} 条）  ")
+    if group_by == "platform" and max(0, int(per_platform_limit)) > 0:
+        if selected_keys:
+            lines.append(f"> 平台 key：{len(selected_keys)} 个 | 每平台 Top：{max(0, int(per_platform_limit))}  ")
+        else:
+            lines.append(f"> 平台组：{len(platform_sources)} 个 | 每平台 Top：{max(0, int(per_platform_limit))}  ")
+    lines.append(f"> 生成耗时：~{max(1, int(round(duration_seconds / 60)))} 分钟\n")
+    lines.append("---\n")
+
+    if selected_keys:
+        lines.append("## RSS/Atom 条目字段说明\n")
+        lines.append(
+            "- 本脚本从 RSS/Atom 解析并使用的字段：`source_name`（源名称）`source_url`（源地址）`title`（标题）`url`（链接）`description`（description/summary/content 清洗）`published`（pubDate/updated）`enclosure_type`（enclosure@type，可用于判断音频/视频）"
+        )
+        lines.append("- 常见但本脚本当前未解析/未使用的字段：作者（author）、分类/标签（category）、GUID/ID、图片/附件（media/enclosure url）、评论链接等（不同源差异很大）\n")
+        lines.append("---\n")
+
+    show_fetch_details = (
+        group_by == "platform"
+        and bool(platform_sources)
+        and (bool(errors) or bool(selected_keys) or len(platform_sources) <= 50)
+    )
+    if show_fetch_details:
+        lines.append("## 抓取明细\n")
+        overall = (telemetry_summary or {}).get("overall") or {}
+        if overall:
+            labels = [
+                ("dns_ms", "DNS"),
+                ("connect_ms", "连接"),
+                ("tls_ms", "TLS"),
+                ("ttfb_ms", "首字节"),
+                ("body_ms", "下载"),
+                ("parse_ms", "解析"),
+                ("total_ms", "总计"),
+            ]
+            parts = [
+                f"{label} {fetch_telemetry.fmt_ms(overall[k]['p50'])}/{fetch_telemetry.fmt_ms(overall[k]['p95'])}"
+                for k, label in labels
+                if k in overall
+            ]
+            if "bytes" in overall:
+                b = overall["bytes"]
+                parts.append(f"大小 {fetch_telemetry.fmt_bytes(b['p50'])}/{fetch_telemetry.fmt_bytes(b['p95'])}")
+            lines.append(
+                f"> 请求耗时 p50/p95（近 {telemetry_summary['window_days']} 天，{telemetry_summary['requests']} 次请求）："
+                + " · ".join(parts)
+                + "\n"
+            )
+        per_source_tm = (telemetry_summary or {}).get("sources") or {}
+
+        def p_sort_key(p: str) -> Tuple[float, str]:
+            return (-float(platform_heat.get(p, 0.0)), p)
+
+        platforms = selected_keys if selected_keys else sorted(platform_sources.keys(), key=p_sort_key)
+        for k in platforms:
+            srcs = platform_sources.get(k, [])
+            ok = sum(1 for s in srcs if s.url in success_source_urls)
+            bad = sum(1 for s in srcs if s.url in failed_source_urls)
+            skipped = sum(1 for s in srcs if s.url in skipped_source_urls)
+            muted = sum(1 for s in srcs if s.url in muted_source_urls)
+            not_due = sum(1 for s in srcs if s.url in not_due_source_urls)
+            counts = f"成功 {ok} / 失败 {bad}"
+            if muted:
+                counts += f" / 熔断 {muted}"
+            if not_due:
+                counts += f" / 未到期 {not_due}"
+            lines.append(f"- **{k}**：源 {len(srcs)} 个（{counts} / 未收集 {skipped}）")
+            # avoid huge logs in the report; show up to 8 endpoints
+            for s in srcs[:8]:
+                if s.url in failed_source_urls:
+                    status = "失败"
+                elif s.url in muted_source_urls:
+                    status = "熔断"
+                elif s.url in not_due_source_urls:
+                    status = "跳过：未到期"
+                elif s.url in skipped_source_urls:
+                    status = "未收集"
+                elif s.url in success_source_urls:
+                    status = "成功"
+                else:
+                    status = "未知"
+                tm = per_source_tm.get(s.url) or {}
+                tm_str = ""
+                if "total_ms" in tm:
+                    tm_str = (
+                        f"（p50 {fetch_telemetry.fmt_ms(tm['total_ms']['p50'])} / "
+                        f"p95 {fetch_telemetry.fmt_ms(tm['total_ms']['p95'])}"
+                        + (f" · {fetch_telemetry.fmt_bytes(tm['bytes']['p50'])}" if "bytes" in tm else "")
+                        + "）"
+                    )
+                lines.append(f"  - {status}：{s.name} — {s.url}{tm_str}")
+            if len(srcs) > 8:
+                lines.append(f"  - … 另有 {len(srcs) - 8} 个源未展开")
+        if errors:
+            lines.append("\n## 失败原因（节选）\n")
+            for e in errors[:10]:
+                lines.append(f"- {normalize_ws(str(e))}")
+        lines.append("\n---\n")
+
+    idx = 1
+    if group_by == "topic":
+        by_cat: Dict[str, List[EnrichedEntry]] = {}
+        for it in items:
+            by_cat.setdefault(it.category, []).append(it)
+        for cat in by_cat:
+            by_cat[cat].sort(key=lambda x: (-x.quality_score, x.entry.title.lower()))
+
+        for cat in CATEGORY_ORDER:
+            group = by_cat.get(cat, [])
+            if not group:
+                continue
+            lines.append(f"## {cat}\n")
+            for it in group:
+                lines.append(render_entry_md(idx, it))
+                idx += 1
+            lines.append("---\n")
+    elif group_by == "none":
+        # Keep the order provided by main() (typically already sorted).
+        for it in items:
+            lines.append(render_entry_md(idx, it))
+            idx += 1
+        lines.append("---\n")
+    else:
+        by_platform: Dict[str, List[EnrichedEntry]] = {}
+        for it in items:
+            by_platform.setdefault(it.entry.platform or it.entry.source_name or "未知来源", []).append(it)
+        for p in by_platform:
+            by_platform[p].sort(key=lambda x: (-x.quality_score, x.entry.title.lower()))
+
+        def p_sort_key(p: str) -> Tuple[float, str]:
+            return (-float(platform_heat.get(p, 0.0)), p)
+
+        for platform in sorted(by_platform.keys(), key=p_sort_key):
+            group = by_platform.get(platform, [])
+            if not group:
+                continue
+            heat = platform_heat.get(platform, 0.0)
+            heat_str = str(int(round(heat))) if heat >= 1 else f"{heat:.1f}".rstrip("0").rstrip(".")
+            lines.append(f"## {platform}（热度 {heat_str}）\n")
+            for it in group:
+                lines.append(render_entry_md(idx, it))
+                idx += 1
+            lines.append("---\n")
+
+    if foreign_section_title:
+        title = foreign_section_title
+        limit = max(1, int(foreign_section_limit))
+        lines.append(f"## {title}（随机抽取 {len(foreign_section_sources)} 个源，去重后保留 {limit} 条）\n")
+        if foreign_section_sources:
+            lines.append("- **抽取源**：")
+            for s in foreign_section_sources:
+                if s.url in foreign_section_failed_urls:
+                    status = "失败"
+                elif s.url in foreign_section_skipped_urls:
+                    status = "未收集"
+                elif s.url in foreign_section_success_urls:
+                    status = "成功"
+                else:
+                    status = "未知"
+                lines.append(f"  - {status}：{s.name} — {s.url}")
+        if foreign_section_errors:
+            lines.append("- **失败原因（节选）**：")
+            for e in foreign_section_errors[:6]:
+                lines.append(f"  - {normalize_ws(str(e))}")
+        lines.append("")
+
+        shown = foreign_section_items[:limit]
+        if not shown:
+            lines.append("- （没有可展示的条目：可能是源失效/超时/都被去重过滤）\n")
+        else:
+            for it in shown:
+                lines.append(render_entry_md(idx, it))
+                idx += 1
+        lines.append("---\n")
+
+    if backfill_items and max(0, int(backfill_daily_cap)) > 0:
+        cap = max(1, int(backfill_daily_cap))
+        lines.append(f"## 补读（历史库存，去重后每日上限 {cap} 条）\n")
+        for it in backfill_items[:cap]:
+            lines.append(render_entry_md(idx, it))
+            idx += 1
+        lines.append("---\n")
+
+    lines.append("*Generated by rss-daily-report*  ")
+    lines.append("*Sources: " + ", ".join(used_sources) + "*\n")
+    return "\n".join(lines)
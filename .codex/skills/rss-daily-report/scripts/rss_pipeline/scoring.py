@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Tuple
+
+import promo
+
+from .helpers import entry_content_keys, safe_url, title_fingerprint
+from .models import FeedEntry
+
+
+# -----------------------------
+# Scoring / de-dup
+# -----------------------------
+
+
+def derive_keywords(entry: FeedEntry, max_n: int = 6) -> List[str]:
+    text = f"{entry.title} {entry.description}"
+    raw = re.findall(r"[A-Za-z][A-Za-z0-9+_.-]{1,24}", text)
+    stop = {"the", "and", "for", "with", "from", "this", "that", "your", "now", "how", "what", "into", "are"}
+    freq: Dict[str, int] = {}
+    for w in raw:
+        lw = w.lower()
+        if lw in stop:
+            continue
+        freq[w] = freq.get(w, 0) + 1
+    ranked = sorted(freq.items(), key=lambda kv: (-kv[1], kv[0].lower()))
+    return [w for (w, _) in ranked[:max_n]]
+
+
+def score_entry(entry: FeedEntry, category: str, carrier: str) -> float:
+    score = 3.0
+    text = f"{entry.title} {entry.description}".strip()
+
+    if len(text) < 30:
+        score -= 0.6
+    if category in {"技术", "财经"}:
+        score += 0.3
+    if carrier == "项目":
+        score += 0.4
+
+    return max(1.0, min(5.0, score))
+
+
+def dedupe_entries(entries: List[FeedEntry], cache: Dict[str, Any], *, date_str: str) -> List[FeedEntry]:
+    # IMPORTANT: if re-running the same date, don't let a previous partial publish
+    # shrink today's result set. We still de-dup within the run, but ignore cache
+    # TTL filters so the run is not path-dependent.
+    is_rerun_same_day = str((cache.get("last_run") or {}).get("date") or "") == str(date_str)
+    content_seen_entries = cache.get("content_seen", {}).get("entries") or {}
+
+    if is_rerun_same_day:
+        # Re-run same day: don't let today's entries block the rerun.
+        content_seen: set[str] = set()
+        for k, meta in (content_seen_entries or {}).items():
+            if not isinstance(meta, dict):
+                continue
+            if str(meta.get("date_added") or "") == str(date_str):
+                continue
+            content_seen.add(str(k))
+    else:
+        content_seen = set((content_seen_entries or {}).keys())
+
+    out: List[FeedEntry] = []
+    local_title_seen: set[str] = set()
+    local_url_seen: set[str] = set()
+    local_content_seen: set[str] = set()
+    for e in entries:
+        u = safe_url(e.url)
+        th = title_fingerprint(e.title)
+        ckeys = entry_content_keys(e)
+
+        if u in local_url_seen or th in local_title_seen:
+            continue
+        if any(k in local_content_seen for k in ckeys):
+            continue
+        if any(k in content_seen for k in ckeys):
+            continue
+
+        local_url_seen.add(u)
+        local_title_seen.add(th)
+        for k in ckeys:
+            local_content_seen.add(k)
+        out.append(FeedEntry(**{**e.__dict__, "url": u}))
+
+    return out
+
+
+def filter_promo_entries(
+    entries: List[FeedEntry], detector: promo.PromoDetector
+) -> Tuple[List[FeedEntry], List[Dict[str, Any]]]:
+    """
+    Soft-delete promo / registration / price-heavy entries right after de-dup (rss-editor-picks rule),
+    so they neither take platform quota slots nor reach enrichment.
+    Returns (kept, meta.removed_items records).
+    """
+
+    kept: List[FeedEntry] = []
+    removed: List[Dict[str, Any]] = []
+    for e in entries:
+        reason = detector.check(e.title, f"{e.title} {e.description}")
+        if not reason:
+            kept.append(e)
+            continue
+        removed.append(
+            promo.removed_record(
+                url=e.url,
+                title=e.title,
+                platform=e.platform or e.source_name,
+                source=e.source_name,
+                reason=reason,
+            )
+        )
+    return kept, removed
@@ -0,0 +1,1203 @@
+"""
+rss_pipeline.stages
+===================
+
+一次日报运行拆成显式阶段，每个阶段输入/输出都是带类型的批次（dataclass），可单独调用与测试：
+
+  fetch (+ parse)  -> FetchBatch        抓取到期的源（每个 worker 同时解析 feed，失败才换备用 URL）
+  dedup            -> DedupBatch        跨源/跨日去重 + 营销软删除
+  freshness        -> FreshnessBatch    新鲜条目 / 库存回填
+  score            -> List[ScoredEntry] 分类 + 规则评分（低于 --min-score 丢弃）
+  enrich           -> List[EnrichedEntry] AI 或本地摘要
+  select / pick    -> Selection         排序、平台配额、回填与保底、国外时政、编辑精选
+  render           -> Report            Markdown
+  export           update_cache / export_json / build_site
+
+run_report(ctx) 按原顺序串起各阶段（profiler 阶段名与 meta.stage_timings_ms 一致）；cli.main 只负责参数与源列表。
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import editor_picks
+import fetch_telemetry
+import keymatch
+import market_data
+import promo
+import search_index
+import stage_profiler
+
+from .ai import fallback_summary, maybe_ai_enrich
+from .cadence import cadence_due, entry_arrival_ts, update_source_cadence
+from .classify import carrier_from_entry, classify_topic, compute_platform_heat
+from .daemon import StagingStore
+from .feeds import fetch_and_parse_source, fetch_source_entries
+from .helpers import entry_content_keys, is_fresh_entry, normalize_ws, parse_published_dt, title_fingerprint
+from .market import fetch_market_snapshot
+from .models import EnrichedEntry, FeedEntry, FeedSource
+from .net import (
+    is_source_muted,
+    iter_until_deadline,
+    maybe_trip_circuit_breaker,
+    record_source_result,
+)
+from .paths import DEFAULT_CACHE_DIR, DEFAULT_CACHE_PATH, DEFAULT_MARKET_QUOTES_PATH, DEFAULT_SOURCE_SAMPLES_PATH
+from .render import build_report
+from .schedule import hedge_delay, order_sources_by_yield, record_source_latency
+from .scoring import dedupe_entries, derive_keywords, filter_promo_entries, score_entry
+from .store import CacheStore, load_cache, write_report_data_json, write_site_data_js
+
+
+# -----------------------------
+# Run context + batches
+# -----------------------------
+
+
+@dataclass
+class RunContext:
+    """
+    Inputs of one report run, resolved by the CLI (or a caller embedding the pipeline).
+    Stages read it; `cache` is the one shared mutable piece (fetch records source health, export persists it).
+    """
+
+    args: argparse.Namespace
+    argv: List[str]
+    cfg: Dict[str, Any]
+    date_str: str
+    auto_mode: bool
+    proxies: Optional[Dict[str, str]]
+    all_sources: List[FeedSource]
+    sources: List[FeedSource]
+    platform_for_source_url: Dict[str, str]
+    selected_keys: List[str]
+    prof: stage_profiler.StageProfiler
+    cache_store: Optional[CacheStore] = None
+    cache: Dict[str, Any] = field(default_factory=dict)
+    # Wall-clock start of the fetch stage: time budget origin and the report's duration.
+    t0: float = 0.0
+
+    @property
+    def report_day(self) -> dt.date:
+        return dt.date.fromisoformat(self.date_str)
+
+    @property
+    def dry_run(self) -> bool:
+        return bool(self.args.dry_run)
+
+
+@dataclass
+class MarketJob:
+    """
+    Market snapshot fetched in the background while feeds are fetched; collected by export().
+    """
+
+    future: Future[Dict[str, Any]]
+    pool: ThreadPoolExecutor
+
+    def result(self, date_str: str) -> Dict[str, Any]:
+        try:
+            return self.future.result()
+        except Exception as e:
+            return {
+                "requested_date": date_str,
+                "fetched_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+                "indicators": [],
+                "errors": [f"market snapshot failed: {normalize_ws(str(e))}"],
+            }
+        finally:
+            self.pool.shutdown(wait=False)
+
+
+@dataclass
+class FetchBatch:
+    """
+    fetch (+ per-source parse) output: raw entries in completion order and per-source outcomes.
+    """
+
+    entries: List[FeedEntry]
+    errors: List[str]
+    deadline: float
+    platform_heat: Dict[str, float]
+    platform_sources: Dict[str, List[FeedSource]]
+    success_source_urls: Set[str] = field(default_factory=set)
+    failed_source_urls: Set[str] = field(default_factory=set)
+    skipped_source_urls: Set[str] = field(default_factory=set)
+    muted_source_urls: Set[str] = field(default_factory=set)
+    not_due_source_urls: Set[str] = field(default_factory=set)
+    staged_source_urls: Set[str] = field(default_factory=set)
+    latency_by_url: Dict[str, float] = field(default_factory=dict)
+    arrivals_by_url: Dict[str, Tuple[float, List[float]]] = field(default_factory=dict)
+    telemetry_summary: Dict[str, Any] = field(default_factory=dict)
+    budget_overshoot: Dict[str, float] = field(default_factory=dict)
+    market: Optional[MarketJob] = None
+
+
+@dataclass
+class DedupBatch:
+    entries: List[FeedEntry]
+    detector: promo.PromoDetector
+    promo_removed: List[Dict[str, Any]] = field(default_factory=list)
+    promo_removed_entries: List[FeedEntry] = field(default_factory=list)
+
+
+@dataclass
+class FreshnessBatch:
+    fresh: List[FeedEntry]
+    backfill: List[FeedEntry]
+    fresh_window_days: int
+    fallback_fresh_top_k: int
+    backfill_daily_cap: int
+
+
+@dataclass
+class ScoredEntry:
+    entry: FeedEntry
+    category: str
+    carrier: str
+    quality_score: float
+
+
+@dataclass
+class ForeignSection:
+    title: Optional[str] = None
+    limit: int = 1
+    sources: List[FeedSource] = field(default_factory=list)
+    items: List[EnrichedEntry] = field(default_factory=list)
+    success_urls: Set[str] = field(default_factory=set)
+    failed_urls: Set[str] = field(default_factory=set)
+    skipped_urls: Set[str] = field(default_factory=set)
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Selection:
+    published: List[EnrichedEntry]
+    backfill_published: List[EnrichedEntry]
+    floor_added: List[EnrichedEntry]
+    per_platform_limit: int
+    min_items_floor: int
+    foreign: ForeignSection
+    picks: Optional[editor_picks.PicksResult] = None
+    editor_lead_n: int = 1
+    editor_top_n: int = 5
+
+
+@dataclass
+class Report:
+    markdown: str
+    duration_seconds: int
+
+
+# -----------------------------
+# Stages
+# -----------------------------
+
+
+def load_cache_stage(ctx: RunContext) -> None:
+    ctx.cache_store = CacheStore(DEFAULT_CACHE_DIR, legacy_path=DEFAULT_CACHE_PATH, samples_path=DEFAULT_SOURCE_SAMPLES_PATH)
+    ctx.cache = load_cache(ctx.cache_store)
+
+
+def start_market(ctx: RunContext) -> Optional[MarketJob]:
+    """
+    Market quotes only feed the JSON export; fetch them alongside the feeds instead of after the report.
+    """
+
+    args = ctx.args
+    enable_export_json = bool(args.export_json) if args.export_json is not None else True
+    if not (enable_export_json and bool(getattr(args, "market", False)) and not args.dry_run):
+        return None
+    market_indicators, market_warnings = market_data.build_registry(ctx.cfg.get("market_indicators"))
+    for w in market_warnings:
+        print(f"[warn] {w}", file=sys.stderr)
+
+    def market_job() -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            return fetch_market_snapshot(
+                date_str=ctx.date_str,
+                proxies=ctx.proxies,
+                retries=int(args.retries),
+                retry_sleep_ms=int(args.retry_sleep_ms),
+                timeout=(3.0, max(1.0, float(getattr(args, "market_timeout", 6) or 6.0))),
+                indicators=market_indicators,
+                cache_path=DEFAULT_MARKET_QUOTES_PATH,
+                cache_ttl_seconds=max(0.0, float(getattr(args, "market_cache_ttl", 0) or 0.0)),
+            )
+        finally:
+            ctx.prof.span("market snapshot", started, time.perf_counter(), cat="fetch")
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    return MarketJob(future=pool.submit(market_job), pool=pool)
+
+
+def fetch(ctx: RunContext) -> FetchBatch:
+    """
+    Fetch every due source concurrently within the time budget; each worker also parses its feed
+    (fetch_and_parse_source: the parse result decides whether the next fallback URL is tried).
+    Records source health in ctx.cache as results come in.
+    """
+
+    args, cache, sources = ctx.args, ctx.cache, ctx.sources
+    ctx.t0 = time.time()
+    market = start_market(ctx)
+    today_date = ctx.report_day
+    platform_for_source_url = ctx.platform_for_source_url
+    platform_heat = compute_platform_heat(
+        cache=cache,
+        sources=sources,
+        today=today_date,
+        window_days=int(args.platform_heat_window_days),
+        group_for_source=(lambda s: platform_for_source_url.get(s.url, s.name)),
+    )
+    platform_sources: Dict[str, List[FeedSource]] = {}
+    for s in sources:
+        plat = platform_for_source_url.get(s.url, s.name)
+        platform_sources.setdefault(str(plat), []).append(s)
+    batch = FetchBatch(
+        entries=[], errors=[], deadline=0.0, platform_heat=platform_heat, platform_sources=platform_sources, market=market
+    )
+
+    # --from-staging (daemon report runs): use entries collected by polls; only never-polled sources go live.
+    staging: Optional[StagingStore] = None
+    if bool(getattr(args, "from_staging", False)):
+        staging = StagingStore(str(args.staging_path))
+        staging.load()
+
+    if staging is not None:
+        batch.staged_source_urls = {
+            s.url for s in sources if (staging.data["sources"].get(s.url) or {}).get("last_poll")
+        }
+
+    # Cadence skip: sources whose publish rhythm makes a new entry unlikely since the last fetch are not fetched.
+    # Never on a same-day re-run: skipped sources would drop the items the earlier run published.
+    is_rerun_same_day = str((cache.get("last_run") or {}).get("date") or "") == str(ctx.date_str)
+    if bool(getattr(args, "cadence_skip", False)) and staging is None and not is_rerun_same_day:
+        source_stats = cache.get("source_stats") or {}
+        now_ts = time.time()
+        for s in sources:
+            due, _ = cadence_due(
+                source_stats.get(s.url),
+                now=now_ts,
+                threshold=float(args.cadence_skip_threshold),
+                max_skip_hours=float(args.cadence_max_skip_hours),
+            )
+            if not due:
+                batch.not_due_source_urls.add(s.url)
+        if batch.not_due_source_urls:
+            print(
+                f"[info] cadence skip: {len(batch.not_due_source_urls)}/{len(sources)} source(s) not due",
+                file=sys.stderr,
+            )
+    # Highest expected yield per second first, so a tripped time budget drops the least valuable sources.
+    fetch_sources = order_sources_by_yield(
+        cache, [s for s in sources if s.url not in batch.not_due_source_urls], today=today_date
+    )
+    timings_by_url: Dict[str, List[Dict[str, Any]]] = {}
+    fetch_telemetry.install_hooks()
+    source_stats_now: Dict[str, Any] = cache.get("source_stats") or {}
+    content_seen_entries = (cache.get("content_seen") or {}).get("entries") or {}
+
+    # Concurrency cap: be polite to the network.
+    max_workers = min(12, max(4, len(fetch_sources)))
+
+    per_source_budget = float(getattr(args, "per_source_timeout", 0) or 0)
+    if bool(getattr(args, "auto_time_budget", False)) and per_source_budget > 0 and len(fetch_sources) > 0:
+        waves = int(math.ceil(len(fetch_sources) / float(max_workers))) if max_workers > 0 else len(fetch_sources)
+        auto_budget = int(math.ceil(waves * per_source_budget + 30))
+        auto_budget = max(30, auto_budget)
+        if int(args.time_budget) > 0:
+            args.time_budget = min(int(args.time_budget), auto_budget)
+        else:
+            args.time_budget = auto_budget
+        print(
+            f"[info] auto time budget={int(args.time_budget)}s (sources={len(fetch_sources)}, workers={max_workers}, per_source_timeout={per_source_budget:.0f}s)",
+            file=sys.stderr,
+        )
+    # Budget expiry cancels queued fetches and aborts in-flight requests (shared deadline), so the pool
+    # drains within a small margin instead of waiting out every running request.
+    fetch_deadline = batch.deadline = ctx.t0 + float(args.time_budget)
+
+    # --parse-workers: fetch threads hand the downloaded bytes to worker interpreters/processes for parsing.
+    parse_pool = None
+    if int(getattr(args, "parse_workers", 0) or 0) > 0 and fetch_sources:
+        # multiprocessing is only imported when the option is on
+        from .parse_pool import ParsePool, backend_unavailable, resolve_backend
+
+        requested = str(getattr(args, "parse_backend", "auto") or "auto")
+        why = backend_unavailable(requested) if requested != "auto" else None
+        if why:
+            print(f"[warn] --parse-backend {requested} unavailable ({why}); parsing in the fetch threads", file=sys.stderr)
+        backend = resolve_backend(requested)
+        if backend != "threads":
+            parse_pool = ParsePool(int(args.parse_workers), backend=backend)
+            parse_pool.warm_up()
+
+    def fetch_one(src: FeedSource) -> List[FeedEntry]:
+        if is_source_muted(cache, url=src.url, today=today_date):
+            batch.muted_source_urls.add(src.url)
+            batch.skipped_source_urls.add(src.url)
+            return []
+        plat = platform_for_source_url.get(src.url)
+        if staging is not None:
+            staged = staging.entries_for(src.url)
+            if staged is not None:
+                if plat:
+                    for it in staged:
+                        it.platform = plat
+                return staged
+        started = time.perf_counter()
+        got: List[FeedEntry] = []
+        try:
+            got = fetch_source_entries(
+                src,
+                date_str=ctx.date_str,
+                per_feed_limit=int(args.per_feed_limit),
+                retries=int(args.retries),
+                retry_sleep_ms=int(args.retry_sleep_ms),
+                proxies=ctx.proxies,
+                per_source_timeout=float(getattr(args, "per_source_timeout", 0) or 0),
+                platform=plat,
+                deadline=fetch_deadline,
+                hedge_after=(
+                    hedge_delay(source_stats_now.get(src.url), percentile=float(args.hedge_percentile))
+                    if bool(args.hedge_fallbacks) and src.fallback_urls
+                    else None
+                ),
+                timings=timings_by_url.setdefault(src.url, []),
+                parse=parse_pool.parse if parse_pool is not None else None,
+            )
+            return got
+        finally:
+            ended = time.perf_counter()
+            batch.latency_by_url[src.url] = ended - started
+            if ctx.prof.enabled:
+                ctx.prof.span(src.name, started, ended, cat="fetch", args={"url": src.url, "items": len(got)})
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            future_to_src = {ex.submit(fetch_one, src): src for src in fetch_sources}
+            done: set[Any] = set()
+            for fut in iter_until_deadline(future_to_src, fetch_deadline):
+                if fut is None or time.time() > fetch_deadline:
+                    for pf, ps in future_to_src.items():
+                        if pf not in done:
+                            batch.skipped_source_urls.add(ps.url)
+                    ex.shutdown(wait=False, cancel_futures=True)
+                    break
+                src = future_to_src[fut]
+                done.add(fut)
+                try:
+                    got = fut.result()
+                    batch.entries.extend(got)
+                    batch.success_source_urls.add(src.url)
+                    if src.url not in batch.muted_source_urls:
+                        arrivals = [entry_arrival_ts(e, content_seen_entries) for e in got]
+                        batch.arrivals_by_url[src.url] = (time.time(), [a for a in arrivals if a is not None])
+                    if src.url in batch.staged_source_urls:
+                        # Health was already recorded by the daemon poll that fetched it.
+                        continue
+                    record_source_result(cache, url=src.url, today=today_date, ok=True)
+                    if not args.dry_run:
+                        ctx.cache_store.flush(cache, ["source_health"])
+                except Exception as e:
+                    batch.errors.append(f"{src.name} ({src.url}): {e}")
+                    batch.failed_source_urls.add(src.url)
+                    if src.url in batch.staged_source_urls:
+                        continue
+                    record_source_result(cache, url=src.url, today=today_date, ok=False, error=str(e))
+                    msg = maybe_trip_circuit_breaker(
+                        cache,
+                        url=src.url,
+                        today=today_date,
+                        fail_streak_threshold=int(getattr(args, "circuit_breaker_fail_streak", 3)),
+                        mute_days=int(getattr(args, "circuit_breaker_mute_days", 2)),
+                    )
+                    if msg:
+                        batch.errors.append(f"{src.name} ({src.url}): circuit-breaker tripped, {msg}")
+                    if not args.dry_run:
+                        ctx.cache_store.flush(cache, ["source_health"])
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
+    if time.time() > fetch_deadline:
+        batch.budget_overshoot["sources"] = round(time.time() - fetch_deadline, 3)
+        print(
+            f"[info] time budget {int(args.time_budget)}s hit: "
+            f"{len(batch.skipped_source_urls - batch.muted_source_urls)} source(s) "
+            f"cancelled, fetch pool drained {batch.budget_overshoot['sources']:.2f}s past the budget",
+            file=sys.stderr,
+        )
+
+    # Per-request timing samples -> source_stats[url].telemetry; p50/p95 go to the report and meta.
+    source_stats = cache.setdefault("source_stats", {"_comment": "per-feed stats keyed by feed URL"})
+    for url, recs in timings_by_url.items():
+        if recs:
+            fetch_telemetry.record_samples(source_stats.setdefault(url, {}), list(recs), date_str=ctx.date_str)
+    batch.telemetry_summary = fetch_telemetry.summarize(
+        source_stats,
+        [s.url for s in sources],
+        today=today_date,
+        window_days=int(args.telemetry_window_days),
+    )
+
+    if staging is not None:
+        print(
+            f"[info] staging: {len(batch.staged_source_urls)}/{len(sources)} source(s) from {args.staging_path}",
+            file=sys.stderr,
+        )
+    return batch
+
+
+def dedup(ctx: RunContext, entries: List[FeedEntry]) -> DedupBatch:
+    """
+    Cross-source / cross-day de-dup (URL + title hash + content keys), then the promo soft-delete filter.
+    """
+
+    entries = dedupe_entries(entries, ctx.cache, date_str=ctx.date_str)
+
+    # Signals/threshold are configurable (my/config.json: promo_signals / promo_delete_score / promo_allow).
+    batch = DedupBatch(entries=entries, detector=promo.PromoDetector.from_config(ctx.cfg))
+    if ctx.args.promo_filter is None or bool(ctx.args.promo_filter):
+        by_url = {e.url: e for e in entries}
+        batch.entries, batch.promo_removed = filter_promo_entries(entries, batch.detector)
+        batch.promo_removed_entries = [by_url[r["url"]] for r in batch.promo_removed if r["url"] in by_url]
+        if batch.promo_removed:
+            print(f"[info] promo filter: removed {len(batch.promo_removed)} item(s) before enrichment", file=sys.stderr)
+    return batch
+
+
+def freshness(ctx: RunContext, entries: List[FeedEntry]) -> FreshnessBatch:
+    args = ctx.args
+    batch = FreshnessBatch(
+        fresh=[],
+        backfill=[],
+        fresh_window_days=max(1, int(getattr(args, "fresh_window_days", 3))),
+        fallback_fresh_top_k=max(1, int(getattr(args, "fallback_fresh_top_k", 3))),
+        backfill_daily_cap=max(0, int(getattr(args, "backfill_daily_cap", 3))),
+    )
+    report_day = ctx.report_day
+    for e in entries:
+        if is_fresh_entry(
+            e,
+            report_day=report_day,
+            fresh_window_days=batch.fresh_window_days,
+            fallback_fresh_top_k=batch.fallback_fresh_top_k,
+        ):
+            batch.fresh.append(e)
+        else:
+            batch.backfill.append(e)
+    return batch
+
+
+def score(ctx: RunContext, entries: List[FeedEntry]) -> List[ScoredEntry]:
+    """
+    Topic + carrier classification and the rule-based quality score; entries below --min-score are dropped.
+    """
+
+    out: List[ScoredEntry] = []
+    min_score = float(ctx.args.min_score)
+    for e in entries:
+        carrier = carrier_from_entry(e)
+        category = classify_topic(e)
+        q = score_entry(e, category, carrier)
+        if q < min_score:
+            continue
+        out.append(ScoredEntry(entry=e, category=category, carrier=carrier, quality_score=q))
+    return out
+
+
+def ai_enabled(ctx: RunContext) -> bool:
+    return (not ctx.args.no_ai) and bool(os.getenv("OPENAI_API_KEY"))
+
+
+def enrich(ctx: RunContext, scored: List[ScoredEntry]) -> List[EnrichedEntry]:
+    """
+    Summary / key points / keywords: OpenAI when enabled (its score replaces the rule-based one), else the
+    local fallback summary.
+    """
+
+    enable_ai = ai_enabled(ctx)
+    out: List[EnrichedEntry] = []
+    for s in scored:
+        e = s.entry
+        ai = maybe_ai_enrich(e, category=s.category, carrier=s.carrier, enable_ai=enable_ai, model=ctx.args.openai_model)
+        if ai:
+            summary, key_points, keywords, q2, title_zh = ai
+            out.append(
+                EnrichedEntry(
+                    entry=e,
+                    category=s.category,
+                    carrier=s.carrier,
+                    quality_score=q2,
+                    keywords=keywords,
+                    summary=summary,
+                    key_points=key_points,
+                    title_zh=title_zh,
+                )
+            )
+        else:
+            summary, key_points = fallback_summary(e)
+            out.append(
+                EnrichedEntry(
+                    entry=e,
+                    category=s.category,
+                    carrier=s.carrier,
+                    quality_score=s.quality_score,
+                    keywords=derive_keywords(e),
+                    summary=summary,
+                    key_points=key_points,
+                )
+            )
+    return out
+
+
+def _recency_key(it: EnrichedEntry) -> Tuple[Any, ...]:
+    pub = parse_published_dt(it.entry)
+    pos = int(it.entry.source_pos) if it.entry.source_pos is not None else 999999
+    pub_ts = pub.replace(tzinfo=dt.timezone.utc).timestamp() if pub is not None else float("-inf")
+    return (-pub_ts, -it.quality_score, pos, it.entry.title.lower())
+
+
+def _platform_of(it: EnrichedEntry) -> str:
+    return it.entry.platform or it.entry.source_name or "未知来源"
+
+
+def _dynamic_platform_quota(
+    ctx: RunContext, by_platform: Dict[str, List[EnrichedEntry]], per_platform_limit: int
+) -> Dict[str, int]:
+    """
+    Dynamic quota: more slots for consistently-updating platforms; reduce noise for low-frequency ones.
+    """
+
+    args = ctx.args
+    report_day = ctx.report_day
+    window_days = max(1, int(getattr(args, "platform_quota_window_days", 14)))
+    start_day = report_day - dt.timedelta(days=window_days - 1)
+    hist = ctx.cache.get("article_history") or {}
+    totals: Counter[str] = Counter()
+    active_days: Counter[str] = Counter()
+    for day_k, day_items in (hist or {}).items():
+        if not isinstance(day_k, str) or not re.match(r"^\d{4}-\d{2}-\d{2}$", day_k):
+            continue
+        try:
+            d = dt.date.fromisoformat(day_k)
+        except Exception:
+            continue
+        if d < start_day or d > report_day:
+            continue
+        if not isinstance(day_items, list):
+            continue
+        per_day: Counter[str] = Counter()
+        for it in day_items:
+            if not isinstance(it, dict):
+                continue
+            p = str(it.get("platform") or it.get("source") or "未知来源")
+            per_day[p] += 1
+        for p, n in per_day.items():
+            totals[p] += int(n)
+            active_days[p] += 1
+
+    quota: Dict[str, int] = {}
+    cold_cap = max(1, int(getattr(args, "cold_start_quota_cap", 5)))
+    today_counts = {p: len(v) for p, v in by_platform.items()}
+    for p in by_platform.keys():
+        if int(active_days.get(p, 0)) > 0:
+            avg_when_active = float(totals.get(p, 0)) / float(active_days.get(p, 1))
+            quota[p] = min(per_platform_limit, max(1, int(round(avg_when_active))))
+        else:
+            quota[p] = min(per_platform_limit, max(1, min(cold_cap, int(today_counts.get(p, 0) or 1))))
+    return quota
+
+
+def select(
+    ctx: RunContext,
+    fresh: List[EnrichedEntry],
+    backfill: List[EnrichedEntry],
+    *,
+    platform_heat: Dict[str, float],
+    backfill_daily_cap: int,
+) -> Selection:
+    """
+    Main list (sort + per-platform top-N / max items), backfill list, and the floor that tops the main list
+    up from backfill. The foreign section and editor picks are added by foreign_section() / pick().
+    """
+
+    args = ctx.args
+    selected_keys = ctx.selected_keys
+    enriched_fresh = list(fresh)
+    if args.group_by in {"platform", "none"}:
+        enriched_fresh.sort(
+            key=lambda x: (
+                -float(platform_heat.get(x.entry.platform or x.entry.source_name or "未知来源", 0.0)),
+                -x.quality_score,
+                x.entry.title.lower(),
+            )
+        )
+    elif args.group_by == "topic":
+        enriched_fresh.sort(key=lambda x: (-x.quality_score, x.category, x.entry.title.lower()))
+    else:
+        enriched_fresh.sort(key=lambda x: (-x.quality_score, x.entry.title.lower()))
+
+    per_platform_limit = max(0, int(args.per_platform_limit))
+    if selected_keys and args.group_by == "platform" and per_platform_limit == 0:
+        per_platform_limit = 10
+    max_items_arg = args.max_items
+    if max_items_arg is None:
+        # Keep legacy behavior unless user explicitly turns on per-platform top-N.
+        max_items = 0 if (args.group_by == "platform" and per_platform_limit > 0) else 50
+    else:
+        max_items = int(max_items_arg)
+    if max_items < 0:
+        max_items = 50
+
+    if args.group_by == "platform" and per_platform_limit > 0:
+        per_platform_limit_overrides: Dict[str, int] = {}
+        raw_overrides = getattr(args, "per_platform_limit_overrides", None)
+        if raw_overrides:
+            try:
+                obj = json.loads(str(raw_overrides))
+                if isinstance(obj, dict):
+                    per_platform_limit_overrides = {str(k): int(v) for k, v in obj.items() if v is not None}
+            except Exception:
+                per_platform_limit_overrides = {}
+        elif isinstance(ctx.cfg.get("per_platform_limit_overrides"), dict):
+            per_platform_limit_overrides = {
+                str(k): int(v)
+                for k, v in dict(ctx.cfg.get("per_platform_limit_overrides") or {}).items()
+                if v is not None
+            }
+
+        by_platform: Dict[str, List[EnrichedEntry]] = {}
+        for it in enriched_fresh:
+            by_platform.setdefault(_platform_of(it), []).append(it)
+
+        def within_platform_sort_key(it: EnrichedEntry) -> Tuple[Any, ...]:
+            pub = parse_published_dt(it.entry)
+            pos = int(it.entry.source_pos) if it.entry.source_pos is not None else 999999
+            pub_ts = pub.replace(tzinfo=dt.timezone.utc).timestamp() if pub is not None else float("-inf")
+            if args.platform_top_by == "quality":
+                if pub is not None:
+                    return (0, -it.quality_score, -pub_ts, it.entry.title.lower())
+                return (1, -it.quality_score, pos, it.entry.title.lower())
+            if pub is not None:
+                return (0, -pub_ts, -it.quality_score, it.entry.title.lower())
+            return (1, pos, -it.quality_score, it.entry.title.lower())
+
+        dynamic_quota: Dict[str, int] = {}
+        if bool(getattr(args, "dynamic_platform_quota", False)):
+            dynamic_quota = _dynamic_platform_quota(ctx, by_platform, per_platform_limit)
+
+        for p in by_platform:
+            by_platform[p].sort(key=within_platform_sort_key)
+            base_limit = dynamic_quota.get(p, per_platform_limit)
+            limit = per_platform_limit_overrides.get(p, base_limit)
+            by_platform[p] = by_platform[p][: max(0, int(limit))]
+
+        published: List[EnrichedEntry] = []
+        for p in sorted(by_platform.keys(), key=lambda p: (-float(platform_heat.get(p, 0.0)), p)):
+            published.extend(by_platform[p])
+        if max_items > 0:
+            published = published[: max(1, max_items)]
+    else:
+        published = enriched_fresh if max_items == 0 else enriched_fresh[: max(1, max_items)]
+
+    backfill_published: List[EnrichedEntry] = []
+    if backfill_daily_cap > 0 and backfill:
+        per_plat_cap = max(0, int(getattr(args, "backfill_per_platform_limit", 1)))
+        candidates = sorted(backfill, key=_recency_key)
+        if per_plat_cap <= 0:
+            backfill_published = candidates[:backfill_daily_cap]
+        else:
+            counts: Counter[str] = Counter()
+            for it in candidates:
+                p = _platform_of(it)
+                if counts[p] >= per_plat_cap:
+                    continue
+                backfill_published.append(it)
+                counts[p] += 1
+                if len(backfill_published) >= backfill_daily_cap:
+                    break
+
+    # Floor: supplement main list from backfill.
+    min_items_floor = max(0, int(getattr(args, "min_items_floor", 0)))
+    # Respect explicit --max-items if set (>0). If user caps output to 10, floor should not force 20.
+    if max_items_arg is not None:
+        try:
+            explicit_max = int(max_items_arg)
+        except Exception:
+            explicit_max = 0
+        if explicit_max > 0:
+            min_items_floor = min(min_items_floor, explicit_max)
+    floor_added: List[EnrichedEntry] = []
+    if min_items_floor > 0 and len(published) < min_items_floor and backfill:
+        floor_per_platform_cap = max(1, int(getattr(args, "floor_per_platform_cap", 3)))
+        candidates = sorted(backfill, key=_recency_key)
+        existing_urls = {it.entry.url for it in published if it.entry.url}
+        counts = Counter()
+        for it in published:
+            counts[_platform_of(it)] += 1
+
+        def take(pool: List[EnrichedEntry], deferred: Optional[List[EnrichedEntry]]) -> None:
+            for it in pool:
+                if len(published) >= min_items_floor:
+                    break
+                if not it.entry.url or it.entry.url in existing_urls:
+                    continue
+                p = _platform_of(it)
+                if counts[p] >= floor_per_platform_cap:
+                    continue
+                # Avoid dumping too much entertainment into the main list.
+                if deferred is not None and it.category == "娱乐":
+                    deferred.append(it)
+                    continue
+                published.append(it)
+                floor_added.append(it)
+                existing_urls.add(it.entry.url)
+                counts[p] += 1
+
+        deferred_ent: List[EnrichedEntry] = []
+        take(candidates, deferred_ent)
+        if len(published) < min_items_floor and deferred_ent:
+            take(deferred_ent, None)
+
+        if floor_added and backfill_published:
+            floor_urls = {it.entry.url for it in floor_added if it.entry.url}
+            backfill_published = [it for it in backfill_published if it.entry.url not in floor_urls]
+
+    return Selection(
+        published=published,
+        backfill_published=backfill_published,
+        floor_added=floor_added,
+        per_platform_limit=per_platform_limit,
+        min_items_floor=min_items_floor,
+        foreign=ForeignSection(limit=max(1, int(args.foreign_section_limit))),
+    )
+
+
+DEFAULT_FOREIGN_KEYS = ["国际", "world", "foreign", "realtime/world", "/world", "global", "外交", "worldnews"]
+
+
+def foreign_section(ctx: RunContext, fetched: FetchBatch) -> ForeignSection:
+    """
+    Optional "国外时政" section: a seeded sample of world-news feeds from the whole catalog, run through
+    the same fetch → dedup → score → enrich stages, newest first.
+    """
+
+    args = ctx.args
+    section = ForeignSection(limit=max(1, int(args.foreign_section_limit)))
+    if not bool(args.foreign_news_section):
+        return section
+    section.title = "国外时政"
+    foreign_index = keymatch.SourceKeyIndex(args.foreign_source_key or DEFAULT_FOREIGN_KEYS)
+    candidates = [s for s in ctx.all_sources if foreign_index.any(s.name, s.url)]
+    candidates = [s for s in candidates if s.url]
+    if not candidates:
+        return section
+
+    import random
+
+    seed_str = str(args.foreign_seed or ctx.date_str)
+    rng = random.Random(hashlib.sha1(seed_str.encode("utf-8", errors="ignore")).hexdigest())
+    rng.shuffle(candidates)
+    k = max(1, int(args.foreign_sample_feeds))
+    section.sources = candidates[: min(k, len(candidates))]
+    fetch_deadline = fetched.deadline
+
+    def fetch_foreign_one(src: FeedSource) -> List[FeedEntry]:
+        per_feed_limit = int(src.per_feed_limit) if src.per_feed_limit else int(args.per_feed_limit)
+        items = fetch_and_parse_source(
+            src,
+            per_feed_limit=per_feed_limit,
+            retries=int(args.retries),
+            retry_sleep_ms=int(args.retry_sleep_ms),
+            proxies=ctx.proxies,
+            per_source_timeout=float(getattr(args, "per_source_timeout", 0) or 0),
+            deadline=fetch_deadline,
+        )
+        for it in items:
+            it.platform = section.title or src.name
+        return items
+
+    entries: List[FeedEntry] = []
+    with ThreadPoolExecutor(max_workers=min(6, max(1, len(section.sources)))) as ex:
+        f2s = {ex.submit(fetch_foreign_one, s): s for s in section.sources}
+        done: set[Any] = set()
+        for fut in iter_until_deadline(f2s, fetch_deadline):
+            # Use the same overall time budget; don't block the whole run.
+            if fut is None or time.time() > fetch_deadline:
+                for pf, ps in f2s.items():
+                    if pf not in done:
+                        section.skipped_urls.add(ps.url)
+                ex.shutdown(wait=False, cancel_futures=True)
+                break
+            src = f2s[fut]
+            done.add(fut)
+            try:
+                entries.extend(fut.result())
+                section.success_urls.add(src.url)
+            except Exception as e:
+                section.errors.append(f"{src.name} ({src.url}): {e}")
+                section.failed_urls.add(src.url)
+    if section.skipped_urls:
+        fetched.budget_overshoot["foreign"] = round(max(0.0, time.time() - fetch_deadline), 3)
+
+    entries = dedupe_entries(entries, ctx.cache, date_str=ctx.date_str)
+    section.items = enrich(ctx, score(ctx, entries))
+
+    def recent_sort_key(it: EnrichedEntry) -> Tuple[float, float, str]:
+        pub = parse_published_dt(it.entry) or dt.datetime.min
+        pub_ts = pub.replace(tzinfo=dt.timezone.utc).timestamp() if pub != dt.datetime.min else float("-inf")
+        return (-pub_ts, -it.quality_score, it.entry.title.lower())
+
+    section.items.sort(key=recent_sort_key)
+    return section
+
+
+def pick(ctx: RunContext, selection: Selection, detector: promo.PromoDetector) -> Selection:
+    """
+    Editorial picks (rubric from rss-editor-picks, applied in-process): lead/top markers + promo soft-delete.
+    """
+
+    args = ctx.args
+    enable_editor_picks = bool(args.editor_picks) if args.editor_picks is not None else True
+    selection.editor_lead_n = max(1, int(getattr(args, "editor_lead_n", 1) or 1))
+    selection.editor_top_n = max(0, int(getattr(args, "editor_top_n", 5)))
+    if enable_editor_picks and selection.published:
+        picks = editor_picks.apply_editor_picks(
+            selection.published,
+            lead_n=selection.editor_lead_n,
+            top_n=selection.editor_top_n,
+            soft_delete=bool(args.editor_soft_delete),
+            # Freshness relative to the report date (not wall clock) keeps re-runs deterministic.
+            now=dt.datetime.combine(ctx.report_day, dt.time(23, 59, 59)),
+            published_of=lambda it: parse_published_dt(it.entry),
+            detector=detector,
+        )
+        selection.picks = picks
+        selection.published = picks.items
+        print(
+            f"[info] editor picks: lead={len(picks.lead)}, top={len(picks.top)}, removed={len(picks.removed)}"
+            + (f" ({'; '.join(picks.notes)})" if picks.notes else ""),
+            file=sys.stderr,
+        )
+    return selection
+
+
+def render(ctx: RunContext, fetched: FetchBatch, fresh: FreshnessBatch, selection: Selection) -> Report:
+    args = ctx.args
+    duration_seconds = int(time.time() - ctx.t0)
+    foreign = selection.foreign
+    report_md = build_report(
+        date_str=ctx.date_str,
+        sources=ctx.sources,
+        items=selection.published,
+        backfill_items=selection.backfill_published,
+        duration_seconds=duration_seconds,
+        group_by=str(args.group_by),
+        platform_heat=fetched.platform_heat,
+        platform_heat_window_days=int(args.platform_heat_window_days),
+        selected_keys=ctx.selected_keys,
+        per_platform_limit=selection.per_platform_limit,
+        fresh_window_days=fresh.fresh_window_days,
+        backfill_daily_cap=fresh.backfill_daily_cap,
+        min_items_floor=int(selection.min_items_floor),
+        floor_added=int(len(selection.floor_added)),
+        platform_sources=fetched.platform_sources,
+        success_source_urls=fetched.success_source_urls,
+        failed_source_urls=fetched.failed_source_urls,
+        skipped_source_urls=fetched.skipped_source_urls,
+        muted_source_urls=fetched.muted_source_urls,
+        not_due_source_urls=fetched.not_due_source_urls,
+        telemetry_summary=fetched.telemetry_summary,
+        errors=fetched.errors,
+        foreign_section_title=foreign.title,
+        foreign_section_sources=foreign.sources,
+        foreign_section_success_urls=foreign.success_urls,
+        foreign_section_failed_urls=foreign.failed_urls,
+        foreign_section_skipped_urls=foreign.skipped_urls,
+        foreign_section_errors=foreign.errors,
+        foreign_section_items=foreign.items,
+        foreign_section_limit=foreign.limit,
+    )
+    if selection.picks is not None:
+        report_md = editor_picks.upsert_markdown_block(report_md, editor_picks.render_picks_block(selection.picks))
+    return Report(markdown=report_md, duration_seconds=duration_seconds)
+
+
+def update_cache(
+    ctx: RunContext,
+    fetched: FetchBatch,
+    deduped: DedupBatch,
+    fresh: FreshnessBatch,
+    selection: Selection,
+    report: Report,
+) -> List[str]:
+    """
+    last_run / content_seen / article_history / source_stats, then persist the cache. Returns written sections.
+    """
+
+    cache, date_str = ctx.cache, ctx.date_str
+    published, backfill_published = selection.published, selection.backfill_published
+    cache["last_run"] = {
+        "date": date_str,
+        "duration_seconds": report.duration_seconds,
+        "items_collected": len(deduped.entries),
+        "fresh_candidates": int(len(fresh.fresh)),
+        "backfill_candidates": int(len(fresh.backfill)),
+        "items_published": len(published),
+        "backfill_published": int(len(backfill_published)),
+        "floor_added": int(len(selection.floor_added)),
+        "min_items_floor": int(selection.min_items_floor),
+        "sources_used": [s.url for s in ctx.sources],
+        "sources_not_due": sorted(fetched.not_due_source_urls),
+        "time_budget_overshoot_s": fetched.budget_overshoot,
+        "errors": fetched.errors[:100],
+    }
+
+    content_entries = cache["content_seen"].setdefault("entries", {})
+    for it in list(published) + list(backfill_published):
+        for k in entry_content_keys(it.entry):
+            content_entries[k] = {
+                "date_added": date_str,
+                "title": it.entry.title,
+                "url": it.entry.url,
+                "source": it.entry.source_name,
+            }
+    # Promo-filtered entries are remembered too, so they are dropped by de-dup on later days
+    # instead of being re-detected (and re-listed in removed_items) every day they stay in the feed.
+    for e in deduped.promo_removed_entries:
+        for k in entry_content_keys(e):
+            content_entries.setdefault(
+                k,
+                {"date_added": date_str, "title": e.title, "url": e.url, "source": e.source_name, "removed": "promo"},
+            )
+
+    hist = cache.setdefault("article_history", {"_comment": "daily published items"})
+    hist[date_str] = [
+        {
+            "source": it.entry.source_name,
+            "platform": it.entry.platform or it.entry.source_name,
+            "title": it.entry.title,
+            "title_hash": title_fingerprint(it.entry.title),
+            "url": it.entry.url,
+            "content_keys": entry_content_keys(it.entry),
+            "category": it.category,
+            "carrier": it.carrier,
+            "quality_score": round(it.quality_score, 2),
+        }
+        for it in published
+    ]
+
+    stats = cache.setdefault("source_stats", {"_comment": "per-feed stats keyed by feed URL"})
+    for s in ctx.sources:
+        if s.url in fetched.not_due_source_urls:
+            continue
+        st = stats.get(s.url) or {"total_fetches": 0, "success_count": 0, "last_fetch": None, "last_success": None}
+        st["total_fetches"] = int(st.get("total_fetches") or 0) + 1
+        if s.url not in fetched.failed_source_urls:
+            st["success_count"] = int(st.get("success_count") or 0) + 1
+            st["last_success"] = date_str
+        st["last_fetch"] = date_str
+        if s.url in fetched.latency_by_url:
+            record_source_latency(st, fetched.latency_by_url[s.url])
+        if s.url in fetched.arrivals_by_url:
+            fetched_at, arrivals = fetched.arrivals_by_url[s.url]
+            update_source_cadence(st, arrivals, fetched_at=fetched_at)
+        stats[s.url] = st
+
+    return ctx.cache_store.flush(cache)
+
+
+def export_json(
+    ctx: RunContext,
+    fetched: FetchBatch,
+    deduped: DedupBatch,
+    fresh: FreshnessBatch,
+    selection: Selection,
+    report: Report,
+    *,
+    data_dir: str,
+) -> None:
+    """
+    NewsReport/data/<date>.json + index.json + the search index under data/search (and the market time series
+    when a snapshot was fetched).
+    """
+
+    args, prof = ctx.args, ctx.prof
+    published, backfill_published, picks = selection.published, selection.backfill_published, selection.picks
+    market_snapshot: Optional[Dict[str, Any]] = None
+    if fetched.market is not None:
+        # Started with the feed fetch; usually done by now, so this stage is just the leftover wait.
+        prof.mark("market snapshot")
+        market_snapshot = fetched.market.result(ctx.date_str)
+    prof.mark("json export")
+    telemetry_summary = fetched.telemetry_summary
+    day_json_path, index_json_path = write_report_data_json(
+        data_dir=data_dir,
+        date_str=ctx.date_str,
+        items=published,
+        backfill_items=backfill_published,
+        meta={
+            "group_by": str(args.group_by),
+            "selected_keys": ctx.selected_keys,
+            "per_platform_limit": int(selection.per_platform_limit),
+            "fresh_window_days": int(fresh.fresh_window_days),
+            "fallback_fresh_top_k": int(fresh.fallback_fresh_top_k),
+            "backfill_daily_cap": int(fresh.backfill_daily_cap),
+            "backfill_published": int(len(backfill_published)),
+            "min_items_floor": int(selection.min_items_floor),
+            "floor_added": int(len(selection.floor_added)),
+            "floor_per_platform_cap": int(getattr(args, "floor_per_platform_cap", 3)),
+            "min_score": float(args.min_score),
+            "duration_seconds": int(report.duration_seconds),
+            "items_collected": int(len(deduped.entries)),
+            "fresh_candidates": int(len(fresh.fresh)),
+            "backfill_candidates": int(len(fresh.backfill)),
+            "items_published": int(len(published)),
+            "sources_used": [s.url for s in ctx.sources],
+            **({"fetch_telemetry": telemetry_summary} if telemetry_summary.get("requests") else {}),
+            **({"market": market_snapshot} if market_snapshot else {}),
+            **(
+                {"removed_items": promo.merge_removed(deduped.promo_removed, picks.removed if picks else [])}
+                if deduped.promo_removed or picks is not None
+                else {}
+            ),
+            **(
+                {
+                    "editor_picks": editor_picks.picks_meta(
+                        picks, lead_n=selection.editor_lead_n, top_n=selection.editor_top_n
+                    )
+                }
+                if picks is not None
+                else {}
+            ),
+            # Stages finished before the export (site build and the export itself are in the trace only).
+            **({"stage_timings_ms": prof.stage_timings()} if prof.enabled else {}),
+        },
+    )
+    print(f"Wrote data: {day_json_path}")
+    print(f"Updated data index: {index_json_path}")
+    if market_snapshot and market_snapshot.get("indicators"):
+        try:
+            changed_series = market_data.record_snapshot(data_dir, ctx.date_str, market_snapshot)
+            print(f"Updated market series: {os.path.join(data_dir, 'market')} ({', '.join(changed_series) or 'unchanged'})")
+        except OSError as e:
+            print(f"[warn] market series update failed: {e}", file=sys.stderr)
+    # Committed with the day files so the web build (fresh checkout, no site/) always has it.
+    try:
+        idx = search_index.build_search_index(data_dir=data_dir)
+        print(
+            f"Updated search index: {idx['dir']} (docs={idx['docs']}, shards={idx['shards']}, "
+            f"files changed={idx['changed']}, {idx['build_ms']} ms)"
+        )
+    except OSError as e:
+        print(f"[warn] search index update failed: {e}", file=sys.stderr)
+
+
+def build_site(ctx: RunContext, *, data_dir: str) -> None:
+    try:
+        site_js = write_site_data_js(
+            site_dir=str(ctx.args.site_dir),
+            data_dir=str(data_dir),
+            legacy_bundle=bool(ctx.args.site_legacy_data_js),
+        )
+        print(f"Updated site data: {site_js}")
+    except Exception as e:
+        print(f"Warning: failed to update site data: {e}", file=sys.stderr)
+
+
+# -----------------------------
+# Pipeline
+# -----------------------------
+
+
+def finish_profile(ctx: RunContext) -> None:
+    prof = ctx.prof
+    if not prof.enabled:
+        return
+    prof.mark(None)
+    stamp = dt.datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(str(ctx.args.profile_dir), f"{ctx.date_str}-{stamp}.trace.json")
+    prof.write_chrome_trace(path, metadata={"date": ctx.date_str, "argv": list(ctx.argv)})
+    timings = ", ".join(f"{k}={v:.0f}ms" for k, v in prof.stage_timings().items())
+    print(f"[info] profile: {timings}", file=sys.stderr)
+    print(f"[info] profile trace: {path}", file=sys.stderr)
+
+
+def run_report(ctx: RunContext) -> int:
+    """
+    One report run: every stage in order, each under its profiler mark (names match meta.stage_timings_ms).
+    """
+
+    args, prof = ctx.args, ctx.prof
+    prof.mark("cache load")
+    load_cache_stage(ctx)
+    prof.mark("fetch")
+    fetched = fetch(ctx)
+    prof.mark("dedup")
+    deduped = dedup(ctx, fetched.entries)
+    prof.mark("freshness split")
+    fresh = freshness(ctx, deduped.entries)
+    prof.mark("enrichment")
+    enriched_fresh = enrich(ctx, score(ctx, fresh.fresh))
+    enriched_backfill = enrich(ctx, score(ctx, fresh.backfill))
+    prof.mark("selection")
+    selection = select(
+        ctx,
+        enriched_fresh,
+        enriched_backfill,
+        platform_heat=fetched.platform_heat,
+        backfill_daily_cap=fresh.backfill_daily_cap,
+    )
+    prof.mark("foreign section")
+    selection.foreign = foreign_section(ctx, fetched)
+    prof.mark("editor picks")
+    selection = pick(ctx, selection, deduped.detector)
+    prof.mark("report render")
+    report = render(ctx, fetched, fresh, selection)
+
+    if args.dry_run:
+        finish_profile(ctx)
+        try:
+            print(report.markdown)
+        except BrokenPipeError:
+            # When piping to `head`, stdout may close early. Treat as success.
+            return 0
+        return 0
+
+    out_path = os.path.join(args.out_dir, f"{ctx.date_str}-rss-daily-report.md")
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(report.markdown)
+
+    prof.mark("cache update")
+    written_sections = update_cache(ctx, fetched, deduped, fresh, selection, report)
+
+    print(f"Wrote report: {out_path}")
+    print(f"Updated cache: {DEFAULT_CACHE_DIR} ({', '.join(written_sections) or 'unchanged'})")
+    data_dir = os.path.join(args.out_dir, "data")
+    enable_export_json = bool(args.export_json) if args.export_json is not None else True
+    if enable_export_json:
+        export_json(ctx, fetched, deduped, fresh, selection, report, data_dir=data_dir)
+
+    enable_build_site = bool(args.build_site) if args.build_site is not None else bool(ctx.auto_mode)
+    if enable_build_site:
+        prof.mark("site build")
+        build_site(ctx, data_dir=data_dir)
+    finish_profile(ctx)
+    if fetched.errors:
+        print(f"Some sources failed (showing up to 5): {fetched.errors[:5]}")
+    return 0
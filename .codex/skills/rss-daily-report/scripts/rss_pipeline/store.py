@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import jsonio
+import site_data
+
+from .models import EnrichedEntry
+
+
+# -----------------------------
+# JSON files / report data / cache store
+# -----------------------------
+
+def read_json(path: str) -> Dict[str, Any]:
+    return jsonio.read_json(path)
+
+
+def write_json(path: str, data: Dict[str, Any], *, compact: bool = False) -> None:
+    """
+    Atomic JSON write. Use compact=True for machine-only files (cache, site bundles).
+    """
+
+    jsonio.write_json(path, data, compact=compact)
+
+
+def write_report_data_json(
+    *,
+    data_dir: str,
+    date_str: str,
+    items: List[EnrichedEntry],
+    backfill_items: Optional[List[EnrichedEntry]] = None,
+    meta: Dict[str, Any],
+) -> Tuple[str, str]:
+    os.makedirs(data_dir, exist_ok=True)
+    day_path = os.path.join(data_dir, f"{date_str}.json")
+    def to_item_dict(it: EnrichedEntry) -> Dict[str, Any]:
+        return {
+            "date": date_str,
+            "platform": it.entry.platform or it.entry.source_name,
+            "source": it.entry.source_name,
+            "source_url": it.entry.source_url,
+            "title": it.entry.title,
+            "title_zh": it.title_zh,
+            "url": it.entry.url,
+            "published": it.entry.published,
+            "category": it.category,
+            "carrier": it.carrier,
+            "pin": it.pin,
+            "quality_score": round(float(it.quality_score), 2),
+            "keywords": list(it.keywords or []),
+            "summary": it.summary,
+            "key_points": list(it.key_points or []),
+        }
+
+    if "removed_items" in meta and os.path.exists(day_path):
+        # Keep earlier soft-delete records for the day (re-runs / manual reviews), one entry per URL.
+        try:
+            prev_removed = (read_json(day_path).get("meta") or {}).get("removed_items") or []
+        except Exception:
+            prev_removed = []
+        new_urls = {str(r.get("url") or "") for r in meta["removed_items"]}
+        meta = {
+            **meta,
+            "removed_items": [r for r in prev_removed if isinstance(r, dict) and str(r.get("url") or "") not in new_urls]
+            + list(meta["removed_items"]),
+        }
+
+    payload = {
+        "date": date_str,
+        "generated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "meta": meta,
+        "items": [to_item_dict(it) for it in items],
+        "backfill_items": [to_item_dict(it) for it in (backfill_items or [])],
+    }
+    write_json(day_path, payload)
+
+    # Update index.json incrementally: only today's file (and days missing from the index) are read.
+    index_path = os.path.join(data_dir, "index.json")
+    known: Dict[str, int] = {}
+    if os.path.exists(index_path):
+        try:
+            for d in read_json(index_path).get("days") or []:
+                if isinstance(d, dict) and d.get("date"):
+                    known[str(d["date"])] = int(d.get("count") or 0)
+        except Exception:
+            known = {}
+    known[date_str] = len(payload["items"])
+    days: List[Dict[str, Any]] = []
+    for d, p in site_data.list_day_files(data_dir).items():
+        if d in known:
+            days.append({"date": d, "count": known[d]})
+            continue
+        try:
+            obj = read_json(p)
+            days.append({"date": str(obj.get("date") or d), "count": len(obj.get("items") or [])})
+        except Exception:
+            continue
+    write_json(
+        index_path,
+        {
+            "updated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "days": sorted(days, key=lambda x: x["date"], reverse=True),
+        },
+    )
+    return day_path, index_path
+
+
+def write_text(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        if not text.endswith("\n"):
+            f.write("\n")
+    os.replace(tmp, path)
+
+
+def write_site_data_js(*, site_dir: str, data_dir: str, full: bool = False, legacy_bundle: bool = False) -> str:
+    """
+    Incrementally update site/assets/data (manifest + per-day chunks) from NewsReport/data JSONs.
+    Only changed day files are re-read; the website stays fully static (openable via file://).
+    Returns the manifest path.
+    """
+
+    report = site_data.build_site_data(
+        site_dir=site_dir,
+        data_dir=data_dir,
+        full=full,
+        legacy_bundle=legacy_bundle,
+    )
+    changed = report.get("days_changed") or []
+    print(f"[info] site data: days={report.get('days_total')}, rebuilt={len(changed)} {changed[:5]}", file=sys.stderr)
+    return str(report.get("manifest") or "")
+
+
+def ensure_cache_shape(cache: Dict[str, Any]) -> Dict[str, Any]:
+    cache.setdefault("schema_version", "1.0")
+    cache.setdefault("description", "rss-daily-report cache")
+    cache.setdefault("last_run", {})
+    cache.setdefault("source_stats", {"_comment": "per-feed stats keyed by feed URL"})
+    cache.setdefault("content_seen", {"_comment": "permanent content keys (guid/url/title+date) to prevent cross-day repeats", "entries": {}})
+    cache.setdefault("article_history", {"_comment": "daily published items"})
+    cache.setdefault("source_health", {"_comment": "per-feed health state keyed by feed URL", "entries": {}})
+    return cache
+
+
+def prune_ttl(entries: Dict[str, Any], ttl_hours: int, today: dt.date) -> Dict[str, Any]:
+    keep: Dict[str, Any] = {}
+    ttl_days = max(1, int(ttl_hours // 24))
+    for k, v in (entries or {}).items():
+        try:
+            added = dt.date.fromisoformat(v.get("date_added"))
+        except Exception:
+            continue
+        if (today - added).days <= ttl_days:
+            keep[k] = v
+    return keep
+
+
+# Sections persisted independently by CacheStore (one file each).
+CACHE_SECTIONS: Tuple[str, ...] = ("last_run", "source_stats", "content_seen", "article_history", "source_health")
+# Raw sample lists inside source_stats[url] (and its "cadence" dict) that CacheStore keeps out of the committed
+# section when it has a samples_path: committed stats keep only the small rolling aggregates.
+SOURCE_SAMPLE_KEYS: Tuple[str, ...] = ("telemetry", "latency_samples_ms")
+CADENCE_SAMPLE_KEYS: Tuple[str, ...] = ("arrivals",)
+
+
+def split_source_samples(stats: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    source_stats -> (stats without raw sample lists, {url: {key: samples, "cadence": {key: samples}}}).
+    """
+
+    kept: Dict[str, Any] = {}
+    samples: Dict[str, Any] = {}
+    for url, st in stats.items():
+        if not isinstance(st, dict):
+            kept[url] = st
+            continue
+        raw = {k: st[k] for k in SOURCE_SAMPLE_KEYS if k in st}
+        st = {k: v for k, v in st.items() if k not in SOURCE_SAMPLE_KEYS}
+        cad = st.get("cadence")
+        if isinstance(cad, dict) and any(k in cad for k in CADENCE_SAMPLE_KEYS):
+            raw["cadence"] = {k: cad[k] for k in CADENCE_SAMPLE_KEYS if k in cad}
+            st["cadence"] = {k: v for k, v in cad.items() if k not in CADENCE_SAMPLE_KEYS}
+        kept[url] = st
+        if raw:
+            samples[url] = raw
+    return kept, samples
+
+
+def merge_source_samples(stats: Dict[str, Any], samples: Dict[str, Any]) -> None:
+    """
+    Put split-out sample lists back into source_stats (in place); sources no longer in stats are dropped.
+    """
+
+    for url, raw in samples.items():
+        st = stats.get(url)
+        if not isinstance(st, dict) or not isinstance(raw, dict):
+            continue
+        for k in SOURCE_SAMPLE_KEYS:
+            if k in raw:
+                st[k] = raw[k]
+        if isinstance(raw.get("cadence"), dict):
+            st.setdefault("cadence", {}).update(raw["cadence"])
+
+
+class CacheStore:
+    """
+    Persist each cache section in its own JSON file under `cache_dir`.
+
+    - Writes are atomic (tmp + fsync + rename), so a crash mid-run never leaves a torn file.
+    - flush() only rewrites sections whose serialized content changed since load/last flush.
+    - If a section file is missing, it is migrated from the legacy monolithic cache.json.
+    - With `samples_path`, raw per-source sample lists (SOURCE_SAMPLE_KEYS) are written there instead of
+      into the committed source_stats section, and merged back on load.
+    """
+
+    def __init__(self, cache_dir: str, *, legacy_path: Optional[str] = None, samples_path: Optional[str] = None) -> None:
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.legacy_path = legacy_path
+        self.samples_path = samples_path
+        self._digests: Dict[str, str] = {}
+        self._samples_digest = ""
+
+    def section_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    @staticmethod
+    def _serialize(obj: Any) -> str:
+        # Committed and reviewed in git: indented, sorted keys, so a run shows up as a line-level diff.
+        return jsonio.dumps(obj, sort_keys=True) + "\n"
+
+    def load(self) -> Dict[str, Any]:
+        cache: Dict[str, Any] = {}
+        legacy: Optional[Dict[str, Any]] = None
+        for name in CACHE_SECTIONS:
+            p = self.section_path(name)
+            if os.path.exists(p):
+                try:
+                    with open(p, "rb") as f:
+                        raw = f.read()
+                    cache[name] = jsonio.loads(raw)
+                    # Digest of the bytes on disk: a file in an older layout is rewritten on the next flush.
+                    self._digests[name] = hashlib.sha1(raw).hexdigest()
+                    continue
+                except Exception as e:
+                    print(f"[warn] unreadable cache section, rebuilding: {p}: {e}", file=sys.stderr)
+            if legacy is None:
+                legacy = {}
+                if self.legacy_path and os.path.exists(self.legacy_path):
+                    try:
+                        legacy = read_json(self.legacy_path)
+                    except Exception:
+                        legacy = {}
+            if name in legacy:
+                # No digest recorded: migrated sections are written on the next flush.
+                cache[name] = legacy[name]
+        if self.samples_path and isinstance(cache.get("source_stats"), dict) and os.path.exists(self.samples_path):
+            try:
+                with open(self.samples_path, "rb") as f:
+                    raw = f.read()
+                merge_source_samples(cache["source_stats"], jsonio.loads(raw))
+                self._samples_digest = hashlib.sha1(raw).hexdigest()
+            except Exception as e:
+                print(f"[warn] unreadable source samples, starting over: {self.samples_path}: {e}", file=sys.stderr)
+        return cache
+
+    def flush(self, cache: Dict[str, Any], sections: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Atomically write the given sections (default: all) if they changed.
+        Returns the names of sections actually written.
+        """
+
+        written: List[str] = []
+        for name in sections if sections is not None else CACHE_SECTIONS:
+            if name not in cache:
+                continue
+            obj = cache[name]
+            if name == "source_stats" and self.samples_path and isinstance(obj, dict):
+                obj, samples = split_source_samples(obj)
+                self._write_samples(samples)
+            text = self._serialize(obj)
+            digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+            if self._digests.get(name) == digest:
+                continue
+            path = self.section_path(name)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            self._digests[name] = digest
+            written.append(name)
+        return written
+
+    def _write_samples(self, samples: Dict[str, Any]) -> None:
+        assert self.samples_path
+        data = jsonio.dumps_bytes(samples, compact=True)
+        digest = hashlib.sha1(data).hexdigest()
+        if digest == self._samples_digest:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.samples_path)), exist_ok=True)
+        tmp = self.samples_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.samples_path)
+        self._samples_digest = digest
+
+
+def load_cache(store: CacheStore) -> Dict[str, Any]:
+    cache = store.load()
+    cache = ensure_cache_shape(cache)
+    today = dt.date.today()
+    # best-effort prune muted sources map (keep recent/active only)
+    sh = cache.get("source_health", {}).get("entries", {})
+    if isinstance(sh, dict):
+        kept: Dict[str, Any] = {}
+        for k, v in sh.items():
+            if not isinstance(v, dict):
+                continue
+            muted_until = str(v.get("muted_until") or "")
+            last_seen = str(v.get("last_seen") or "")
+            # keep if muted in the future, or seen within 60 days
+            keep = False
+            try:
+                if muted_until:
+                    d = dt.date.fromisoformat(muted_until)
+                    if d >= today:
+                        keep = True
+            except Exception:
+                pass
+            if not keep:
+                try:
+                    if last_seen:
+                        d2 = dt.date.fromisoformat(last_seen)
+                        if (today - d2).days <= 60:
+                            keep = True
+                except Exception:
+                    keep = False
+            if keep:
+                kept[str(k)] = v
+        cache["source_health"]["entries"] = kept
+    return cache
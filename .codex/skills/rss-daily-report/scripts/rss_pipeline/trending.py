@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+import github_trending
+import jsonio
+
+from .helpers import normalize_ws, safe_url
+from .models import FeedEntry, FeedSource
+from .net import deadline_timeout, read_body, retryable_errors, sleep_before_retry
+from .paths import DEFAULT_TRENDING_VALIDATORS_PATH
+
+
+# -----------------------------
+# GitHub Trending
+# -----------------------------
+
+# Shared keep-alive session for trending pages: a fan-out hits github.com several times per run.
+_github_session: Optional[requests.Session] = None
+_github_session_lock = threading.Lock()
+# Several trending sources can run at once in the fetch pool; each merges its records into the same file.
+_trending_validators_lock = threading.Lock()
+GITHUB_TRENDING_POOL_SIZE = 8
+
+
+def github_session() -> requests.Session:
+    global _github_session
+    import requests
+
+    with _github_session_lock:
+        if _github_session is None:
+            s = requests.Session()
+            s.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=GITHUB_TRENDING_POOL_SIZE))
+            s.headers["User-Agent"] = "Mozilla/5.0"
+            _github_session = s
+        return _github_session
+
+
+def load_trending_validators(path: str) -> Dict[str, Any]:
+    try:
+        doc = jsonio.read_json(path) if os.path.exists(path) else {}
+    except (OSError, ValueError):
+        doc = {}
+    return doc if isinstance(doc, dict) else {}
+
+
+def save_trending_validators(path: str, updates: Dict[str, Any]) -> None:
+    """
+    Merge `updates` into the file as it is now (not as it was when this source loaded it), so concurrent
+    trending sources keep each other's ETag / Last-Modified records.
+    """
+
+    with _trending_validators_lock:
+        merged = {**load_trending_validators(path), **updates}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        jsonio.write_json(path, merged, compact=True)
+
+
+def fetch_trending_page(
+    url: str,
+    *,
+    limit: int,
+    validators: Dict[str, Any],
+    retries: int = 0,
+    retry_sleep_ms: int = 0,
+    proxies: Optional[Dict[str, str]] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    One trending page -> (repos, new validator record or None).
+    Sends If-None-Match / If-Modified-Since from the last successful fetch; a 304 reuses its parsed repos.
+    """
+
+    prev = validators.get(url) if isinstance(validators.get(url), dict) else {}
+    headers: Dict[str, str] = {}
+    if prev.get("repos") and prev.get("etag"):
+        headers["If-None-Match"] = str(prev["etag"])
+    if prev.get("repos") and prev.get("last_modified"):
+        headers["If-Modified-Since"] = str(prev["last_modified"])
+
+    last_err: Optional[BaseException] = None
+    for attempt in range(max(0, int(retries)) + 1):
+        try:
+            r = github_session().get(
+                url,
+                headers=headers,
+                timeout=deadline_timeout((5.0, 18.0), deadline),
+                allow_redirects=True,
+                proxies=proxies,
+                stream=deadline is not None,
+            )
+            if r.status_code == 304:
+                r.close()
+                return list(prev.get("repos") or []), None
+            html = read_body(r, deadline).decode(r.encoding or "utf-8", errors="replace")
+            # Single-pass html.parser extractor; stops once the top-N articles are in.
+            repos = github_trending.parse_trending(html, limit=limit)
+            etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+            record = None
+            if repos and (etag or last_modified):
+                record = {"etag": etag, "last_modified": last_modified, "repos": repos, "fetched_at": int(time.time())}
+            return repos, record
+        except retryable_errors() as e:
+            last_err = e
+            if attempt >= max(0, int(retries)):
+                raise
+            if int(retry_sleep_ms) > 0:
+                sleep_before_retry(retry_sleep_ms, deadline)
+    if last_err:
+        raise last_err
+    return [], None
+
+
+def fetch_github_trending_source(
+    source: FeedSource,
+    *,
+    date_str: str,
+    retries: int = 0,
+    retry_sleep_ms: int = 0,
+    proxies: Optional[Dict[str, str]] = None,
+    deadline: Optional[float] = None,
+    validators_path: str = DEFAULT_TRENDING_VALIDATORS_PATH,
+) -> List[FeedEntry]:
+    """
+    Trending source: fetch every language/window page of the source URL concurrently (github_trending.page_urls),
+    merge + dedup + rank by stars gained per day, keep the top N (per_feed_limit, default 10).
+    Failed pages are skipped; the source only fails when every page does.
+    """
+
+    limit = int(source.per_feed_limit or 10)
+    pages = github_trending.page_urls(source.url)
+    validators = load_trending_validators(validators_path)
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    updates: Dict[str, Dict[str, Any]] = {}
+    errors: List[BaseException] = []
+    with ThreadPoolExecutor(max_workers=min(GITHUB_TRENDING_POOL_SIZE, len(pages))) as ex:
+        futs = {
+            ex.submit(
+                fetch_trending_page,
+                url,
+                limit=limit,
+                validators=validators,
+                retries=retries,
+                retry_sleep_ms=retry_sleep_ms,
+                proxies=proxies,
+                deadline=deadline,
+            ): url
+            for _, _, url in pages
+        }
+        for fut in as_completed(futs):
+            try:
+                repos, record = fut.result()
+            except Exception as e:
+                errors.append(e)
+                continue
+            results[futs[fut]] = repos
+            if record:
+                updates[futs[fut]] = record
+    if errors and not results:
+        raise errors[0]
+    if updates:
+        try:
+            save_trending_validators(validators_path, updates)
+        except OSError:
+            pass
+
+    if len(pages) == 1:
+        repos = results.get(pages[0][2]) or []
+    else:
+        repos = github_trending.merge_ranked(
+            [(lang, window, results[url]) for lang, window, url in pages if url in results], limit=limit
+        )
+    out: List[FeedEntry] = []
+    for i, r in enumerate(repos):
+        out.append(
+            FeedEntry(
+                source_name=source.name,
+                source_url=source.url,
+                platform="GitHub",
+                source_pos=i,
+                title=r["slug"],
+                url=safe_url(r["url"]),
+                description=normalize_ws(github_trending.describe(r)),
+                published=date_str,
+                enclosure_type=None,
+            )
+        )
+    return out
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+search_index
+============
+
+为阅读站预构建全历史倒排索引（NewsReport/data/search/，随日数据一起入库），前端按查询词只拉取相关分片。
+日报生成（run.py，含 `--no-build-site`）写完日文件后重建；编辑回写后可单独运行本脚本刷新：
+
+  python3 .codex/skills/rss-daily-report/scripts/search_index.py [--size-report]
+
+
+- 分词：英文/数字按词（小写，长度 >= 2），中文按二元组（bigram；单字片段保留单字）。
+- 字段权重：title / title_zh = 3，keywords = 2，summary = 1（同一文档内累加，封顶 MAX_WEIGHT）。
+- 词分片：按词首字符分片（ASCII 用首字母/数字；CJK 用首字码位对 CJK_SHARDS 取模）。
+- postings 按 doc id 升序、差分编码：[d0, w0, d1 - d0, w1, ...]。
+- 文档表按 DOC_BLOCK 条一块分片（docs/N.json），只在展示结果时按需加载。
+- 内容未变的分片不重写，meta.json 的 built_at 也只在有变化时更新（重跑不产生 git 噪声）。
+
+分词/分片规则必须与 web/src/lib/searchIndex.ts 保持一致（改动时同步 INDEX_VERSION）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import os
+import re
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional
+
+import jsonio
+from site_data import list_day_files, read_text, write_text
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "..", "..", ".."))
+
+INDEX_VERSION = 1
+CJK_SHARDS = 32
+DOC_BLOCK = 256
+MAX_WEIGHT = 9
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*|[一-鿿]+")
+EN_STOP = {
+    "the", "and", "for", "with", "from", "this", "that", "your", "you", "are", "was", "how", "what",
+    "into", "its", "has", "have", "not", "but", "can", "all", "our", "via", "www", "http", "https", "com",
+}
+FIELD_WEIGHTS = (("title", 3), ("title_zh", 3), ("keywords", 2), ("summary", 1))
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Tokens for indexing and querying (order kept, duplicates allowed).
+    """
+
+    norm = unicodedata.normalize("NFKC", text or "").lower()
+    out: List[str] = []
+    for m in TOKEN_RE.finditer(norm):
+        tok = m.group(0)
+        if tok[0] < "\u0080":
+            if len(tok) >= 2 and tok not in EN_STOP:
+                out.append(tok[:32])
+            continue
+        if len(tok) == 1:
+            out.append(tok)
+            continue
+        for i in range(len(tok) - 1):
+            out.append(tok[i : i + 2])
+    return out
+
+
+def shard_for(term: str) -> str:
+    c = term[0]
+    if ("a" <= c <= "z") or ("0" <= c <= "9"):
+        return c
+    return f"c{ord(c) % CJK_SHARDS:02d}"
+
+
+def field_text(item: Dict[str, Any], field: str) -> str:
+    v = item.get(field)
+    if isinstance(v, list):
+        return " ".join(str(x) for x in v if x)
+    return str(v or "")
+
+
+def iter_items(data_dir: str) -> Iterable[Dict[str, Any]]:
+    """
+    All items across days, oldest day first (stable doc ids for appended history).
+    """
+
+    for date_str, path in sorted(list_day_files(data_dir).items()):
+        try:
+            obj = jsonio.read_json(path)
+        except Exception:
+            continue
+        items = obj.get("items") if isinstance(obj, dict) else None
+        if not isinstance(items, list):
+            continue
+        for it in items:
+            if isinstance(it, dict) and it.get("url"):
+                yield {**it, "date": str(it.get("date") or date_str)}
+
+
+def index_dir(data_dir: str) -> str:
+    return os.path.join(os.path.abspath(data_dir), "search")
+
+
+def write_if_changed(path: str, text: str) -> bool:
+    if read_text(path) == text + "\n":
+        return False
+    write_text(path, text)
+    return True
+
+
+def read_meta(out_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        meta = jsonio.read_json(os.path.join(out_dir, "meta.json"))
+    except Exception:
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+def build_search_index(*, data_dir: str) -> Dict[str, Any]:
+    """
+    Full rebuild of NewsReport/data/search (only changed files are rewritten).
+    Returns build stats (docs, terms, bytes, changed, build_ms).
+    """
+
+    t0 = time.perf_counter()
+    out_dir = index_dir(data_dir)
+    terms_dir = os.path.join(out_dir, "terms")
+    docs_dir = os.path.join(out_dir, "docs")
+    os.makedirs(terms_dir, exist_ok=True)
+    os.makedirs(docs_dir, exist_ok=True)
+
+    docs: List[List[Any]] = []
+    postings: Dict[str, Dict[int, int]] = {}
+    for it in iter_items(os.path.abspath(data_dir)):
+        doc_id = len(docs)
+        docs.append(
+            [
+                it["date"],
+                str(it.get("title_zh") or it.get("title") or ""),
+                str(it.get("url") or ""),
+                str(it.get("platform") or ""),
+                str(it.get("category") or ""),
+            ]
+        )
+        for field, weight in FIELD_WEIGHTS:
+            for term in tokenize(field_text(it, field)):
+                per_doc = postings.setdefault(term, {})
+                per_doc[doc_id] = min(MAX_WEIGHT, per_doc.get(doc_id, 0) + weight)
+
+    shards: Dict[str, Dict[str, List[int]]] = {}
+    for term in sorted(postings):
+        flat: List[int] = []
+        prev = 0
+        for doc_id in sorted(postings[term]):
+            flat.extend((doc_id - prev, postings[term][doc_id]))
+            prev = doc_id
+        shards.setdefault(shard_for(term), {})[term] = flat
+
+    changed = 0
+    shard_bytes: Dict[str, int] = {}
+    for key, table in shards.items():
+        body = jsonio.dumps_bytes(table, compact=True)
+        shard_bytes[key] = len(body)
+        changed += write_if_changed(os.path.join(terms_dir, f"{key}.json"), body.decode("utf-8"))
+
+    doc_blocks = 0
+    for start in range(0, len(docs), DOC_BLOCK):
+        changed += write_if_changed(
+            os.path.join(docs_dir, f"{start // DOC_BLOCK}.json"),
+            jsonio.dumps(docs[start : start + DOC_BLOCK], compact=True),
+        )
+        doc_blocks += 1
+
+    # Drop shards/blocks left over from a previous (larger) build.
+    for fn in os.listdir(terms_dir):
+        if fn.endswith(".json") and fn[:-5] not in shards:
+            os.remove(os.path.join(terms_dir, fn))
+            changed += 1
+    for fn in os.listdir(docs_dir):
+        if fn.endswith(".json") and fn[:-5].isdigit() and int(fn[:-5]) >= doc_blocks:
+            os.remove(os.path.join(docs_dir, fn))
+            changed += 1
+
+    meta = {
+        "version": INDEX_VERSION,
+        "built_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "docs": len(docs),
+        "doc_block": DOC_BLOCK,
+        "cjk_shards": CJK_SHARDS,
+        "shards": shard_bytes,
+    }
+    old = read_meta(out_dir)
+    # built_at doubles as the client's cache-buster: keep it when no shard changed.
+    if old and not changed and all(old.get(k) == v for k, v in meta.items() if k != "built_at"):
+        meta["built_at"] = old.get("built_at") or meta["built_at"]
+    else:
+        jsonio.write_json(os.path.join(out_dir, "meta.json"), meta, compact=True)
+
+    return {
+        "dir": out_dir,
+        "changed": changed,
+        "docs": len(docs),
+        "terms": len(postings),
+        "shards": len(shard_bytes),
+        "terms_bytes": sum(shard_bytes.values()),
+        "largest_shard": max(shard_bytes.values()) if shard_bytes else 0,
+        "doc_blocks": doc_blocks,
+        "build_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the full-history search index under NewsReport/data/search.")
+    parser.add_argument("--data-dir", default=os.path.join(REPO_ROOT, "NewsReport", "data"))
+    parser.add_argument("--size-report", action="store_true", help="Print build time and shard sizes.")
+    args = parser.parse_args(argv)
+
+    data_dir = os.path.abspath(args.data_dir)
+    if not os.path.isdir(data_dir):
+        raise SystemExit(f"data-dir not found: {data_dir}")
+
+    idx = build_search_index(data_dir=data_dir)
+    print(
+        f"Wrote: {idx['dir']} (docs={idx['docs']}, terms={idx['terms']}, shards={idx['shards']}, "
+        f"files changed={idx['changed']})"
+    )
+    if args.size_report:
+        kib = lambda n: f"{n / 1024:.1f} KiB"  # noqa: E731
+        print("Search index:")
+        print(f"  build time          : {idx['build_ms']} ms ({idx['docs']} docs, {idx['terms']} terms)")
+        print(f"  term shards ({idx['shards']})   : total {kib(idx['terms_bytes'])}, largest {kib(idx['largest_shard'])}")
+        print(f"  doc blocks          : {idx['doc_blocks']} x {DOC_BLOCK} docs")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+site_data
+=========
+
+增量构建静态阅读站数据（site/assets/data/），供 run.py 与 build_site.py 共用。
+
+产物布局：
+  site/assets/data/manifest.js           -> window.__NEWS_MANIFEST__ = {...}（天列表 + 每天摘要统计/分片路径）
+  site/assets/data/manifest.json         -> 同上（JSON 版，便于 http 环境 fetch）
+  site/assets/data/days/YYYY-MM-DD.js    -> 把当天数据注册到 window.__NEWS_DAYS__["YYYY-MM-DD"]（file:// 可用）
+  site/assets/data/days/YYYY-MM-DD.json  -> 同上（JSON 版）
+  site/assets/data/build-state.json      -> 每个日数据文件的指纹（mtime/size/sha1）与摘要，用于增量判断
+  site/assets/data/market.js / .json     -> 行情指标的紧凑历史序列（来自 NewsReport/data/market/，见 market_data.py），
+                                            注册到 window.__NEWS_MARKET__；manifest.market 记录路径与版本
+  site/assets/news-loader.js             -> 懒加载器：首屏只需 manifest + 当天分片
+
+每天的摘要（分类/平台计数、头条）预先算好放进 manifest，首屏不必加载任何历史分片。
+
+只有指纹变化的日文件才会被重新读取/输出，日常构建是 O(变更天数) 而不是 O(全部历史)。
+旧站需要的单文件 site/assets/data.js 仍可通过 legacy_bundle=True 生成（会读取全部历史）。
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import jsonio
+import market_data
+
+
+STATE_VERSION = 2
+DAY_FILE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.json$")
+JS_HEADER = "// Generated from NewsReport/data (local).\n"
+
+
+def read_text(path: str) -> Optional[str]:
+    """
+    File contents, or None when it does not exist / cannot be read.
+    """
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def write_text(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        if not text.endswith("\n"):
+            f.write("\n")
+    os.replace(tmp, path)
+
+
+def list_day_files(data_dir: str) -> Dict[str, str]:
+    """
+    Map date -> absolute path for every NewsReport/data/YYYY-MM-DD.json.
+    """
+
+    out: Dict[str, str] = {}
+    if not os.path.isdir(data_dir):
+        return out
+    for fn in os.listdir(data_dir):
+        m = DAY_FILE_RE.match(fn)
+        if m:
+            out[m.group(1)] = os.path.join(data_dir, fn)
+    return out
+
+
+def day_chunk_payload(date_str: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+    meta = obj.get("meta") or {}
+    items = obj.get("items") or []
+    return {
+        "date": date_str,
+        "generated_at": obj.get("generated_at"),
+        "items": [x for x in items if isinstance(x, dict)] if isinstance(items, list) else [],
+        "market": (meta.get("market") if isinstance(meta, dict) else None) or None,
+    }
+
+
+def day_summary(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Precomputed per-day summary for the manifest: counts per category/platform + lead item.
+    Lead = editor pin "lead" if present, otherwise the highest quality_score item.
+    """
+
+    items: List[Dict[str, Any]] = payload.get("items") or []
+    categories: Counter[str] = Counter()
+    platforms: Counter[str] = Counter()
+    for it in items:
+        c = str(it.get("category") or "").strip()
+        p = str(it.get("platform") or "").strip()
+        if c:
+            categories[c] += 1
+        if p:
+            platforms[p] += 1
+
+    lead: Optional[Dict[str, Any]] = next((it for it in items if it.get("pin") == "lead"), None)
+    if lead is None and items:
+        lead = max(items, key=lambda it: float(it.get("quality_score") or 0.0))
+    return {
+        "categories": dict(categories.most_common()),
+        "platforms": dict(platforms.most_common()),
+        "lead": (
+            {
+                "title": lead.get("title"),
+                "title_zh": lead.get("title_zh"),
+                "url": lead.get("url"),
+                "platform": lead.get("platform"),
+                "category": lead.get("category"),
+                "summary": str(lead.get("summary") or "")[:160],
+            }
+            if lead
+            else None
+        ),
+    }
+
+
+def day_chunk_js(date_str: str, payload: Dict[str, Any]) -> str:
+    return (
+        JS_HEADER
+        + "(window.__NEWS_DAYS__ = window.__NEWS_DAYS__ || {})["
+        + jsonio.dumps(date_str)
+        + "] = "
+        + jsonio.dumps(payload, compact=True)
+        + ";\n"
+    )
+
+
+# Lazy loader shipped next to the data. Works over file:// (script tags) and http(s) (fetch JSON).
+LOADER_JS = """// Generated by rss-daily-report site_data.py. Lazy loader for site/assets/data.
+(function () {
+  var base = (document.currentScript && document.currentScript.src || "").replace(/[^/]*$/, "") + "data/";
+  var pending = {};
+
+  function loadScript(src) {
+    return new Promise(function (resolve, reject) {
+      var el = document.createElement("script");
+      el.src = src;
+      el.async = true;
+      el.onload = function () { resolve(); };
+      el.onerror = function () { reject(new Error("failed to load " + src)); };
+      document.head.appendChild(el);
+    });
+  }
+
+  function useFetch() {
+    return location.protocol === "http:" || location.protocol === "https:";
+  }
+
+  function loadManifest() {
+    if (window.__NEWS_MANIFEST__) return Promise.resolve(window.__NEWS_MANIFEST__);
+    if (useFetch()) {
+      return fetch(base + "manifest.json", { cache: "no-cache" }).then(function (r) {
+        if (!r.ok) throw new Error("manifest " + r.status);
+        return r.json();
+      }).then(function (m) { window.__NEWS_MANIFEST__ = m; return m; });
+    }
+    return loadScript(base + "manifest.js").then(function () { return window.__NEWS_MANIFEST__; });
+  }
+
+  function loadDay(date) {
+    var days = (window.__NEWS_DAYS__ = window.__NEWS_DAYS__ || {});
+    if (days[date]) return Promise.resolve(days[date]);
+    if (pending[date]) return pending[date];
+    pending[date] = loadManifest().then(function (m) {
+      var entry = (m.days || []).filter(function (d) { return d.date === date; })[0];
+      if (!entry) throw new Error("unknown day " + date);
+      var chunk = base + entry.chunk + (entry.v ? "?v=" + entry.v : "");
+      if (useFetch()) {
+        return fetch(chunk.replace(/\\.js(\\?|$)/, ".json$1")).then(function (r) {
+          if (!r.ok) throw new Error("day " + date + " " + r.status);
+          return r.json();
+        }).then(function (d) { days[date] = d; return d; });
+      }
+      return loadScript(chunk).then(function () { return days[date]; });
+    });
+    pending[date].catch(function () { delete pending[date]; });
+    return pending[date];
+  }
+
+  function loadMarket() {
+    if (window.__NEWS_MARKET__) return Promise.resolve(window.__NEWS_MARKET__);
+    return loadManifest().then(function (m) {
+      if (!m.market) return null;
+      var src = base + m.market.chunk + (m.market.v ? "?v=" + m.market.v : "");
+      var got = useFetch()
+        ? fetch(src.replace(/\\.js(\\?|$)/, ".json$1")).then(function (r) {
+            if (!r.ok) throw new Error("market " + r.status);
+            return r.json();
+          }).then(function (d) { window.__NEWS_MARKET__ = d; return d; })
+        : loadScript(src).then(function () { return window.__NEWS_MARKET__; });
+      return got;
+    });
+  }
+
+  // Expand one compact series ({t0, d: day offsets, v, p}) into {dates, value, change_pct}.
+  function marketSeries(market, key) {
+    var s = market && market.series && market.series[key];
+    if (!s) return null;
+    var t0 = Date.parse(s.t0 + "T00:00:00Z");
+    return {
+      name: s.name, unit: s.unit, currency: s.currency,
+      dates: s.d.map(function (n) { return new Date(t0 + n * 86400000).toISOString().slice(0, 10); }),
+      value: s.v, change_pct: s.p
+    };
+  }
+
+  function loadLatest() {
+    return loadManifest().then(function (m) {
+      var first = (m.days || [])[0];
+      return first ? loadDay(first.date) : null;
+    });
+  }
+
+  window.NewsData = {
+    loadManifest: loadManifest, loadDay: loadDay, loadLatest: loadLatest,
+    loadMarket: loadMarket, marketSeries: marketSeries
+  };
+})();
+"""
+
+
+def load_build_state(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"version": STATE_VERSION, "days": {}}
+    try:
+        state = jsonio.read_json(path)
+    except Exception:
+        return {"version": STATE_VERSION, "days": {}}
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION or not isinstance(state.get("days"), dict):
+        return {"version": STATE_VERSION, "days": {}}
+    return state
+
+
+def load_all_days(data_dir: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Read every day file (legacy single-bundle path). Returns (days, items, market_by_date).
+    """
+
+    index_path = os.path.join(data_dir, "index.json")
+    days: List[Dict[str, Any]] = []
+    if os.path.exists(index_path):
+        try:
+            days = list((jsonio.read_json(index_path).get("days") or []))
+        except Exception:
+            days = []
+
+    # 兜底：没有 index.json 的情况下按文件名扫
+    if not days:
+        days = [{"date": d} for d in list_day_files(data_dir)]
+        days.sort(key=lambda x: x["date"], reverse=True)
+
+    items: List[Dict[str, Any]] = []
+    market_by_date: Dict[str, Any] = {}
+    for d in days:
+        date_str = str(d.get("date") or "").strip()
+        if not date_str:
+            continue
+        p = os.path.join(data_dir, f"{date_str}.json")
+        if not os.path.exists(p):
+            continue
+        try:
+            obj = jsonio.read_json(p)
+            meta = obj.get("meta") or {}
+            if isinstance(meta, dict) and meta.get("market"):
+                market_by_date[date_str] = meta.get("market")
+            day_items = obj.get("items") or []
+            if isinstance(day_items, list):
+                items.extend([x for x in day_items if isinstance(x, dict)])
+        except Exception:
+            continue
+
+    return days, items, market_by_date
+
+
+def write_legacy_bundle(*, site_dir: str, data_dir: str) -> str:
+    out_js = os.path.join(site_dir, "assets", "data.js")
+    days, items, market_by_date = load_all_days(data_dir)
+    payload = {
+        "updated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "days": days,
+        "items": items,
+        "market": market_by_date,
+    }
+    write_text(out_js, JS_HEADER + "window.__NEWS_DATA__ = " + jsonio.dumps(payload, compact=True) + ";\n")
+    return out_js
+
+
+def write_market_series(*, out_dir: str, data_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Emit market.js/market.json from the columnar store (only rewritten when the series change).
+    Returns the manifest entry ({chunk, v, indicators}) or None when there is no market history.
+    """
+
+    # Read-only: the site build never creates NewsReport/data/market (record_snapshot does, in the report run).
+    series = market_data.site_series(market_data.load_series(data_dir))
+    js_path = os.path.join(out_dir, "market.js")
+    json_path = os.path.join(out_dir, "market.json")
+    if not series:
+        for p in (js_path, json_path):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+        return None
+    body = jsonio.dumps({"series": series}, compact=True)
+    sha1 = hashlib.sha1(body.encode("utf-8")).hexdigest()
+    js = JS_HEADER + "window.__NEWS_MARKET__ = " + body + ";\n"
+    if not os.path.exists(json_path) or read_text(js_path) != js:
+        write_text(js_path, js)
+        write_text(json_path, body)
+    return {"chunk": "market.js", "v": sha1[:10], "indicators": sorted(series)}
+
+
+def build_site_data(
+    *,
+    site_dir: str,
+    data_dir: str,
+    full: bool = False,
+    legacy_bundle: bool = False,
+) -> Dict[str, Any]:
+    """
+    Incrementally (re)build site/assets/data from NewsReport/data.
+
+    - full=True ignores build-state.json and re-emits every day.
+    Returns a small report: manifest path, changed/removed dates, totals.
+    """
+
+    site_dir = os.path.abspath(site_dir)
+    data_dir = os.path.abspath(data_dir)
+    out_dir = os.path.join(site_dir, "assets", "data")
+    days_dir = os.path.join(out_dir, "days")
+    state_path = os.path.join(out_dir, "build-state.json")
+    os.makedirs(days_dir, exist_ok=True)
+
+    state = {"version": STATE_VERSION, "days": {}} if full else load_build_state(state_path)
+    prev_days: Dict[str, Any] = state.get("days") or {}
+    next_days: Dict[str, Any] = {}
+    changed: List[str] = []
+
+    for date_str, path in sorted(list_day_files(data_dir).items()):
+        chunk_rel = f"days/{date_str}.js"
+        chunk_path = os.path.join(out_dir, chunk_rel)
+        chunk_json_path = os.path.join(days_dir, f"{date_str}.json")
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        prev = prev_days.get(date_str) if isinstance(prev_days.get(date_str), dict) else None
+        chunk_ok = os.path.exists(chunk_path) and os.path.exists(chunk_json_path)
+        if prev and chunk_ok and prev.get("mtime_ns") == st.st_mtime_ns and prev.get("size") == st.st_size:
+            next_days[date_str] = prev
+            continue
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        sha1 = hashlib.sha1(raw).hexdigest()
+        if prev and chunk_ok and prev.get("sha1") == sha1:
+            # Touched but unchanged (e.g. git checkout): refresh the fingerprint only.
+            next_days[date_str] = {**prev, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+            continue
+
+        try:
+            obj = jsonio.loads(raw)
+        except Exception:
+            continue
+        if not isinstance(obj, dict):
+            continue
+        payload = day_chunk_payload(date_str, obj)
+        write_text(chunk_path, day_chunk_js(date_str, payload))
+        jsonio.write_json(chunk_json_path, payload, compact=True)
+        next_days[date_str] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha1": sha1,
+            "chunk": chunk_rel,
+            "count": len(payload["items"]),
+            "has_market": bool(payload["market"]),
+            "summary": day_summary(payload),
+        }
+        changed.append(date_str)
+
+    removed = sorted(d for d in prev_days if d not in next_days)
+    for date_str in removed:
+        for ext in (".js", ".json"):
+            try:
+                os.remove(os.path.join(days_dir, f"{date_str}{ext}"))
+            except OSError:
+                pass
+
+    manifest = {
+        "updated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "days": [
+            {
+                "date": d,
+                "count": int(e.get("count") or 0),
+                "chunk": e.get("chunk") or f"days/{d}.js",
+                # Short content hash for cache busting (?v=...).
+                "v": str(e.get("sha1") or "")[:10],
+                "has_market": bool(e.get("has_market")),
+                "summary": e.get("summary") or {},
+            }
+            for d, e in sorted(next_days.items(), reverse=True)
+        ],
+    }
+    market_entry = write_market_series(out_dir=out_dir, data_dir=data_dir)
+    if market_entry:
+        manifest["market"] = market_entry
+    manifest_js = os.path.join(out_dir, "manifest.js")
+    write_text(manifest_js, JS_HEADER + "window.__NEWS_MANIFEST__ = " + jsonio.dumps(manifest, compact=True) + ";\n")
+    jsonio.write_json(os.path.join(out_dir, "manifest.json"), manifest, compact=True)
+    jsonio.write_json(state_path, {"version": STATE_VERSION, "days": next_days}, compact=True)
+    loader_path = os.path.join(site_dir, "assets", "news-loader.js")
+    if read_text(loader_path) != LOADER_JS:
+        write_text(loader_path, LOADER_JS)
+
+    report: Dict[str, Any] = {
+        "manifest": manifest_js,
+        "days_total": len(next_days),
+        "days_changed": changed,
+        "days_removed": removed,
+    }
+    if legacy_bundle:
+        report["legacy_bundle"] = write_legacy_bundle(site_dir=site_dir, data_dir=data_dir)
+    return report
+
+
+def shard_size_report(site_dir: str) -> Dict[str, Any]:
+    """
+    Sizes (bytes) of generated shards: manifest, per-day chunks (js/json), and the initial-view cost
+    (manifest.js + latest day chunk) compared with the legacy single bundle if present.
+    """
+
+    out_dir = os.path.join(os.path.abspath(site_dir), "assets", "data")
+    days_dir = os.path.join(out_dir, "days")
+
+    def size(p: str) -> int:
+        try:
+            return int(os.path.getsize(p))
+        except OSError:
+            return 0
+
+    js_sizes: Dict[str, int] = {}
+    json_sizes: Dict[str, int] = {}
+    if os.path.isdir(days_dir):
+        for fn in os.listdir(days_dir):
+            m = re.match(r"^(\d{4}-\d{2}-\d{2})\.(js|json)$", fn)
+            if not m:
+                continue
+            (js_sizes if m.group(2) == "js" else json_sizes)[m.group(1)] = size(os.path.join(days_dir, fn))
+
+    chunk_values = sorted(js_sizes.values())
+    latest = max(js_sizes) if js_sizes else ""
+    manifest_js = size(os.path.join(out_dir, "manifest.js"))
+    return {
+        "manifest_js": manifest_js,
+        "manifest_json": size(os.path.join(out_dir, "manifest.json")),
+        "chunks": len(chunk_values),
+        "chunk_js_total": sum(chunk_values),
+        "chunk_json_total": sum(json_sizes.values()),
+        "chunk_js_min": chunk_values[0] if chunk_values else 0,
+        "chunk_js_median": chunk_values[len(chunk_values) // 2] if chunk_values else 0,
+        "chunk_js_max": chunk_values[-1] if chunk_values else 0,
+        "latest_day": latest,
+        "initial_view": manifest_js + (js_sizes.get(latest, 0) if latest else 0),
+        "legacy_bundle": size(os.path.join(os.path.abspath(site_dir), "assets", "data.js")),
+    }
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+stage_profiler
+==============
+
+run.py 流水线分阶段计时（--profile）：配置加载 / 源解析 / 缓存加载 / 抓取 / 去重 / 新鲜度划分 / enrichment /
+挑选 / 渲染 / JSON 导出 / 行情 / 站点构建……
+
+- mark(name) 结束上一个阶段并开始下一个（按代码顺序打点，不用给整段代码加缩进）；
+  span() 记录任意线程上的一段（如每个源的抓取），在 trace 里按线程分行。
+- 输出 Chrome trace event 格式（chrome://tracing / Perfetto 可直接打开），另给出 {阶段: 毫秒} 供写入 meta。
+- 关闭时所有方法直接返回，不取时间戳、不分配事件。
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StageProfiler:
+    def __init__(self, *, enabled: bool, origin: Optional[float] = None) -> None:
+        self.enabled = bool(enabled)
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self._current: Optional[Tuple[str, float]] = None
+        self._tids: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _tid(self) -> int:
+        ident = threading.get_ident()
+        with self._lock:
+            return self._tids.setdefault(ident, len(self._tids))
+
+    def span(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        *,
+        cat: str = "stage",
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Complete event between two time.perf_counter() readings, on the calling thread's track.
+        """
+
+        if not self.enabled:
+            return
+        ev: Dict[str, Any] = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((start - self.origin) * 1e6, 1),
+            "dur": round(max(0.0, end - start) * 1e6, 1),
+            "pid": 1,
+            "tid": self._tid(),
+        }
+        if args:
+            ev["args"] = args
+        with self._lock:
+            self.events.append(ev)
+
+    def mark(self, name: Optional[str]) -> None:
+        """
+        End the running pipeline stage (if any) and start `name` (None = just end).
+        """
+
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._current is not None:
+            self.span(self._current[0], self._current[1], now)
+        self._current = (name, now) if name else None
+
+    def stage_timings(self) -> Dict[str, float]:
+        """
+        {stage: milliseconds} for finished pipeline stages, in first-seen order (repeated names are summed).
+        """
+
+        out: Dict[str, float] = {}
+        for ev in self.events:
+            if ev["cat"] == "stage":
+                out[ev["name"]] = round(out.get(ev["name"], 0.0) + ev["dur"] / 1000.0, 1)
+        return out
+
+    def write_chrome_trace(self, path: str, *, metadata: Optional[Dict[str, Any]] = None) -> str:
+        self.mark(None)
+        names = {tid: ("main" if tid == 0 else f"worker-{tid}") for tid in self._tids.values()}
+        meta_events = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": label}}
+            for tid, label in sorted(names.items())
+        ]
+        doc = {
+            "traceEvents": meta_events + sorted(self.events, key=lambda e: e["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "generated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+                "stage_timings_ms": self.stage_timings(),
+                **(metadata or {}),
+            },
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+        return path
@@ -15,7 +15,9 @@ from __future__ import annotations
 import argparse
 import os
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+import catalog_cache
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -176,6 +178,40 @@ def write_sources(path: str, entries: List[Tuple[str, str, str, Optional[int], T
     os.replace(tmp, path)
 
 
+VIEWER_DOMAINS = ("webfollow.cc", "chromewebstore.google.com")
+
+
+def compile_sources(entries: List[Tuple[str, str, str, Optional[int], Tuple[str, ...]]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    The FeedSource list run.py's parse_sources_file() yields for the file write_sources() writes, built from the
+    checklist entries directly (catalog_cache "sources" form). None if some entry would not survive the Markdown
+    round trip unchanged (URLs with brackets, names containing links, ...): run.py then parses the file as usual.
+    """
+
+    out: List[Dict[str, Any]] = []
+    seen_urls: set[str] = set()
+    for name, platform, url, per_feed_limit, fallback_urls in entries:
+        if url in seen_urls:
+            continue
+        seen_urls.add(url)
+        urls = [url, *(fallback_urls or ())]
+        if "http" in name or any(not re.fullmatch(r"https?://[^\s\]\)]+", u) for u in urls):
+            return None
+        if any(url in fu for fu in (fallback_urls or ())) or any(d in u for u in urls for d in VIEWER_DOMAINS):
+            return None
+        out.append(
+            {
+                "name": name,
+                "url": url,
+                "platform": platform,
+                "weight": 0.0,
+                "per_feed_limit": max(1, int(per_feed_limit)) if per_feed_limit is not None and per_feed_limit >= 0 else None,
+                "fallback_urls": list(dict.fromkeys(fallback_urls or ())),
+            }
+        )
+    return out
+
+
 def main(argv: List[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Sync my/sources.md from my/sources.checklist.md.")
     parser.add_argument("--checklist", default=os.path.join(REPO_ROOT, "my", "sources.checklist.md"))
@@ -202,6 +238,10 @@ def main(argv: List[str] | None = None) -> int:
 
     write_sources(out_path, entries)
     print(f"Wrote: {out_path} ({len(entries)} checked items)")
+    # Compiled form for run.py startup (keyed by the file just written, so no Markdown parsing on the next run).
+    compiled = compile_sources(entries)
+    if compiled is not None and catalog_cache.store(out_path, "sources", compiled):
+        print(f"Wrote: {catalog_cache.cache_path(catalog_cache.DEFAULT_CACHE_DIR, 'sources', out_path)} (compiled)")
     return 0
 
 
@@ -38,9 +38,14 @@ else
   fi
 fi
 
-# 3) 仅当 NewsReport 目录有变更时才提交，避免 cache 或其他噪声触发提交。
+# 2.5) 编辑回写可能改了标题/条目：刷新随 NewsReport 提交的全历史搜索索引（内容未变则不改文件）。
+python3 .codex/skills/rss-daily-report/scripts/search_index.py
+
+# 3) 仅当 NewsReport 目录有变更时才提交，避免 cache 或其他噪声单独触发提交；
+#    提交时带上同一次运行更新的 cache/（跨天去重状态），工作区不留改动。
+CACHE_DIR=".codex/skills/rss-daily-report/cache"
 if [[ -n "$(git status --porcelain -- NewsReport)" ]]; then
-  git add NewsReport
+  git add NewsReport "$CACHE_DIR"
   git commit -m "chore: daily report $DATE"
   git push
 else
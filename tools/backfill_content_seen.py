@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-# Backfill permanent content keys from existing NewsReport/data/*.json into cache.json
+# Backfill permanent content keys from existing NewsReport/data/*.json into the per-section cache store
 
 import glob
 import hashlib
@@ -12,7 +12,7 @@ from datetime import datetime
 
 REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DATA_DIR = os.path.join(REPO_DIR, "NewsReport", "data")
-CACHE_PATH = os.path.join(REPO_DIR, ".codex", "skills", "rss-daily-report", "cache.json")
+CACHE_DIR = os.path.join(REPO_DIR, ".codex", "skills", "rss-daily-report", "cache")
 
 
 def normalize_ws(text: str) -> str:
@@ -127,7 +127,10 @@ def main() -> None:
                 }
                 added += 1
 
-    write_json(CACHE_PATH, cache)
+    # Same layout as run.py CacheStore: one file per section.
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for section in ("last_run", "source_stats", "content_seen", "article_history", "source_health"):
+        write_json(os.path.join(CACHE_DIR, f"{section}.json"), cache[section])
     print(f"backfill complete: {added} content keys added")
 
 
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# Benchmark JSON backends (stdlib / orjson / msgspec) on the real NewsReport/data and cache files.
+
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(REPO_DIR, ".codex", "skills", "rss-daily-report", "scripts")
+DATA_DIR = os.path.join(REPO_DIR, "NewsReport", "data")
+CACHE_DIR = os.path.join(REPO_DIR, ".codex", "skills", "rss-daily-report", "cache")
+LEGACY_CACHE_PATH = os.path.join(REPO_DIR, ".codex", "skills", "rss-daily-report", "cache.json")
+
+sys.path.insert(0, SCRIPTS_DIR)
+import jsonio  # noqa: E402
+
+
+def collect_files() -> list:
+    files = sorted(glob.glob(os.path.join(DATA_DIR, "*.json")))
+    cache_files = sorted(glob.glob(os.path.join(CACHE_DIR, "*.json")))
+    if not cache_files and os.path.exists(LEGACY_CACHE_PATH):
+        cache_files = [LEGACY_CACHE_PATH]
+    return files + cache_files
+
+
+def read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time in milliseconds."""
+    samples = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JSON load/dump backends on repo data.")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    files = collect_files()
+    if not files:
+        raise SystemExit(f"no json files found under {DATA_DIR}")
+    raw = [read_bytes(p) for p in files]
+    total_bytes = sum(len(b) for b in raw)
+    print(f"files={len(files)} total={total_bytes / 1024:.0f} KiB repeat={args.repeat}")
+    print(f"{'backend':<8} {'load ms':>9} {'dump ms':>9} {'compact ms':>11} {'bundle ms':>10} {'compact KiB':>12}")
+
+    for name in jsonio.available_backends():
+        jsonio.select_backend(name)
+        objs = [jsonio.loads(b) for b in raw]
+        # Same shape as site data.js: every item from every day in one payload.
+        bundle = {"items": [it for o in objs if isinstance(o, dict) for it in (o.get("items") or [])]}
+
+        load_ms = timed(lambda: [jsonio.loads(b) for b in raw], args.repeat)
+        dump_ms = timed(lambda: [jsonio.dumps_bytes(o) for o in objs], args.repeat)
+        compact_ms = timed(lambda: [jsonio.dumps_bytes(o, compact=True) for o in objs], args.repeat)
+        bundle_ms = timed(lambda: jsonio.dumps_bytes(bundle, compact=True), args.repeat)
+        compact_kib = sum(len(jsonio.dumps_bytes(o, compact=True)) for o in objs) / 1024
+        print(f"{name:<8} {load_ms:>9.2f} {dump_ms:>9.2f} {compact_ms:>11.2f} {bundle_ms:>10.2f} {compact_kib:>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# Feed parsing per --parse-backend (fetch threads / sub-interpreters / processes), on recorded (or synthetic) feeds.
+#
+#   python3 tools/bench_pipeline.py record --sources my/sources.md --out /tmp/rss-fixtures   # once, needs network
+#   python3 tools/bench_parse.py --fixtures /tmp/rss-fixtures --scale 4
+#   python3 tools/bench_parse.py --synthetic 300 --items 60 --workers 1,2,4,8 --backends threads,interpreters,processes
+#
+# Every mode replays the fetch stage without the network: the same thread count as run.py
+# (min(12, max(4, feeds))), each thread "downloads" a body (--latency-ms sleep, GIL released) and parses it,
+# either in the thread (the threads backend, the baseline; parallel only on a free-threaded build) or through
+# ParsePool(N, backend). Reported per backend and worker count: median wall time, speedup over the threads
+# baseline, and a check that every mode returns identical tuples. Pool start-up is listed separately: a real
+# run overlaps it with the first requests. Backends this interpreter lacks are listed with the reason.
+
+import argparse
+import datetime as dt
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(REPO_DIR, ".codex", "skills", "rss-daily-report", "scripts")
+
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_pipeline import synth_feed  # noqa: E402
+from rss_pipeline.feeds import parse_feed  # noqa: E402
+from rss_pipeline.parse_pool import ParsePool, backend_unavailable, gil_disabled  # noqa: E402
+
+
+def usable_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def load_corpus(args) -> List[bytes]:
+    bodies: List[bytes] = []
+    if args.fixtures:
+        with open(os.path.join(args.fixtures, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        for s in manifest["sources"]:
+            with open(os.path.join(args.fixtures, f"{s['id']}.body"), "rb") as f:
+                bodies.append(f.read())
+    else:
+        rng = random.Random(args.seed)
+        now = dt.datetime.now(dt.timezone.utc).replace(microsecond=0)
+        bodies = [synth_feed(i, args.items, now=now, rng=rng) for i in range(args.synthetic)]
+    # A recorded catalog is usually smaller than the one to size for: repeat it.
+    return bodies * max(1, args.scale)
+
+
+def fetch_like(bodies: List[bytes], parse: Callable[[bytes], list], *, latency_s: float) -> List[Optional[list]]:
+    """
+    The fetch stage's shape: N threads, each one request (sleep) + one parse per feed.
+    """
+
+    def one(body: bytes) -> Optional[list]:
+        if latency_s > 0:
+            time.sleep(latency_s)
+        try:
+            return parse(body)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(12, max(4, len(bodies)))) as ex:
+        return list(ex.map(one, bodies))
+
+
+def parse_feed_or_none(body: bytes) -> Optional[list]:
+    try:
+        return parse_feed(body)
+    except Exception:
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark feed parsing per --parse-backend.")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--fixtures", help="Directory written by `bench_pipeline.py record`")
+    src.add_argument("--synthetic", type=int, help="Generate N synthetic feeds instead")
+    parser.add_argument("--items", type=int, default=60, help="Items per synthetic feed (default: 60)")
+    parser.add_argument("--scale", type=int, default=1, help="Repeat the corpus K times (default: 1)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--workers",
+        default="",
+        help="Comma-separated --parse-workers values for the pool backends (default: 1,2,4,... up to the CPU count).",
+    )
+    parser.add_argument(
+        "--backends",
+        default="threads,interpreters,processes",
+        help="Comma-separated backends (default: threads,interpreters,processes; threads is always measured).",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated request time per feed (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", default="", help="Also write raw results to this file")
+    args = parser.parse_args()
+
+    cpus = usable_cpus()
+    if args.workers:
+        worker_counts = sorted({max(1, int(x)) for x in args.workers.split(",") if x.strip()})
+    else:
+        worker_counts = []
+        n = 1
+        while n <= cpus:
+            worker_counts.append(n)
+            n *= 2
+        if worker_counts[-1] != cpus:
+            worker_counts.append(cpus)
+    backends = [b.strip() for b in args.backends.split(",") if b.strip() and b.strip() not in ("threads", "auto")]
+    modes = [("threads", 0)]
+    for backend in backends:
+        why = backend_unavailable(backend)
+        if why:
+            print(f"{backend}: unavailable ({why})")
+            continue
+        modes.extend((backend, w) for w in worker_counts)
+
+    bodies = load_corpus(args)
+    total_bytes = sum(len(b) for b in bodies)
+    latency_s = max(0.0, float(args.latency_ms)) / 1000.0
+    build = "free-threaded, GIL off" if gil_disabled() else "GIL enabled"
+    print(
+        f"python {sys.version.split()[0]} ({build}) feeds={len(bodies)} total={total_bytes / 1024 / 1024:.1f} MiB "
+        f"cpus={cpus} latency={args.latency_ms:.0f}ms"
+    )
+
+    expected = [parse_feed_or_none(b) for b in bodies]
+    items = sum(len(x) for x in expected if x)
+    results: List[Dict[str, object]] = []
+    for backend, workers in modes:
+        pool: Optional[ParsePool] = None
+        startup_ms = 0.0
+        if workers > 0:
+            t0 = time.perf_counter()
+            pool = ParsePool(workers, backend=backend)
+            pool.warm_up()
+            pool.parse(b"<rss><channel/></rss>")
+            startup_ms = (time.perf_counter() - t0) * 1000.0
+        parse = pool.parse if pool is not None else parse_feed
+        try:
+            samples = []
+            same = True
+            for _ in range(max(1, args.repeat)):
+                t0 = time.perf_counter()
+                got = fetch_like(bodies, parse, latency_s=latency_s)
+                samples.append((time.perf_counter() - t0) * 1000.0)
+                same = same and got == expected
+        finally:
+            # A pool that broke mid-run reports the backend it fell back to.
+            ran_as = pool.backend if pool is not None else backend
+            if pool is not None:
+                pool.shutdown()
+        results.append(
+            {
+                "backend": backend,
+                "ran_as": ran_as,
+                "workers": workers,
+                "wall_ms": statistics.median(samples),
+                "startup_ms": startup_ms,
+                "identical": same,
+            }
+        )
+
+    base = results[0]["wall_ms"]
+    print(
+        f"\n{'backend':<14} {'workers':>8} {'wall ms':>9} {'speedup':>8} {'items/s':>10} "
+        f"{'pool start ms':>14} {'same output':>12}"
+    )
+    for r in results:
+        label = str(r["backend"]) if r["ran_as"] == r["backend"] else f"{r['backend']}->{r['ran_as']}"
+        workers_label = "-" if r["workers"] == 0 else str(r["workers"])
+        r["speedup"] = float(base) / float(r["wall_ms"]) if r["wall_ms"] else 0.0
+        print(
+            f"{label:<14} {workers_label:>8} {r['wall_ms']:>9.1f} {r['speedup']:>7.2f}x "
+            f"{items / (float(r['wall_ms']) / 1000.0):>10.0f} {r['startup_ms']:>14.1f} "
+            f"{'yes' if r['identical'] else 'NO':>12}"
+        )
+    if cpus < 2:
+        print("\nnote: one usable CPU, so worker pools can only add overhead here; run on a multi-core host.")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": sys.version.split()[0],
+                    "gil_disabled": gil_disabled(),
+                    "cpus": cpus,
+                    "feeds": len(bodies),
+                    "bytes": total_bytes,
+                    "items": items,
+                    "results": results,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+    return 0 if all(r["identical"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
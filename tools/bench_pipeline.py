@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+# Offline end-to-end benchmark for run.py: record feed fixtures once, then replay them from a local
+# HTTP server (latency / jitter / failure injection) and time main() without touching the network.
+#
+#   python3 tools/bench_pipeline.py record --sources my/sources.md --out /tmp/rss-fixtures
+#   python3 tools/bench_pipeline.py bench --fixtures /tmp/rss-fixtures --latency-ms 80 --jitter-ms 40
+#   python3 tools/bench_pipeline.py bench --synthetic 200 --items 30 --fail-rate 0.05 --repeat 5
+#
+# Every run gets a fresh sandbox (cache / NewsReport / site under a temp dir, --no-config, no AI, no market),
+# so the repo's cache and data are never touched. Each run is a separate process: peak RSS is per run.
+
+import argparse
+import datetime as dt
+import email.utils
+import http.server
+import json
+import os
+import random
+import shutil
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(REPO_DIR, ".codex", "skills", "rss-daily-report", "scripts")
+
+
+def load_run():
+    sys.path.insert(0, SCRIPTS_DIR)
+    import run  # noqa: E402
+
+    return run
+
+
+def source_line(name, url, *, platform=None, weight=0.0, limit=None):
+    meta = [name.replace("|", "/").replace("\t", " ")]
+    if platform:
+        meta.append(f"platform={platform}")
+    if weight:
+        meta.append(f"{weight:g}")
+    if limit:
+        meta.append(f"limit={int(limit)}")
+    return "|".join(meta) + "\t" + url
+
+
+# -----------------------------
+# record
+# -----------------------------
+
+
+def cmd_record(args) -> int:
+    run = load_run()
+    sources = []
+    for p in args.sources:
+        sources.extend(run.parse_sources_file(p))
+    os.makedirs(args.out, exist_ok=True)
+    proxies = {"http": args.proxy, "https": args.proxy} if args.proxy else None
+    manifest = {"recorded_at": dt.datetime.now(dt.timezone.utc).isoformat(), "sources": []}
+    for i, s in enumerate(sources):
+        if s.url.startswith("https://github.com/trending"):
+            print(f"skip (html, not a feed): {s.url}")
+            continue
+        sid = f"s{i:04d}"
+        t0 = time.perf_counter()
+        try:
+            body, meta = run.http_get_bytes_with_meta(s.url, timeout=(5.0, 20.0), proxies=proxies)
+        except Exception as e:
+            print(f"FAIL {s.name}: {e}")
+            continue
+        elapsed_ms = int((time.perf_counter() - t0) * 1000)
+        with open(os.path.join(args.out, f"{sid}.body"), "wb") as f:
+            f.write(body)
+        manifest["sources"].append(
+            {
+                "id": sid,
+                "name": s.name,
+                "url": s.url,
+                "platform": s.platform,
+                "weight": s.weight,
+                "per_feed_limit": s.per_feed_limit,
+                "status": int(meta.get("status_code") or 200),
+                "content_type": str(meta.get("content_type") or "application/xml"),
+                "elapsed_ms": elapsed_ms,
+                "bytes": len(body),
+            }
+        )
+        print(f"ok   {s.name}: {len(body) / 1024:.0f} KiB in {elapsed_ms} ms")
+    with open(os.path.join(args.out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"recorded {len(manifest['sources'])}/{len(sources)} source(s) -> {args.out}")
+    return 0
+
+
+# -----------------------------
+# synthetic fixtures
+# -----------------------------
+
+WORDS_EN = (
+    "python rust kubernetes release model agent database latency cache compiler kernel browser "
+    "security patch cloud gpu inference benchmark startup funding market chip open source"
+).split()
+WORDS_ZH = "大模型 开源 芯片 算力 发布 融资 数据库 安全 漏洞 框架 云原生 机器人 新能源 汽车 央行 利率 市场 手机".split()
+PLATFORMS = ["科技媒体", "开发者社区", "财经", "综合资讯", "博客"]
+
+
+def synth_feed(idx: int, items: int, *, now: dt.datetime, rng: random.Random) -> bytes:
+    atom = idx % 4 == 3
+    parts = []
+    for j in range(items):
+        words = rng.sample(WORDS_EN, 4) + rng.sample(WORDS_ZH, 3)
+        title = f"{' '.join(words[:4]).title()} {''.join(words[4:])} #{idx}-{j}"
+        desc = "。".join(rng.choice(WORDS_ZH) + " " + " ".join(rng.sample(WORDS_EN, 6)) for _ in range(6))
+        pub = now - dt.timedelta(minutes=rng.randint(5, 60 * 24 * 4))
+        link = f"https://example.com/{idx}/{j}?utm_source=rss"
+        if atom:
+            parts.append(
+                f"<entry><title>{title}</title><link href=\"{link}\"/><id>tag:bench,{idx}:{j}</id>"
+                f"<updated>{pub.isoformat()}</updated><summary>{desc}</summary></entry>"
+            )
+        else:
+            parts.append(
+                f"<item><title>{title}</title><link>{link}</link><guid>bench-{idx}-{j}</guid>"
+                f"<pubDate>{email.utils.format_datetime(pub)}</pubDate><description>{desc}</description></item>"
+            )
+    if atom:
+        doc = f'<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>F{idx}</title>{"".join(parts)}</feed>'
+    else:
+        doc = f'<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>F{idx}</title>{"".join(parts)}</channel></rss>'
+    return doc.encode("utf-8")
+
+
+def write_synthetic(out: str, n: int, items: int, seed: int) -> None:
+    rng = random.Random(seed)
+    now = dt.datetime.now(dt.timezone.utc).replace(microsecond=0)
+    manifest = {"recorded_at": now.isoformat(), "synthetic": True, "sources": []}
+    for i in range(n):
+        sid = f"s{i:04d}"
+        body = synth_feed(i, items, now=now, rng=rng)
+        with open(os.path.join(out, f"{sid}.body"), "wb") as f:
+            f.write(body)
+        manifest["sources"].append(
+            {
+                "id": sid,
+                "name": f"Bench {i}",
+                "url": f"https://bench.invalid/{sid}.xml",
+                "platform": PLATFORMS[i % len(PLATFORMS)],
+                "status": 200,
+                "content_type": "application/xml; charset=utf-8",
+                "bytes": len(body),
+            }
+        )
+    with open(os.path.join(out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+# -----------------------------
+# replay server
+# -----------------------------
+
+
+class ReplayServer:
+    """
+    Serves fixtures at /f/<id>. Per request: sleep latency ± jitter before the headers, then fail with
+    probability fail_rate (half 503, half a dropped connection).
+    """
+
+    def __init__(self, fixtures: str, *, latency_ms: float, jitter_ms: float, fail_rate: float, seed: int):
+        with open(os.path.join(fixtures, "manifest.json"), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.bodies = {}
+        for s in self.manifest["sources"]:
+            with open(os.path.join(fixtures, f"{s['id']}.body"), "rb") as f:
+                self.bodies[s["id"]] = (f.read(), s.get("content_type") or "application/xml", int(s.get("status") or 200))
+        self.latency_ms = float(latency_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.fail_rate = float(fail_rate)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.httpd = None
+
+    def start(self) -> int:
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *a):
+                pass
+
+            def do_GET(self):
+                sid = urllib.parse.urlsplit(self.path).path.rsplit("/", 1)[-1]
+                with server.lock:
+                    delay = max(0.0, server.latency_ms + server.rng.uniform(-server.jitter_ms, server.jitter_ms))
+                    roll = server.rng.random()
+                time.sleep(delay / 1000.0)
+                if sid not in server.bodies:
+                    self.send_error(404)
+                    return
+                if roll < server.fail_rate / 2:
+                    self.send_error(503)
+                    return
+                if roll < server.fail_rate:
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+                body, ctype, status = server.bodies[sid]
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+            daemon_threads = True
+            request_queue_size = 256
+
+        self.httpd = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self.httpd.server_address[1]
+
+    def stop(self) -> None:
+        if self.httpd:
+            self.httpd.shutdown()
+
+    def sources_md(self, port: int) -> str:
+        lines = ["# replayed fixtures"]
+        for s in self.manifest["sources"]:
+            lines.append(
+                source_line(
+                    s["name"],
+                    f"http://127.0.0.1:{port}/f/{s['id']}",
+                    platform=s.get("platform"),
+                    weight=float(s.get("weight") or 0.0),
+                    limit=s.get("per_feed_limit"),
+                )
+            )
+        return "\n".join(lines) + "\n"
+
+
+# -----------------------------
+# bench
+# -----------------------------
+
+
+def cmd_run_once(args) -> int:
+    """
+    Child process: one sandboxed main() run with --profile; writes a JSON result to --result.
+    """
+
+    import resource
+
+    run = load_run()
+    box = args.sandbox
+    sandbox_paths = {
+        "DEFAULT_CACHE_DIR": os.path.join(box, "cache"),
+        "DEFAULT_CACHE_PATH": os.path.join(box, "cache.json"),
+        "DEFAULT_STAGING_PATH": os.path.join(box, "state", "staging.json"),
+        "DEFAULT_SOURCE_SAMPLES_PATH": os.path.join(box, "state", "source_samples.json"),
+        "DEFAULT_MARKET_QUOTES_PATH": os.path.join(box, "state", "market_quotes.json"),
+        "DEFAULT_TRENDING_VALIDATORS_PATH": os.path.join(box, "state", "github_trending.json"),
+    }
+    # Path constants are bound by name in each rss_pipeline module that uses them.
+    for mod_name, mod in list(sys.modules.items()):
+        if mod_name.startswith("rss_pipeline."):
+            for name, value in sandbox_paths.items():
+                if hasattr(mod, name):
+                    setattr(mod, name, value)
+    # The compiled sources.md cache is keyed by path: one file per temp sandbox would pile up in the skill's state/.
+    import catalog_cache
+
+    catalog_cache.DEFAULT_CACHE_DIR = os.path.join(box, "state", "catalog")
+    date_str = args.date
+    argv = [
+        date_str,
+        "--no-config",
+        "--sources", os.path.join(box, "sources.md"),
+        "--out-dir", os.path.join(box, "NewsReport"),
+        "--site-dir", os.path.join(box, "site"),
+        "--build-site",
+        "--no-market",
+        "--no-ai",
+        "--no-github-top10",
+        "--time-budget", str(args.time_budget),
+        "--profile",
+        "--profile-dir", os.path.join(box, "profiles"),
+    ] + list(args.extra or [])
+    t0 = time.perf_counter()
+    rc = run.main(argv)
+    wall = time.perf_counter() - t0
+
+    meta = {}
+    day_json = os.path.join(box, "NewsReport", "data", f"{date_str}.json")
+    if os.path.exists(day_json):
+        with open(day_json, "r", encoding="utf-8") as f:
+            meta = json.load(f).get("meta") or {}
+    stages = {}
+    traces = sorted(os.listdir(os.path.join(box, "profiles"))) if os.path.isdir(os.path.join(box, "profiles")) else []
+    if traces:
+        with open(os.path.join(box, "profiles", traces[-1]), "r", encoding="utf-8") as f:
+            stages = (json.load(f).get("otherData") or {}).get("stage_timings_ms") or {}
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        maxrss //= 1024
+    result = {
+        "rc": rc,
+        "wall_s": wall,
+        "items_collected": int(meta.get("items_collected") or 0),
+        "items_published": int(meta.get("items_published") or 0),
+        "stages_ms": stages,
+        "maxrss_kib": int(maxrss),
+    }
+    with open(args.result, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    return 0
+
+
+def cmd_bench(args) -> int:
+    tmp_root = tempfile.mkdtemp(prefix="rss-bench-")
+    try:
+        fixtures = args.fixtures
+        if not fixtures:
+            fixtures = os.path.join(tmp_root, "fixtures")
+            os.makedirs(fixtures)
+            write_synthetic(fixtures, int(args.synthetic), int(args.items), int(args.seed))
+        server = ReplayServer(
+            fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, fail_rate=args.fail_rate, seed=args.seed
+        )
+        port = server.start()
+        n_sources = len(server.manifest["sources"])
+        date_str = args.date or dt.date.today().isoformat()
+        print(
+            f"sources={n_sources} latency={args.latency_ms:g}±{args.jitter_ms:g}ms fail_rate={args.fail_rate:g} "
+            f"repeat={args.repeat} date={date_str}"
+        )
+        results = []
+        for i in range(max(1, int(args.repeat))):
+            box = os.path.join(tmp_root, f"run{i}")
+            if args.warm and i > 0:
+                shutil.copytree(os.path.join(tmp_root, f"run{i - 1}", "cache"), os.path.join(box, "cache"))
+                # Raw per-source samples (latency / telemetry / cadence arrivals) live next to the cache.
+                prev_samples = os.path.join(tmp_root, f"run{i - 1}", "state", "source_samples.json")
+                if os.path.exists(prev_samples):
+                    os.makedirs(os.path.join(box, "state"), exist_ok=True)
+                    shutil.copy2(prev_samples, os.path.join(box, "state", "source_samples.json"))
+            os.makedirs(box, exist_ok=True)
+            with open(os.path.join(box, "sources.md"), "w", encoding="utf-8") as f:
+                f.write(server.sources_md(port))
+            result_path = os.path.join(box, "result.json")
+            cmd = [
+                sys.executable, os.path.abspath(__file__), "run-once",
+                "--sandbox", box, "--date", date_str, "--result", result_path,
+                "--time-budget", str(args.time_budget),
+            ]
+            if args.extra:
+                cmd += ["--"] + list(args.extra)
+            out = None if args.verbose else subprocess.DEVNULL
+            subprocess.run(cmd, check=True, stdout=out, stderr=out)
+            with open(result_path, "r", encoding="utf-8") as f:
+                r = json.load(f)
+            results.append(r)
+            print(
+                f"run {i}: {r['wall_s']:.2f}s  {n_sources / r['wall_s']:.1f} feeds/s  "
+                f"{r['items_collected'] / r['wall_s']:.0f} items/s  published={r['items_published']}  "
+                f"maxrss={r['maxrss_kib'] / 1024:.1f} MiB"
+            )
+        server.stop()
+
+        wall = statistics.median(r["wall_s"] for r in results)
+        print(
+            f"\nmedian: {wall:.2f}s  {n_sources / wall:.1f} feeds/s  "
+            f"{statistics.median(r['items_collected'] for r in results) / wall:.0f} items/s  "
+            f"maxrss={max(r['maxrss_kib'] for r in results) / 1024:.1f} MiB"
+        )
+        names = []
+        for r in results:
+            for k in r["stages_ms"]:
+                if k not in names:
+                    names.append(k)
+        print(f"{'stage':<18} {'median ms':>10} {'min ms':>9} {'max ms':>9}")
+        for k in names:
+            xs = [float(r["stages_ms"].get(k, 0.0)) for r in results]
+            print(f"{k:<18} {statistics.median(xs):>10.1f} {min(xs):>9.1f} {max(xs):>9.1f}")
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"sources": n_sources, "args": vars(args), "runs": results}, f, ensure_ascii=False, indent=2)
+        return 0
+    finally:
+        if args.keep:
+            print(f"kept sandbox: {tmp_root}")
+        else:
+            shutil.rmtree(tmp_root, ignore_errors=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline record/replay benchmark for the rss-daily-report pipeline.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("record", help="Snapshot raw feed bodies + headers for each source (needs network).")
+    p.add_argument("--sources", action="append", required=True, help="sources.md (repeatable)")
+    p.add_argument("--out", required=True, help="Fixture directory (manifest.json + <id>.body)")
+    p.add_argument("--proxy", default="", help="Optional http(s) proxy")
+
+    p = sub.add_parser("bench", help="Replay fixtures from a local server and time main() end-to-end.")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--fixtures", help="Directory written by `record`")
+    src.add_argument("--synthetic", type=int, help="Generate N synthetic feeds instead")
+    p.add_argument("--items", type=int, default=30, help="Items per synthetic feed (default: 30)")
+    p.add_argument("--latency-ms", type=float, default=0.0)
+    p.add_argument("--jitter-ms", type=float, default=0.0)
+    p.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered 503 / dropped")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--warm", action="store_true", help="Carry the cache over between repeats (default: cold)")
+    p.add_argument("--date", default="", help="Report date (default: today; synthetic pubDates are relative to now)")
+    p.add_argument("--time-budget", type=int, default=600)
+    p.add_argument("--json", default="", help="Also write raw results to this file")
+    p.add_argument("--keep", action="store_true", help="Keep the temp sandbox")
+    p.add_argument("--verbose", action="store_true", help="Show run.py output")
+    p.add_argument("extra", nargs="*", help="Extra run.py args after --, e.g. -- --per-platform-limit 5")
+
+    p = sub.add_parser("run-once", help=argparse.SUPPRESS)
+    p.add_argument("--sandbox", required=True)
+    p.add_argument("--date", required=True)
+    p.add_argument("--result", required=True)
+    p.add_argument("--time-budget", type=int, default=600)
+    p.add_argument("extra", nargs="*")
+
+    args = parser.parse_args()
+    if args.cmd == "record":
+        return cmd_record(args)
+    if args.cmd == "bench":
+        return cmd_bench(args)
+    return cmd_run_once(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# Startup benchmark for run.py: `python -X importtime` summary of `import run` plus wall time of the
+# cheap CLI paths, each in a fresh interpreter. Part of the perf suite next to bench_pipeline / bench_json.
+#
+#   python3 tools/bench_startup.py                 # table: import time, top modules, --help wall time
+#   python3 tools/bench_startup.py --check         # exit 1 if a deferred heavy module is imported eagerly
+#   python3 tools/bench_startup.py --json out.json # raw numbers for tracking across commits
+#
+# Bytecode is written/used even if PYTHONDONTWRITEBYTECODE is set, so the numbers are for warm .pyc
+# (what cron reruns see), not for recompiling run.py every time.
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(REPO_DIR, ".codex", "skills", "rss-daily-report", "scripts")
+
+# Imported inside the stages that use them (run.py) — must not show up after a bare `import run`.
+DEFERRED_MODULES = ["requests", "urllib3", "charset_normalizer", "xml.etree.ElementTree", "email.utils", "urllib.request"]
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+def bench_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def importtime(code: str) -> List[Tuple[int, int, int, str]]:
+    """(self_us, cumulative_us, depth, module) rows of one `python -X importtime -c code` run."""
+
+    p = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SCRIPTS_DIR,
+        env=bench_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in p.stderr.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if m:
+            rows.append((int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2, m.group(4)))
+    return rows
+
+
+def wall_ms(args: List[str]) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=SCRIPTS_DIR, env=bench_env(), capture_output=True, check=False)
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def summarize(runs: List[List[Tuple[int, int, int, str]]], target: str, top: int) -> Dict[str, object]:
+    totals = []
+    startup = []
+    self_by_pkg: Dict[str, List[int]] = defaultdict(list)
+    for rows in runs:
+        total = next((cum for _, cum, depth, name in rows if depth == 0 and name == target), 0)
+        totals.append(total)
+        startup.append(sum(cum for _, cum, depth, name in rows if depth == 0 and name != target))
+        # Self time per top-level package, counting only what `import target` pulled in.
+        per_pkg: Dict[str, int] = defaultdict(int)
+        inside = []
+        for self_us, _cum, depth, name in rows:
+            # importtime prints children before their parent: a depth-0 row closes the group above it.
+            inside.append((self_us, depth, name))
+            if depth == 0:
+                if name == target:
+                    for s_us, _d, n in inside:
+                        per_pkg[n.split(".", 1)[0]] += s_us
+                inside = []
+        for pkg, us in per_pkg.items():
+            self_by_pkg[pkg].append(us)
+    pkgs = sorted(((statistics.median(v), k) for k, v in self_by_pkg.items()), reverse=True)[: max(1, top)]
+    return {
+        "import_ms": statistics.median(totals) / 1000.0,
+        "interpreter_ms": statistics.median(startup) / 1000.0,
+        "top_packages_ms": [(k, us / 1000.0) for us, k in pkgs],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark run.py startup (-X importtime + CLI wall time).")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--top", type=int, default=12, help="Packages to list by self import time (default: 12).")
+    parser.add_argument("--check", action="store_true", help="Fail if a deferred module is imported by `import run`.")
+    parser.add_argument("--json", default="", help="Also write raw results to this file")
+    args = parser.parse_args()
+
+    # Warm-up: write .pyc for run.py and its siblings.
+    importtime("import run, build_site")
+
+    result: Dict[str, object] = {"python": sys.version.split()[0]}
+    for target in ("run", "build_site"):
+        runs = [importtime(f"import {target}") for _ in range(max(1, args.repeat))]
+        result[target] = summarize(runs, target, args.top)
+
+    probe = "import sys, run; print(','.join(m for m in %r if m in sys.modules))" % (DEFERRED_MODULES,)
+    p = subprocess.run([sys.executable, "-c", probe], cwd=SCRIPTS_DIR, env=bench_env(), capture_output=True, text=True, check=True)
+    eager = [m for m in p.stdout.strip().split(",") if m]
+    result["eager_deferred_modules"] = eager
+
+    result["cli_ms"] = {
+        "python -c pass": statistics.median(wall_ms(["-c", "pass"]) for _ in range(max(1, args.repeat))),
+        # A script file is compiled on every start (only imported modules get a .pyc); -m shows the difference.
+        "run.py --help": statistics.median(wall_ms(["run.py", "--help"]) for _ in range(max(1, args.repeat))),
+        "python -m run --help": statistics.median(wall_ms(["-m", "run", "--help"]) for _ in range(max(1, args.repeat))),
+        "build_site.py --help": statistics.median(wall_ms(["build_site.py", "--help"]) for _ in range(max(1, args.repeat))),
+    }
+
+    for target in ("run", "build_site"):
+        s = result[target]
+        print(f"import {target:<11} {s['import_ms']:>7.1f} ms   (interpreter + site: {s['interpreter_ms']:.1f} ms)")
+    print(f"\n{'package (self time, import run)':<34} {'ms':>7}")
+    for pkg, ms in result["run"]["top_packages_ms"]:
+        print(f"  {pkg:<32} {ms:>7.2f}")
+    print(f"\n{'command (wall)':<34} {'ms':>7}")
+    for name, ms in result["cli_ms"].items():
+        print(f"  {name:<32} {ms:>7.1f}")
+    print(f"\ndeferred modules imported eagerly: {', '.join(eager) if eager else 'none'}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.check and eager:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
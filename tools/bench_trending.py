@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# GitHub Trending parser: time the html.parser extractor against the previous regex extractor
+# (kept here verbatim as the baseline). Correctness is checked separately against saved pages:
+# tools/check_trending_fixtures.py.
+#
+#   python3 tools/bench_trending.py                      # synthetic page sized like github.com/trending
+#   python3 tools/bench_trending.py --html trending.html # a saved page (slugs of both extractors compared)
+#
+# The synthetic page is ~25 <article class="Box-row"> between a large header (inline scripts/styles)
+# and footer, so the early stop after top-N is visible in the timings.
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(REPO_DIR, ".codex", "skills", "rss-daily-report", "scripts")
+
+sys.path.insert(0, SCRIPTS_DIR)
+import github_trending  # noqa: E402
+from run import normalize_ws, strip_html  # noqa: E402
+
+
+def regex_parse_top10(html: str) -> List[Dict[str, str]]:
+    """The pre-tokenizer implementation (DOTALL article scan + per-article regexes)."""
+
+    if not html:
+        return []
+    articles = re.findall(r"<article\b[^>]*\bBox-row\b[^>]*>.*?</article>", html, flags=re.S | re.I)
+    out: List[Dict[str, str]] = []
+    for a in articles:
+        if len(out) >= 10:
+            break
+        slug = ""
+        m_slug = re.search(r'href="\s*/([A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+)\s*"', a)
+        if m_slug:
+            slug = m_slug.group(1).strip()
+        if not slug:
+            continue
+        desc = ""
+        m_desc = re.search(r"<p\b[^>]*>.*?</p>", a, flags=re.S | re.I)
+        if m_desc:
+            desc = strip_html(m_desc.group(0))
+        desc = normalize_ws(desc)
+        lang = ""
+        m_lang = re.search(r'itemprop="programmingLanguage"[^>]*>\s*([^<]+)\s*<', a, flags=re.S | re.I)
+        if m_lang:
+            lang = normalize_ws(m_lang.group(1))
+        stars = ""
+        m_stars = re.search(r'href="\s*/[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+/stargazers"[^>]*>\s*([0-9,]+)\s*<', a)
+        if m_stars:
+            stars = normalize_ws(m_stars.group(1))
+        stars_today = ""
+        m_today = re.search(r"([0-9,]+)\s+stars\s+today", a, flags=re.S | re.I)
+        if m_today:
+            stars_today = normalize_ws(m_today.group(1))
+        parts: List[str] = []
+        if stars:
+            parts.append(f"⭐ {stars}")
+        if stars_today:
+            parts.append(f"今日 +{stars_today}")
+        if lang:
+            parts.append(lang)
+        if desc:
+            parts.append(desc)
+        out.append({"slug": slug, "url": f"https://github.com/{slug}", "description": " • ".join(parts) if parts else slug})
+    return out
+
+
+SVG = '<svg aria-hidden="true" height="16" viewBox="0 0 16 16" width="16" class="octicon"><path d="M8 .25a.75.75 0 0 1 .673.418Z"></path></svg>'
+
+
+def fixture_article(i: int) -> str:
+    owner, repo = f"owner{i}", f"repo-{i}.js"
+    contributors = "".join(
+        f'<a class="d-inline-block" data-hovercard-type="user" href="/dev{i}{k}">'
+        f'<img class="avatar mb-1 avatar-user" src="https://avatars.githubusercontent.com/u/{i}{k}?s=40&amp;v=4" '
+        f'width="20" height="20" alt="@dev{i}{k}"/></a>\n'
+        for k in range(3)
+    )
+    return f"""
+    <article class="Box-row">
+      <div class="float-right d-flex">
+        <a href="/sponsors/{owner}" class="btn btn-sm">{SVG} Sponsor</a>
+        <a href="/login?return_to=%2F{owner}%2F{repo}" rel="nofollow" class="btn btn-sm">{SVG} Star</a>
+      </div>
+      <h2 class="h3 lh-condensed">
+        <a data-view-component="true" href="/{owner}/{repo}" data-hydro-click="{{&quot;event_type&quot;:&quot;explore.click&quot;}}" class="Link">
+          {SVG}
+          <span data-view-component="true" class="text-normal">{owner} /</span>
+          {repo}
+        </a>
+      </h2>
+      <p class="col-9 color-fg-muted my-1 tmp-pr-4">
+        Tool #{i} for agents &amp; <em>fast</em> builds — {"lorem ipsum " * 6}
+      </p>
+      <div class="f6 color-fg-muted mt-2">
+        <span class="d-inline-block ml-0 mr-3">
+          <span class="repo-language-color" style="background-color: #3572A5"></span>
+          <span itemprop="programmingLanguage">Python</span>
+        </span>
+        <a href="/{owner}/{repo}/stargazers" class="Link Link--muted d-inline-block mr-3">
+          {SVG}
+          {12000 + i:,}
+        </a>
+        <a href="/{owner}/{repo}/forks" class="Link Link--muted d-inline-block mr-3">
+          {SVG}
+          {300 + i:,}
+        </a>
+        <span class="d-inline-block mr-3">
+          Built by
+          {contributors}
+        </span>
+        <span class="d-inline-block float-sm-right">
+          {SVG}
+          {1500 - i * 10:,} stars today
+        </span>
+      </div>
+    </article>"""
+
+
+def fixture_page(n_articles: int, page_kib: int) -> str:
+    articles = "".join(fixture_article(i) for i in range(n_articles))
+    head = '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Trending repositories on GitHub today</title>'
+    body_open = '</head><body class="logged-out"><div class="application-main"><div class="Box">'
+    tail = "</div></div>"
+    filler = max(0, page_kib * 1024 - len(articles) - 2048)
+    script = "<script>window.__payload=" + ('{"k":"' + "x" * 200 + '"},') * (filler // 2 // 210) + "0;</script>"
+    style = "<style>" + (".c{color:red;margin:0 auto}\n" * (filler // 2 // 28)) + "</style>"
+    return head + style + body_open + articles + tail + script + "</body></html>"
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time in milliseconds."""
+    samples = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the GitHub Trending parser.")
+    parser.add_argument("--html", default="", help="Saved trending page (default: synthetic fixture).")
+    parser.add_argument("--articles", type=int, default=25, help="Synthetic page: number of repos (default: 25).")
+    parser.add_argument("--page-kib", type=int, default=500, help="Synthetic page: total size (default: 500).")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.html:
+        with open(args.html, "r", encoding="utf-8", errors="replace") as f:
+            html = f.read()
+    else:
+        html = fixture_page(args.articles, args.page_kib)
+
+    old = regex_parse_top10(html)
+    new = github_trending.parse_trending(html, limit=10)
+    old_slugs = [r["slug"] for r in old]
+    new_slugs = [r["slug"] for r in new]
+    print(f"page={len(html) / 1024:.0f} KiB repos(regex)={len(old)} repos(tokenizer)={len(new)}")
+    if old_slugs != new_slugs:
+        print(f"[diff] regex={old_slugs}\n       tokenizer={new_slugs}")
+
+    print(f"{'parser':<22} {'median ms':>10}")
+    rows = [
+        ("regex (top 10)", lambda: regex_parse_top10(html)),
+        ("tokenizer (top 10)", lambda: github_trending.parse_trending(html, limit=10)),
+        ("tokenizer (all)", lambda: github_trending.parse_trending(html, limit=10_000)),
+    ]
+    for name, fn in rows:
+        print(f"{name:<22} {timed(fn, args.repeat):>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# Promo soft-delete detector (scripts/promo.py) against labelled titles: exit 1 on any wrong verdict.
+#
+#   python3 tools/check_promo.py
+#
+# DELETE cases are the rss-editor-picks "必删" shapes (event/registration posts selling seats/itineraries);
+# KEEP cases are ordinary news that carries commerce words (预售/报价/元起/抢票/航线) and must survive,
+# plus allow-listed conference content. Add a case here whenever a false positive/negative shows up in a report.
+
+import os
+import sys
+from typing import List, Tuple
+
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(REPO_DIR, ".codex", "skills", "rss-daily-report", "scripts")
+
+sys.path.insert(0, SCRIPTS_DIR)
+import promo  # noqa: E402
+
+
+# (title, summary / body head, should be deleted)
+CASES: Tuple[Tuple[str, str, bool], ...] = (
+    ("2026—2027年「中国国家地理号」活动预告", "南极航线 12 晚行程，早鸟价 59800 元/人起，席位有限，点击报名。", True),
+    ("北极光观测团期公布，剩余席位开放", "7 天 6 晚行程，含往返航线，限时优惠 12800 元/人。", True),
+    ("AI 产品经理训练营第 3 期报名开启", "8 周直播课，早鸟价 1999 元起，报名入口见文末。", True),
+    ("苹果 iPhone 17 预售开启，限量版售罄", "官方报价 7999 元起，首批发货排到三周后。", False),
+    ("春运抢票高峰：12306 系统扛住了", "多条航线加班运营，单日售票量创新高。", False),
+    ("特斯拉下调 Model Y 售价", "新报价 24.99 万元起，限时提供低息套餐。", False),
+    ("KubeCon China 2026 演讲视频与 slides 汇总", "大会报名已结束，本文整理全部演讲回放。", False),
+)
+
+
+def run_checks(detector: promo.PromoDetector) -> List[str]:
+    problems: List[str] = []
+    for title, body, want_delete in CASES:
+        text = f"{title} {body}"
+        reason = detector.check(title, text)
+        if bool(reason) != want_delete:
+            score, hits = detector.delete_score_of(title, text)
+            verdict = "deleted" if reason else "kept"
+            problems.append(f"{title!r}: {verdict} (delete score {score}, hits {'/'.join(hits) or '-'})")
+    return problems
+
+
+def main() -> int:
+    problems = run_checks(promo.DEFAULT_DETECTOR)
+    for p in problems:
+        print(f"[FAIL] {p}")
+    if not problems:
+        print(f"[ok]   {len(CASES)} promo cases")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
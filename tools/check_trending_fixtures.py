@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# GitHub Trending parser against saved pages: tools/fixtures/github_trending/<name>.html + <name>.expected.json.
+#
+#   python3 tools/check_trending_fixtures.py            # check every fixture (exit 1 on any mismatch)
+#   python3 tools/check_trending_fixtures.py --record "https://github.com/trending?since=daily" --name daily_all
+#
+# An expected file lists, in page order, the repos the page must yield with the exact field values
+# (slug, url, description, language, stars, forks, stars_gained, period, contributors); the check also
+# requires that nothing else is returned and that a smaller limit stops after the first repos.
+# --record (needs network) saves a trimmed copy of a live page (scripts/styles dropped, first --keep repos)
+# and writes a draft expected file from the current parser: check every value against the page in a
+# browser before committing it, otherwise the fixture only proves the parser agrees with itself.
+
+import argparse
+import datetime as dt
+import glob
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, List
+
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(REPO_DIR, ".codex", "skills", "rss-daily-report", "scripts")
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "github_trending")
+FIELDS = ("slug", "url", "description", "language", "stars", "forks", "stars_gained", "period", "contributors")
+
+sys.path.insert(0, SCRIPTS_DIR)
+import github_trending  # noqa: E402
+
+
+def read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def check_page(html: str, expected: List[Dict[str, Any]]) -> List[str]:
+    """
+    Mismatches between parse_trending(html) and the expected repos (empty list = pass).
+    """
+
+    problems: List[str] = []
+    got = github_trending.parse_trending(html, limit=max(10, len(expected) + 1))
+    if [r["slug"] for r in got] != [r["slug"] for r in expected]:
+        problems.append(f"slugs: expected {[r['slug'] for r in expected]}, got {[r['slug'] for r in got]}")
+    for want, have in zip(expected, got):
+        for field in FIELDS:
+            if field in want and have.get(field) != want[field]:
+                problems.append(f"{want['slug']}.{field}: expected {want[field]!r}, got {have.get(field)!r}")
+    if expected:
+        first = github_trending.parse_trending(html, limit=1)
+        if [r["slug"] for r in first] != [expected[0]["slug"]]:
+            problems.append(f"limit=1: expected [{expected[0]['slug']!r}], got {[r['slug'] for r in first]}")
+    return problems
+
+
+def check_edge_cases() -> List[str]:
+    problems: List[str] = []
+    for label, html in (
+        ("empty page", ""),
+        ("rate-limit page", "<html><body><h1>Whoa there!</h1><p>You have exceeded a secondary rate limit.</p></body></html>"),
+    ):
+        got = github_trending.parse_trending(html, limit=10)
+        if got:
+            problems.append(f"{label}: expected no repos, got {[r['slug'] for r in got]}")
+    return problems
+
+
+def run_checks() -> int:
+    pages = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    if not pages:
+        print(f"no fixtures under {FIXTURE_DIR}")
+        return 1
+    failed = 0
+    for html_path in pages:
+        name = os.path.basename(html_path)[: -len(".html")]
+        expected_path = os.path.join(FIXTURE_DIR, f"{name}.expected.json")
+        if not os.path.exists(expected_path):
+            print(f"[FAIL] {name}: missing {os.path.basename(expected_path)}")
+            failed += 1
+            continue
+        with open(expected_path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        problems = check_page(read_text(html_path), doc.get("repos") or [])
+        origin = " (reconstructed markup)" if str(doc.get("_source") or "").startswith("Reconstructed") else ""
+        if problems:
+            failed += 1
+            print(f"[FAIL] {name}{origin}")
+            for p in problems:
+                print(f"       {p}")
+        else:
+            print(f"[ok]   {name}{origin}: {len(doc.get('repos') or [])} repos")
+    problems = check_edge_cases()
+    for p in problems:
+        print(f"[FAIL] {p}")
+    if not problems:
+        print("[ok]   edge cases")
+    return 1 if failed or problems else 0
+
+
+def trim_page(html: str, keep: int) -> str:
+    """
+    Drop scripts/styles (most of the page weight) and every repo after the first `keep`.
+    """
+
+    html = re.sub(r"<script\b.*?</script>\s*", "", html, flags=re.S | re.I)
+    html = re.sub(r"<style\b.*?</style>\s*", "", html, flags=re.S | re.I)
+    start = html.find("<article")
+    if start < 0:
+        return html
+    end = start
+    for _ in range(max(1, keep)):
+        i = html.find("</article>", end)
+        if i < 0:
+            break
+        end = i + len("</article>")
+    tail = html.rfind("</body>")
+    return html[:end] + "\n</div>\n</div>\n</div>\n</main>\n</div>\n" + (html[tail:] if tail > end else "</body>\n</html>\n")
+
+
+def record(url: str, name: str, keep: int) -> int:
+    import requests
+
+    resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=(5, 20))
+    resp.raise_for_status()
+    html = trim_page(resp.text, keep)
+    repos = github_trending.parse_trending(html, limit=keep)
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    html_path = os.path.join(FIXTURE_DIR, f"{name}.html")
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    draft = {
+        "_source": f"Captured from {url} on {dt.date.today().isoformat()}, trimmed to {keep} repos. "
+        "Values were drafted by the parser: verify each against the page before committing.",
+        "url": url,
+        "repos": [{k: r.get(k) for k in FIELDS} for r in repos],
+    }
+    expected_path = os.path.join(FIXTURE_DIR, f"{name}.expected.json")
+    with open(expected_path, "w", encoding="utf-8") as f:
+        json.dump(draft, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"Wrote: {html_path} ({len(html) / 1024:.0f} KiB)")
+    print(f"Wrote: {expected_path} (draft, {len(repos)} repos; review before committing)")
+    for r in repos:
+        print(
+            f"  {r['slug']:<40} stars={r['stars']:<8} forks={r['forks']:<7} +{r['stars_gained']} {r['period']:<10} "
+            f"by {','.join(r['contributors'])}"
+        )
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the GitHub Trending parser against saved pages.")
+    parser.add_argument("--record", default="", help="Capture this trending URL as a new fixture (needs network).")
+    parser.add_argument("--name", default="", help="Fixture name for --record (file stem).")
+    parser.add_argument("--keep", type=int, default=5, help="Repos kept by --record (default: 5).")
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.name:
+            parser.error("--record needs --name")
+        return record(args.record, args.name, args.keep)
+    return run_checks()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
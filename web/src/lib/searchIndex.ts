@@ -0,0 +1,168 @@
+// 全历史搜索：读取 search_index.py 预构建的倒排索引分片（NewsReport/data/search → /api/search/*），只按查询词拉取相关分片。
+// 分词/分片规则必须与 .codex/skills/rss-daily-report/scripts/search_index.py 保持一致。
+
+export type SearchHit = {
+  date: string
+  title: string
+  url: string
+  platform: string
+  category: string
+  score: number
+}
+
+type SearchMeta = {
+  version: number
+  built_at: string
+  docs: number
+  doc_block: number
+  cjk_shards: number
+  shards: Record<string, number>
+}
+
+const INDEX_VERSION = 1
+const TOKEN_RE = /[a-z0-9][a-z0-9+#]*|[一-鿿]+/g
+const EN_STOP = new Set([
+  'the', 'and', 'for', 'with', 'from', 'this', 'that', 'your', 'you', 'are', 'was', 'how', 'what',
+  'into', 'its', 'has', 'have', 'not', 'but', 'can', 'all', 'our', 'via', 'www', 'http', 'https', 'com',
+])
+
+/** 索引缺失或版本不符（数据/前端未同步）：调用方据此提示，而不是显示“没有匹配”。 */
+export class SearchIndexUnavailableError extends Error {
+  constructor(message: string) {
+    super(message)
+    this.name = 'SearchIndexUnavailableError'
+  }
+}
+
+let metaPromise: Promise<SearchMeta> | null = null
+const shardCache = new Map<string, Promise<Record<string, number[]>>>()
+const docBlockCache = new Map<number, Promise<string[][]>>()
+
+export function tokenize(text: string): string[] {
+  const norm = (text || '').normalize('NFKC').toLowerCase()
+  const out: string[] = []
+  for (const m of norm.matchAll(TOKEN_RE)) {
+    const tok = m[0]
+    if (tok.charCodeAt(0) < 0x80) {
+      if (tok.length >= 2 && !EN_STOP.has(tok)) out.push(tok.slice(0, 32))
+      continue
+    }
+    if (tok.length === 1) {
+      out.push(tok)
+      continue
+    }
+    for (let i = 0; i < tok.length - 1; i++) out.push(tok.slice(i, i + 2))
+  }
+  return out
+}
+
+function shardFor(term: string, cjkShards: number): string {
+  const c = term[0] ?? ''
+  if ((c >= 'a' && c <= 'z') || (c >= '0' && c <= '9')) return c
+  return `c${String(term.charCodeAt(0) % cjkShards).padStart(2, '0')}`
+}
+
+async function fetchJson<T>(path: string, init?: RequestInit): Promise<T> {
+  const r = await fetch(path, init)
+  if (!r.ok) throw new Error(`fetch ${path} failed: ${r.status}`)
+  return (await r.json()) as T
+}
+
+function loadMeta(): Promise<SearchMeta> {
+  if (!metaPromise) {
+    metaPromise = fetchJson<SearchMeta>('/api/search/meta.json', { cache: 'no-store' }).then(
+      (m) => {
+        if (m.version !== INDEX_VERSION) {
+          throw new SearchIndexUnavailableError(`索引版本 ${m.version} 与前端 ${INDEX_VERSION} 不一致`)
+        }
+        return m
+      },
+      (e: unknown) => {
+        throw new SearchIndexUnavailableError(e instanceof Error ? e.message : String(e))
+      },
+    )
+  }
+  return metaPromise
+}
+
+function loadShard(key: string, v: number): Promise<Record<string, number[]>> {
+  let p = shardCache.get(key)
+  if (!p) {
+    p = fetchJson<Record<string, number[]>>(`/api/search/terms/${key}.json?v=${v}`).catch(() => ({}))
+    shardCache.set(key, p)
+  }
+  return p
+}
+
+function loadDocBlock(block: number, v: number): Promise<string[][]> {
+  let p = docBlockCache.get(block)
+  if (!p) {
+    p = fetchJson<string[][]>(`/api/search/docs/${block}.json?v=${v}`).catch(() => [])
+    docBlockCache.set(block, p)
+  }
+  return p
+}
+
+function decodePostings(flat: number[]): Map<number, number> {
+  const out = new Map<number, number>()
+  let doc = 0
+  for (let i = 0; i + 1 < flat.length; i += 2) {
+    doc += flat[i] ?? 0
+    out.set(doc, flat[i + 1] ?? 0)
+  }
+  return out
+}
+
+/** 全部查询词都命中的文档（AND），按权重和降序、同分时新日期优先。索引缺失时抛出 SearchIndexUnavailableError。 */
+export async function searchHistory(query: string, limit = 50): Promise<SearchHit[]> {
+  const terms = [...new Set(tokenize(query))]
+  if (!terms.length) return []
+  const meta = await loadMeta()
+
+  // 分片 URL 带构建时间，索引重建后浏览器缓存自动失效。
+  const v = Date.parse(meta.built_at) || meta.docs
+  const tables = await Promise.all(
+    terms.map(async (t) => {
+      const key = shardFor(t, meta.cjk_shards)
+      if (!(key in meta.shards)) return null
+      const shard = await loadShard(key, v)
+      const flat = shard[t]
+      return flat ? decodePostings(flat) : null
+    }),
+  )
+  if (tables.some((x) => !x)) return []
+
+  const postings = (tables as Map<number, number>[]).sort((a, b) => a.size - b.size)
+  const [first, ...rest] = postings
+  if (!first) return []
+  const scored: Array<[number, number]> = []
+  for (const [doc, w] of first) {
+    let score = w
+    let ok = true
+    for (const p of rest) {
+      const x = p.get(doc)
+      if (x === undefined) {
+        ok = false
+        break
+      }
+      score += x
+    }
+    if (ok) scored.push([doc, score])
+  }
+  // doc id 按日期升序分配，id 越大越新。
+  scored.sort((a, b) => b[1] - a[1] || b[0] - a[0])
+  const top = scored.slice(0, limit)
+
+  const blocks = [...new Set(top.map(([doc]) => Math.floor(doc / meta.doc_block)))]
+  const loaded = new Map<number, string[][]>()
+  await Promise.all(blocks.map(async (b) => loaded.set(b, await loadDocBlock(b, v))))
+
+  const hits: SearchHit[] = []
+  for (const [doc, score] of top) {
+    const row = loaded.get(Math.floor(doc / meta.doc_block))?.[doc % meta.doc_block]
+    if (!row) continue
+    const [date = '', title = '', url = '', platform = '', category = ''] = row
+    hits.push({ date, title, url, platform, category, score })
+  }
+  return hits
+}
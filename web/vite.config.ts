@@ -35,6 +35,8 @@ export default defineConfig({
 function bundleNewsData(): Plugin {
   const repoRoot = fileURLToPath(new URL('..', import.meta.url))
   const dataDir = path.join(repoRoot, 'NewsReport', 'data')
+  // 全历史搜索索引分片：日报生成时由 search_index.py 写入，随 NewsReport 一起提交
+  const searchDir = path.join(dataDir, 'search')
 
   let outDirAbs = ''
 
@@ -71,6 +73,17 @@ function bundleNewsData(): Plugin {
           await fs.copyFile(path.join(dataDir, fn), path.join(targetDir, fn))
         }),
       )
+
+      // 有日数据却没有索引：直接让构建失败，而不是发布一个“往期搜索永远为空”的站点。
+      try {
+        await fs.access(path.join(searchDir, 'meta.json'))
+      } catch {
+        throw new Error(
+          `[bundle-news-data] missing search index ${searchDir}; ` +
+            'run .codex/skills/rss-daily-report/scripts/search_index.py and commit NewsReport/data/search',
+        )
+      }
+      await fs.cp(searchDir, path.join(outDirAbs, 'api', 'search'), { recursive: true })
     },
   }
 }
@@ -78,6 +91,7 @@ function bundleNewsData(): Plugin {
 function localNewsData(): Plugin {
   const repoRoot = fileURLToPath(new URL('..', import.meta.url))
   const dataDir = path.join(repoRoot, 'NewsReport', 'data')
+  const searchDir = path.join(dataDir, 'search')
 
   async function readJsonFile(filename: string): Promise<string | null> {
     const fullPath = path.join(dataDir, filename)
@@ -118,6 +132,24 @@ function localNewsData(): Plugin {
           return
         }
 
+        const s = url.match(/^\/api\/search\/(meta\.json|(?:terms|docs)\/[a-z0-9]+\.json)(?:\?.*)?$/)
+        if (s) {
+          let body: string | null = null
+          try {
+            body = await fs.readFile(path.join(searchDir, s[1]!), 'utf-8')
+          } catch {
+            body = null
+          }
+          if (!body) {
+            res.statusCode = 404
+            res.end('search index not found')
+            return
+          }
+          res.setHeader('Content-Type', 'application/json; charset=utf-8')
+          res.end(body)
+          return
+        }
+
         next()
       })
     },